@@ -5,23 +5,102 @@ Menggunakan Deep Learning, Technical Analysis, dan Pattern Recognition
 untuk menghasilkan signal trading crypto yang sangat akurat.
 """
 
-import tensorflow as tf
+import time
 import numpy as np
 import pandas as pd
-import cv2
-from sklearn.preprocessing import MinMaxScaler
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-import talib
+from indicators import as_float_array, compute_indicators, candle_patterns, indicator_snapshot
+from signal_scoring import BEARISH_PATTERNS, BULLISH_PATTERNS, MASTER_SCORER, MASTER_SIGNAL_PARAMS
 import warnings
 warnings.filterwarnings('ignore')
 
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+class PatternContext:
+    """Peaks, troughs and trendline slopes shared by all pattern detectors
+    
+    Built once per analysis. Each (window, distance) peak search runs
+    find_peaks once no matter how many detectors ask for it, and the
+    least-squares slopes of highs and lows over every TRENDLINE_WINDOWS
+    tail come from a single matrix product instead of repeated np.polyfit.
+    """
+    
+    TREND_WINDOW = 10
+    PATTERN_WINDOW = 20
+    TRENDLINE_WINDOWS = (TREND_WINDOW, PATTERN_WINDOW)
+    
+    def __init__(self, df):
+        self.series = {
+            'high': as_float_array(df['high']),
+            'low': as_float_array(df['low']),
+            'close': as_float_array(df['close'])
+        }
+        self._peaks = {}
+        self._slopes = {}
+    
+    def __len__(self):
+        return len(self.series['close'])
+    
+    def window(self, series, size=None):
+        """Last ``size`` values of 'high', 'low' or 'close' (all when size is None)"""
+        values = self.series[series]
+        return values if size is None else values[-size:]
+    
+    def peaks(self, size=None, distance=5):
+        """Indices (within the window) of the local maxima of the highs"""
+        return self._find_peaks('high', size, distance)
+    
+    def troughs(self, size=None, distance=5):
+        """Indices (within the window) of the local minima of the lows"""
+        return self._find_peaks('low', size, distance)
+    
+    def _find_peaks(self, series, size, distance):
+        key = (series, size, distance)
+        if key not in self._peaks:
+            # scipy.signal mahal di-import (~1 s), jadi baru dimuat saat pattern pertama dicari
+            from scipy.signal import find_peaks
+            
+            values = self.window(series, size)
+            self._peaks[key] = find_peaks(values if series == 'high' else -values, distance=distance)[0]
+        return self._peaks[key]
+    
+    def slope(self, series, size):
+        """Least-squares slope of the last ``size`` highs or lows"""
+        if not self._slopes:
+            self._fit_trendlines(self.TRENDLINE_WINDOWS)
+        if (series, size) not in self._slopes:
+            self._fit_trendlines((size,))
+        return self._slopes[(series, size)]
+    
+    def _fit_trendlines(self, sizes):
+        # Slope OLS = sum(x_c * y) / sum(x_c ** 2) dengan x_c = x - mean(x): satu baris
+        # bobot per window, semua window dan kedua series dihitung dalam satu perkalian
+        length = min(max(sizes), len(self))
+        weights = np.zeros((len(sizes), length))
+        for row, size in enumerate(sizes):
+            size = min(size, length)
+            if size > 1:
+                centered = np.arange(size) - (size - 1) / 2
+                weights[row, length - size:] = centered / (centered @ centered)
+        
+        slopes = weights @ np.column_stack((self.series['high'][-length:], self.series['low'][-length:]))
+        for row, size in enumerate(sizes):
+            self._slopes[('high', size)] = float(slopes[row, 0])
+            self._slopes[('low', size)] = float(slopes[row, 1])
+
 class AdvancedCryptoAnalyzer:
-    def __init__(self):
-        """Initialize the world-class crypto analyzer"""
+    def __init__(self, rules_only=False):
+        """Initialize the world-class crypto analyzer
+        
+        Models (and TensorFlow/scikit-learn) are only loaded on first use.
+        With ``rules_only`` they are never loaded, so TensorFlow is never
+        imported and startup takes milliseconds.
+        """
         self.model = None
-        self.scaler = MinMaxScaler()
-        self.pattern_model = None
-        self.setup_advanced_models()
+        self.rules_only = rules_only
+        self._scaler = None
+        self._price_model = None
+        self._pattern_model = None
+        self._ensemble_model = None
         
         # Professional trading parameters
         self.confidence_threshold = 0.75
@@ -29,20 +108,69 @@ class AdvancedCryptoAnalyzer:
         self.max_drawdown = 0.02
         
     def setup_advanced_models(self):
-        """Setup advanced deep learning models"""
+        """Setup advanced deep learning models (eagerly, instead of on first use)"""
+        # Mengakses property membangun model yang belum ada
         # 1. LSTM Model for price prediction
-        self.price_model = self.build_lstm_model()
+        self.price_model
         
         # 2. CNN Model for chart pattern recognition
-        self.pattern_model = self.build_cnn_model()
+        self.pattern_model
         
         # 3. Ensemble Model for final decision
-        self.ensemble_model = self.build_ensemble_model()
+        self.ensemble_model
         
         print("🤖 Advanced AI Models Initialized Successfully!")
     
+    def _require_models(self):
+        if self.rules_only:
+            raise RuntimeError("Models are disabled: analyzer runs in rules-only mode")
+    
+    @property
+    def models_loaded(self):
+        """Names of the models that have been built so far"""
+        built = {
+            'price_model': self._price_model,
+            'pattern_model': self._pattern_model,
+            'ensemble_model': self._ensemble_model
+        }
+        return [name for name, model in built.items() if model is not None]
+    
+    @property
+    def price_model(self):
+        """LSTM price model, built on first access"""
+        if self._price_model is None:
+            self._require_models()
+            self._price_model = self.build_lstm_model()
+        return self._price_model
+    
+    @property
+    def pattern_model(self):
+        """CNN chart pattern model, built on first access"""
+        if self._pattern_model is None:
+            self._require_models()
+            self._pattern_model = self.build_cnn_model()
+        return self._pattern_model
+    
+    @property
+    def ensemble_model(self):
+        """Ensemble decision model, built on first access"""
+        if self._ensemble_model is None:
+            self._require_models()
+            self._ensemble_model = self.build_ensemble_model()
+        return self._ensemble_model
+    
+    @property
+    def scaler(self):
+        """Feature scaler, created on first access"""
+        if self._scaler is None:
+            from sklearn.preprocessing import MinMaxScaler
+            self._scaler = MinMaxScaler()
+        return self._scaler
+    
     def build_lstm_model(self):
         """Build advanced LSTM model for price prediction"""
+        import tensorflow as tf
+        
         model = tf.keras.Sequential([
             tf.keras.layers.LSTM(128, return_sequences=True, input_shape=(60, 20)),
             tf.keras.layers.Dropout(0.2),
@@ -65,6 +193,8 @@ class AdvancedCryptoAnalyzer:
     
     def build_cnn_model(self):
         """Build advanced CNN model for pattern recognition"""
+        import tensorflow as tf
+        
         model = tf.keras.Sequential([
             tf.keras.layers.Conv2D(32, (3, 3), activation='relu', input_shape=(224, 224, 3)),
             tf.keras.layers.MaxPooling2D(2, 2),
@@ -92,6 +222,8 @@ class AdvancedCryptoAnalyzer:
     
     def build_ensemble_model(self):
         """Build ensemble model combining multiple algorithms"""
+        from sklearn.ensemble import GradientBoostingClassifier
+        
         return GradientBoostingClassifier(
             n_estimators=200,
             max_depth=10,
@@ -102,6 +234,8 @@ class AdvancedCryptoAnalyzer:
     def analyze_chart_image(self, image_path):
         """Analyze crypto chart image with advanced AI"""
         try:
+            import cv2
+            
             # Load and preprocess image
             image = cv2.imread(image_path)
             if image is None:
@@ -133,31 +267,171 @@ class AdvancedCryptoAnalyzer:
             print(f"Error in chart analysis: {e}")
             return self.generate_fallback_signal()
     
-    def extract_chart_data(self, image):
-        """Extract OHLCV data from chart image using computer vision"""
-        # Convert to grayscale
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        
-        # Detect candlesticks using contour detection
-        contours, _ = cv2.findContours(gray, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        # Extract candlestick data
-        candles = []
-        height, width = gray.shape
+    def analyze_comprehensive(self, price_data, symbol=None, timeframe=None, include_timings=False):
+        """Run the full analysis pipeline on raw candle data
+        
+        Stages: price data -> arrays, indicators, patterns, sentiment and the
+        master signal. With ``include_timings`` the per-stage wall time in
+        milliseconds is returned under ``timings``.
+        """
+        timings = {}
+        
+        def run_stage(name, func, *args):
+            start = time.perf_counter()
+            result = func(*args)
+            timings[name] = round((time.perf_counter() - start) * 1000, 3)
+            return result
+        
+        df = run_stage('to_arrays', self.price_data_to_frame, price_data)
+        indicators = run_stage('indicators', self.calculate_advanced_indicators, df)
+        patterns = run_stage('patterns', self.detect_advanced_patterns, None, df)
+        sentiment = run_stage('sentiment', self.analyze_market_sentiment, df)
+        signal = run_stage('signal', self.generate_master_signal, indicators, patterns, sentiment, df)
+        
+        analysis = self.assemble_analysis(signal, indicators, patterns, sentiment)
+        analysis['candles_analyzed'] = len(df)
+        
+        if include_timings:
+            timings['total'] = round(sum(timings.values()), 3)
+            analysis['timings'] = timings
+        
+        return analysis
+    
+    def price_data_to_frame(self, price_data):
+        """Convert candle data into an OHLCV DataFrame
+        
+        ``price_data`` is either a list of candle dicts (JSON requests) or a
+        dict of column arrays (columnar requests). float64 column arrays are
+        used as-is, without copying.
+        """
+        if isinstance(price_data, dict):
+            return self.columns_to_frame(price_data)
+        
+        if not price_data:
+            raise ValueError("No price data provided")
+        
+        count = len(price_data)
+        columns = {}
+        for column in OHLCV_COLUMNS:
+            # Volume boleh kosong (mis. data hasil ekstraksi gambar)
+            default = 0.0 if column == 'volume' else None
+            try:
+                columns[column] = np.fromiter(
+                    (candle[column] if default is None else candle.get(column, default)
+                     for candle in price_data),
+                    dtype=np.float64, count=count
+                )
+            except KeyError:
+                raise ValueError(f"Every candle needs a '{column}' value")
+        
+        return pd.DataFrame(columns, copy=False)
+    
+    def columns_to_frame(self, columns):
+        """Wrap a dict of OHLCV column arrays in a DataFrame without copying"""
+        frame = {}
+        for column in OHLCV_COLUMNS:
+            values = columns.get(column)
+            if values is None:
+                if column != 'volume':
+                    raise ValueError(f"Missing '{column}' column")
+                values = np.zeros(len(frame['close']))
+            frame[column] = as_float_array(values)
+        
+        count = len(frame['close'])
+        if count == 0:
+            raise ValueError("No price data provided")
+        if any(values.ndim != 1 or len(values) != count for values in frame.values()):
+            raise ValueError("All columns must be 1-D arrays of the same length")
+        
+        return pd.DataFrame(frame, copy=False)
+    
+    def analyze_batch(self, entries):
+        """Analyze many {symbol, timeframe, price_data} entries in one pass
+        
+        Series with the same length are stacked into 2-D arrays so their
+        indicators are computed in a single vectorized call. Returns one
+        result per entry, in input order, each with its own success/error.
+        """
+        results = [None] * len(entries)
+        groups = {}
+        
+        def failure(symbol, timeframe, error):
+            return {"success": False, "symbol": symbol, "timeframe": timeframe, "error": str(error)}
+        
+        for position, entry in enumerate(entries):
+            if not isinstance(entry, dict):
+                results[position] = failure(None, None, "Entry must be an object")
+                continue
+            
+            symbol = entry.get("symbol", "BTCUSDT")
+            timeframe = entry.get("timeframe", "1h")
+            try:
+                df = self.price_data_to_frame(entry.get("price_data"))
+                groups.setdefault(len(df), []).append((position, symbol, timeframe, df))
+            except Exception as e:
+                results[position] = failure(symbol, timeframe, e)
+        
+        for items in groups.values():
+            stacked = {
+                column: np.stack([df[column].to_numpy() for _, _, _, df in items])
+                for column in OHLCV_COLUMNS
+            }
+            series = compute_indicators(stacked['open'], stacked['high'], stacked['low'],
+                                        stacked['close'], stacked['volume'])
+            candles = candle_patterns(stacked['open'], stacked['high'],
+                                      stacked['low'], stacked['close'])
+            
+            for row, (position, symbol, timeframe, df) in enumerate(items):
+                try:
+                    indicators = indicator_snapshot(
+                        {name: values[row, -1] for name, values in series.items()},
+                        {name: values[row, -1] for name, values in candles.items()},
+                        stacked['close'][row, -1],
+                        stacked['volume'][row, -1]
+                    )
+                    patterns = self.detect_advanced_patterns(None, df)
+                    sentiment = self.analyze_market_sentiment(df)
+                    signal = self.generate_master_signal(indicators, patterns, sentiment, df)
+                    
+                    results[position] = {
+                        "success": True,
+                        "symbol": symbol,
+                        "timeframe": timeframe,
+                        "analysis": self.assemble_analysis(signal, indicators, patterns, sentiment)
+                    }
+                except Exception as e:
+                    results[position] = failure(symbol, timeframe, e)
+        
+        return results
+    
+    def assemble_analysis(self, signal, indicators, patterns, sentiment):
+        """Combine pipeline outputs into the analysis payload returned to clients"""
+        analysis = dict(signal)
+        analysis['signal'] = signal['action']
+        analysis['technical_indicators'] = indicators
+        analysis['patterns'] = patterns
+        analysis['sentiment'] = sentiment
+        return analysis
+    
+    def analyze_indicator_window(self, df, indicators):
+        """Analysis of a recent candle window whose indicators are already computed
+        
+        Used by the streaming feed, which updates indicators incrementally.
+        """
+        patterns = self.detect_advanced_patterns(None, df)
+        sentiment = self.analyze_market_sentiment(df)
+        signal = self.generate_master_signal(indicators, patterns, sentiment, df)
+        return self.assemble_analysis(signal, indicators, patterns, sentiment)
+    
+    def extract_chart_data(self, image, price_top=None, price_bottom=None):
+        """Extract OHLCV data from chart image using computer vision
         
-        # Simulate realistic OHLCV data based on image analysis
-        for i in range(100):  # Generate 100 candles
-            base_price = 50000 + np.random.normal(0, 5000)  # Bitcoin-like price
-            
-            candles.append({
-                'open': base_price + np.random.normal(0, 500),
-                'high': base_price + abs(np.random.normal(0, 800)),
-                'low': base_price - abs(np.random.normal(0, 800)),
-                'close': base_price + np.random.normal(0, 500),
-                'volume': np.random.uniform(100, 10000)
-            })
+        Candles are segmented by colour (see chart_extraction); without a
+        price_top/price_bottom scale the prices are in pixel units.
+        """
+        from chart_extraction import extract_candles
         
-        return pd.DataFrame(candles)
+        return self.columns_to_frame(extract_candles(image, price_top, price_bottom))
     
     def calculate_advanced_indicators(self, df):
         """Calculate comprehensive technical indicators"""
@@ -165,47 +439,22 @@ class AdvancedCryptoAnalyzer:
         
         try:
             # Price arrays
-            open_prices = np.array(df['open'], dtype=float)
-            high_prices = np.array(df['high'], dtype=float)
-            low_prices = np.array(df['low'], dtype=float)
-            close_prices = np.array(df['close'], dtype=float)
-            volumes = np.array(df['volume'], dtype=float)
-            
-            # 1. TREND INDICATORS
-            indicators['sma_20'] = talib.SMA(close_prices, timeperiod=20)[-1] if len(close_prices) >= 20 else close_prices[-1]
-            indicators['sma_50'] = talib.SMA(close_prices, timeperiod=50)[-1] if len(close_prices) >= 50 else close_prices[-1]
-            indicators['ema_12'] = talib.EMA(close_prices, timeperiod=12)[-1] if len(close_prices) >= 12 else close_prices[-1]
-            indicators['ema_26'] = talib.EMA(close_prices, timeperiod=26)[-1] if len(close_prices) >= 26 else close_prices[-1]
-            
-            # 2. MOMENTUM INDICATORS
-            indicators['rsi'] = talib.RSI(close_prices, timeperiod=14)[-1] if len(close_prices) >= 14 else 50
-            indicators['macd'], indicators['macd_signal'], indicators['macd_hist'] = talib.MACD(close_prices)
-            indicators['macd'] = indicators['macd'][-1] if indicators['macd'] is not None else 0
-            indicators['macd_signal'] = indicators['macd_signal'][-1] if indicators['macd_signal'] is not None else 0
-            
-            # 3. VOLATILITY INDICATORS
-            upper, middle, lower = talib.BBANDS(close_prices, timeperiod=20)
-            indicators['bb_upper'] = upper[-1] if upper is not None else close_prices[-1] * 1.02
-            indicators['bb_lower'] = lower[-1] if lower is not None else close_prices[-1] * 0.98
-            indicators['bb_position'] = (close_prices[-1] - indicators['bb_lower']) / (indicators['bb_upper'] - indicators['bb_lower'])
-            
-            # 4. VOLUME INDICATORS
-            indicators['obv'] = talib.OBV(close_prices, volumes)[-1] if len(close_prices) >= 2 else volumes[-1]
-            indicators['ad'] = talib.AD(high_prices, low_prices, close_prices, volumes)[-1] if len(close_prices) >= 2 else 0
-            
-            # 5. ADVANCED INDICATORS
-            indicators['adx'] = talib.ADX(high_prices, low_prices, close_prices, timeperiod=14)[-1] if len(close_prices) >= 14 else 25
-            indicators['cci'] = talib.CCI(high_prices, low_prices, close_prices, timeperiod=14)[-1] if len(close_prices) >= 14 else 0
-            indicators['williams_r'] = talib.WILLR(high_prices, low_prices, close_prices, timeperiod=14)[-1] if len(close_prices) >= 14 else -50
-            indicators['stoch_k'], indicators['stoch_d'] = talib.STOCH(high_prices, low_prices, close_prices)
-            indicators['stoch_k'] = indicators['stoch_k'][-1] if indicators['stoch_k'] is not None else 50
-            indicators['stoch_d'] = indicators['stoch_d'][-1] if indicators['stoch_d'] is not None else 50
-            
-            # 6. PATTERN RECOGNITION
-            indicators['hammer'] = talib.CDLHAMMER(open_prices, high_prices, low_prices, close_prices)[-1]
-            indicators['doji'] = talib.CDLDOJI(open_prices, high_prices, low_prices, close_prices)[-1]
-            indicators['engulfing'] = talib.CDLENGULFING(open_prices, high_prices, low_prices, close_prices)[-1]
-            indicators['shooting_star'] = talib.CDLSHOOTINGSTAR(open_prices, high_prices, low_prices, close_prices)[-1]
+            open_prices = as_float_array(df['open'])
+            high_prices = as_float_array(df['high'])
+            low_prices = as_float_array(df['low'])
+            close_prices = as_float_array(df['close'])
+            volumes = as_float_array(df['volume'])
+            
+            # Indicator engine yang sama dengan trainer (indicators.py)
+            series = compute_indicators(open_prices, high_prices, low_prices, close_prices, volumes)
+            patterns = candle_patterns(open_prices, high_prices, low_prices, close_prices)
+            
+            indicators = indicator_snapshot(
+                {name: values[-1] for name, values in series.items()},
+                {name: values[-1] for name, values in patterns.items()},
+                close_prices[-1],
+                volumes[-1]
+            )
             
         except Exception as e:
             print(f"Error calculating indicators: {e}")
@@ -225,8 +474,12 @@ class AdvancedCryptoAnalyzer:
             'hammer': 0, 'doji': 0, 'engulfing': 0, 'shooting_star': 0
         }
     
-    def detect_advanced_patterns(self, image, df):
-        """Detect advanced chart patterns using computer vision and TA"""
+    def detect_advanced_patterns(self, image, df, context=None):
+        """Detect advanced chart patterns using computer vision and TA
+        
+        Peaks, troughs and slopes come from one PatternContext per
+        analysis (built here unless the caller passes one).
+        """
         patterns = {
             'trend': 'SIDEWAYS',
             'support_resistance': [],
@@ -235,27 +488,28 @@ class AdvancedCryptoAnalyzer:
         }
         
         try:
+            if context is None:
+                context = PatternContext(df)
+            
             # Trend Analysis
-            if len(df) >= 20:
-                recent_highs = df['high'].tail(10).values
-                recent_lows = df['low'].tail(10).values
+            if len(context) >= 20:
+                trend_slope = context.slope('high', context.TREND_WINDOW)
                 
-                if np.polyfit(range(10), recent_highs, 1)[0] > 0:
+                if trend_slope > 0:
                     patterns['trend'] = 'BULLISH'
-                elif np.polyfit(range(10), recent_highs, 1)[0] < 0:
+                elif trend_slope < 0:
                     patterns['trend'] = 'BEARISH'
                 else:
                     patterns['trend'] = 'SIDEWAYS'
             
             # Support and Resistance Detection
-            if len(df) >= 50:
-                highs = df['high'].values
-                lows = df['low'].values
+            if len(context) >= 50:
+                highs = context.window('high')
+                lows = context.window('low')
                 
                 # Find local maxima and minima
-                from scipy.signal import find_peaks
-                resistance_peaks, _ = find_peaks(highs, distance=5)
-                support_peaks, _ = find_peaks(-lows, distance=5)
+                resistance_peaks = context.peaks(distance=5)
+                support_peaks = context.troughs(distance=5)
                 
                 if len(resistance_peaks) > 0:
                     patterns['support_resistance'].append({
@@ -272,45 +526,44 @@ class AdvancedCryptoAnalyzer:
                     })
             
             # Chart Pattern Detection
-            patterns['chart_patterns'] = self.detect_chart_patterns(df)
+            patterns['chart_patterns'] = self.detect_chart_patterns(df, context)
             
         except Exception as e:
             print(f"Error in pattern detection: {e}")
         
         return patterns
     
-    def detect_chart_patterns(self, df):
-        """Detect common chart patterns"""
+    def detect_chart_patterns(self, df, context=None):
+        """Detect common chart patterns over the last PATTERN_WINDOW candles"""
         patterns = []
         
         if len(df) < 20:
             return patterns
         
         try:
-            highs = df['high'].tail(20).values
-            lows = df['low'].tail(20).values
-            closes = df['close'].tail(20).values
+            if context is None:
+                context = PatternContext(df)
             
             # Head and Shoulders
-            if self.is_head_and_shoulders(highs):
+            if self.is_head_and_shoulders(context):
                 patterns.append('HEAD_AND_SHOULDERS')
             
             # Double Top/Bottom
-            if self.is_double_top(highs):
+            if self.is_double_top(context):
                 patterns.append('DOUBLE_TOP')
-            if self.is_double_bottom(lows):
+            if self.is_double_bottom(context):
                 patterns.append('DOUBLE_BOTTOM')
             
             # Triangle Patterns
-            if self.is_ascending_triangle(highs, lows):
+            if self.is_ascending_triangle(context):
                 patterns.append('ASCENDING_TRIANGLE')
-            if self.is_descending_triangle(highs, lows):
+            if self.is_descending_triangle(context):
                 patterns.append('DESCENDING_TRIANGLE')
             
             # Flag and Pennant
-            if self.is_flag_pattern(closes):
+            if self.is_flag_pattern(context):
                 patterns.append('FLAG')
-            if self.is_pennant_pattern(highs, lows):
+            if self.is_pennant_pattern(context):
                 patterns.append('PENNANT')
             
         except Exception as e:
@@ -318,14 +571,14 @@ class AdvancedCryptoAnalyzer:
         
         return patterns
     
-    def is_head_and_shoulders(self, highs):
+    def is_head_and_shoulders(self, context):
         """Detect Head and Shoulders pattern"""
+        highs = context.window('high', context.PATTERN_WINDOW)
         if len(highs) < 15:
             return False
         
         # Find the three peaks
-        from scipy.signal import find_peaks
-        peaks, _ = find_peaks(highs, distance=3)
+        peaks = context.peaks(context.PATTERN_WINDOW, distance=3)
         
         if len(peaks) >= 3:
             # Check if middle peak is highest
@@ -334,10 +587,10 @@ class AdvancedCryptoAnalyzer:
         
         return False
     
-    def is_double_top(self, highs):
+    def is_double_top(self, context):
         """Detect Double Top pattern"""
-        from scipy.signal import find_peaks
-        peaks, _ = find_peaks(highs, distance=5)
+        highs = context.window('high', context.PATTERN_WINDOW)
+        peaks = context.peaks(context.PATTERN_WINDOW, distance=5)
         
         if len(peaks) >= 2:
             # Check if last two peaks are similar height
@@ -346,10 +599,10 @@ class AdvancedCryptoAnalyzer:
         
         return False
     
-    def is_double_bottom(self, lows):
+    def is_double_bottom(self, context):
         """Detect Double Bottom pattern"""
-        from scipy.signal import find_peaks
-        valleys, _ = find_peaks(-lows, distance=5)
+        lows = context.window('low', context.PATTERN_WINDOW)
+        valleys = context.troughs(context.PATTERN_WINDOW, distance=5)
         
         if len(valleys) >= 2:
             # Check if last two valleys are similar depth
@@ -358,24 +611,25 @@ class AdvancedCryptoAnalyzer:
         
         return False
     
-    def is_ascending_triangle(self, highs, lows):
+    def is_ascending_triangle(self, context):
         """Detect Ascending Triangle pattern"""
         # Resistance line should be flat, support line should be rising
-        resistance_slope = np.polyfit(range(len(highs)), highs, 1)[0]
-        support_slope = np.polyfit(range(len(lows)), lows, 1)[0]
+        resistance_slope = context.slope('high', context.PATTERN_WINDOW)
+        support_slope = context.slope('low', context.PATTERN_WINDOW)
         
         return abs(resistance_slope) < 50 and support_slope > 20
     
-    def is_descending_triangle(self, highs, lows):
+    def is_descending_triangle(self, context):
         """Detect Descending Triangle pattern"""
         # Support line should be flat, resistance line should be falling
-        resistance_slope = np.polyfit(range(len(highs)), highs, 1)[0]
-        support_slope = np.polyfit(range(len(lows)), lows, 1)[0]
+        resistance_slope = context.slope('high', context.PATTERN_WINDOW)
+        support_slope = context.slope('low', context.PATTERN_WINDOW)
         
         return abs(support_slope) < 50 and resistance_slope < -20
     
-    def is_flag_pattern(self, closes):
+    def is_flag_pattern(self, context):
         """Detect Flag pattern"""
+        closes = context.window('close', context.PATTERN_WINDOW)
         if len(closes) < 10:
             return False
         
@@ -385,14 +639,14 @@ class AdvancedCryptoAnalyzer:
         
         return recent_range < previous_range * 0.3
     
-    def is_pennant_pattern(self, highs, lows):
+    def is_pennant_pattern(self, context):
         """Detect Pennant pattern"""
-        if len(highs) < 10:
+        if len(context.window('high', context.PATTERN_WINDOW)) < 10:
             return False
         
         # Converging trend lines
-        high_slope = abs(np.polyfit(range(len(highs[-10:])), highs[-10:], 1)[0])
-        low_slope = abs(np.polyfit(range(len(lows[-10:])), lows[-10:], 1)[0])
+        high_slope = abs(context.slope('high', context.TREND_WINDOW))
+        low_slope = abs(context.slope('low', context.TREND_WINDOW))
         
         return high_slope > 10 and low_slope > 10
     
@@ -445,6 +699,19 @@ class AdvancedCryptoAnalyzer:
         
         return sentiment
     
+    def master_rule_inputs(self, indicators, patterns, sentiment):
+        """Scalar inputs of MASTER_RULES (MASTER_SCORING_COLUMNS) for one analysis"""
+        directions = {'BULLISH': 1.0, 'BEARISH': -1.0}
+        defaults = {'rsi': 50, 'macd': 0, 'macd_signal': 0, 'bb_position': 0.5, 'adx': 25,
+                    'ema_12': 0, 'ema_26': 0, 'hammer': 0, 'shooting_star': 0, 'engulfing': 0}
+        values = {name: indicators.get(name, default) for name, default in defaults.items()}
+        values['trend'] = directions.get(patterns.get('trend', 'SIDEWAYS'), 0.0)
+        values['sentiment'] = directions.get(sentiment.get('overall', 'NEUTRAL'), 0.0)
+        chart_patterns = patterns.get('chart_patterns', [])
+        for pattern in BULLISH_PATTERNS + BEARISH_PATTERNS:
+            values[pattern] = float(pattern in chart_patterns)
+        return values
+    
     def generate_master_signal(self, indicators, patterns, sentiment, df):
         """Generate master trading signal using advanced AI"""
         try:
@@ -458,99 +725,19 @@ class AdvancedCryptoAnalyzer:
                 'reasoning': []
             }
             
-            buy_score = 0
-            sell_score = 0
-            
-            # 1. TECHNICAL INDICATORS ANALYSIS
-            rsi = indicators.get('rsi', 50)
-            macd = indicators.get('macd', 0)
-            bb_position = indicators.get('bb_position', 0.5)
-            adx = indicators.get('adx', 25)
-            
-            # RSI Analysis
-            if rsi < 30:
-                buy_score += 2
-                signal_data['reasoning'].append('RSI Oversold')
-            elif rsi > 70:
-                sell_score += 2
-                signal_data['reasoning'].append('RSI Overbought')
-            
-            # MACD Analysis
-            macd_signal = indicators.get('macd_signal', 0)
-            if macd > macd_signal and macd > 0:
-                buy_score += 1.5
-                signal_data['reasoning'].append('MACD Bullish')
-            elif macd < macd_signal and macd < 0:
-                sell_score += 1.5
-                signal_data['reasoning'].append('MACD Bearish')
-            
-            # Bollinger Bands
-            if bb_position < 0.2:
-                buy_score += 1
-                signal_data['reasoning'].append('BB Oversold')
-            elif bb_position > 0.8:
-                sell_score += 1
-                signal_data['reasoning'].append('BB Overbought')
-            
-            # Trend Strength (ADX)
-            if adx > 25:
-                if indicators.get('ema_12', 0) > indicators.get('ema_26', 0):
-                    buy_score += 1
-                    signal_data['reasoning'].append('Strong Uptrend')
-                else:
-                    sell_score += 1
-                    signal_data['reasoning'].append('Strong Downtrend')
-            
-            # 2. PATTERN ANALYSIS
-            trend = patterns.get('trend', 'SIDEWAYS')
-            if trend == 'BULLISH':
-                buy_score += 1.5
-                signal_data['reasoning'].append('Bullish Trend')
-            elif trend == 'BEARISH':
-                sell_score += 1.5
-                signal_data['reasoning'].append('Bearish Trend')
-            
-            # Chart Patterns
-            chart_patterns = patterns.get('chart_patterns', [])
-            for pattern in chart_patterns:
-                if pattern in ['DOUBLE_BOTTOM', 'ASCENDING_TRIANGLE', 'FLAG']:
-                    buy_score += 1
-                    signal_data['reasoning'].append(f'Bullish {pattern}')
-                elif pattern in ['DOUBLE_TOP', 'HEAD_AND_SHOULDERS', 'DESCENDING_TRIANGLE']:
-                    sell_score += 1
-                    signal_data['reasoning'].append(f'Bearish {pattern}')
-            
-            # 3. SENTIMENT ANALYSIS
-            sentiment_overall = sentiment.get('overall', 'NEUTRAL')
-            if sentiment_overall == 'BULLISH':
-                buy_score += 0.5
-                signal_data['reasoning'].append('Bullish Sentiment')
-            elif sentiment_overall == 'BEARISH':
-                sell_score += 0.5
-                signal_data['reasoning'].append('Bearish Sentiment')
-            
-            # 4. CANDLESTICK PATTERNS
-            if indicators.get('hammer', 0) > 0:
-                buy_score += 1
-                signal_data['reasoning'].append('Hammer Pattern')
-            if indicators.get('shooting_star', 0) > 0:
-                sell_score += 1
-                signal_data['reasoning'].append('Shooting Star Pattern')
-            if indicators.get('engulfing', 0) > 0:
-                if indicators.get('engulfing', 0) > 0:
-                    buy_score += 1
-                    signal_data['reasoning'].append('Bullish Engulfing')
-                else:
-                    sell_score += 1
-                    signal_data['reasoning'].append('Bearish Engulfing')
+            # 1-4. INDIKATOR, PATTERN, SENTIMENT, CANDLESTICK: tabel MASTER_RULES
+            # (signal_scoring), evaluator yang sama dengan backtest per bar
+            buy_score, sell_score, reasoning = MASTER_SCORER.score_bar(
+                self.master_rule_inputs(indicators, patterns, sentiment))
+            signal_data['reasoning'].extend(reasoning)
             
             # 5. FINAL SIGNAL GENERATION
             total_score = buy_score + sell_score
             if total_score > 0:
-                if buy_score > sell_score and buy_score >= 3:
+                if buy_score > sell_score and buy_score >= MASTER_SIGNAL_PARAMS['score_threshold']:
                     signal_data['action'] = 'BUY'
                     signal_data['confidence'] = min(0.95, buy_score / (buy_score + sell_score))
-                elif sell_score > buy_score and sell_score >= 3:
+                elif sell_score > buy_score and sell_score >= MASTER_SIGNAL_PARAMS['score_threshold']:
                     signal_data['action'] = 'SELL'
                     signal_data['confidence'] = min(0.95, sell_score / (buy_score + sell_score))
                 else:
@@ -8,12 +8,14 @@ Features real-time analysis, WebSocket support, and professional-grade predictio
 import os
 import sys
 import json
+import html
 import time
 import threading
 import signal
 import traceback
 from pathlib import Path
 from datetime import datetime
+from collections import namedtuple
 from typing import Dict, List, Optional, Any
 
 # HTTP Server imports
@@ -21,6 +23,8 @@ from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 import socketserver
 
+from analysis_pool import AnalysisPool, AnalysisQueueFull, AnalysisTimeout
+
 # WebSocket support
 try:
     import websockets
@@ -30,16 +34,18 @@ except ImportError:
     WEBSOCKET_AVAILABLE = False
     print("WebSocket support not available. Install with: pip install websockets")
 
-# AI and analysis imports
+# AI and analysis imports (cv2 is imported on the first image request)
 try:
     import numpy as np
-    import cv2
-    from PIL import Image
-    import io
     import base64
     
     # Import our advanced crypto analyzer
-    from advanced_crypto_analyzer import AdvancedCryptoAnalyzer
+    from advanced_crypto_analyzer import AdvancedCryptoAnalyzer, OHLCV_COLUMNS
+    from columnar_format import COLUMNAR_CONTENT_TYPE, ColumnarFormatError, decode_columnar
+    from image_upload import ImageDecodeError, decode_image, parse_multipart_upload
+    from result_cache import ResultCache, fingerprint
+    from image_cache import PerceptualImageCache
+    from chart_extraction import ChartExtractionError, find_candles, pixels_to_prices
     AI_AVAILABLE = True
 except ImportError as e:
     AI_AVAILABLE = False
@@ -54,6 +60,10 @@ class CryptoAIServer:
         self.ai_analyzer = None
         self.server = None
         self.websocket_server = None
+        self.websocket_feed = None
+        self.analysis_pool = None
+        self.result_cache = None
+        self.image_cache = None
         
         # Performance tracking
         self.request_count = 0
@@ -62,11 +72,32 @@ class CryptoAIServer:
         
         # Configuration
         self.config = self.load_config()
+        self.host = self.config["server_host"]
+        self.port = self.config["server_port"]
+        self.websocket_port = self.config.get("websocket_port") or self.port + 1
+        self.router = AIRequestRouter(self)
         
         # Initialize AI analyzer if available
+        global AI_AVAILABLE
         if AI_AVAILABLE:
             try:
-                self.ai_analyzer = AdvancedCryptoAnalyzer()
+                # "rules_only" tidak pernah meng-import TensorFlow; "full" memuat
+                # model secara lazy saat pertama dipakai
+                rules_only = self.config.get("analyzer_mode", "rules_only") == "rules_only"
+                self.ai_analyzer = AdvancedCryptoAnalyzer(rules_only=rules_only)
+                
+                # Hasil /analyze untuk candle yang identik dipakai ulang (0 = nonaktif)
+                if self.config.get("result_cache_size", 256) > 0:
+                    self.result_cache = ResultCache(self.config["result_cache_size"],
+                                                    self.config.get("result_cache_ttl", 60))
+                
+                # Candle hasil ekstraksi screenshot yang hampir identik dipakai ulang
+                if self.config.get("image_cache_size", 32) > 0:
+                    self.image_cache = PerceptualImageCache(
+                        self.config["image_cache_size"],
+                        max_distance=self.config.get("image_cache_distance", 3),
+                        ttl_seconds=self.config.get("image_cache_ttl", 30)
+                    )
                 print("🤖 Advanced Crypto AI Analyzer initialized successfully")
             except Exception as e:
                 print(f"❌ Failed to initialize AI analyzer: {e}")
@@ -78,9 +109,27 @@ class CryptoAIServer:
         default_config = {
             "server_host": self.host,
             "server_port": self.port,
+            "server_mode": "threaded",
+            "max_concurrent_requests": 32,
+            "worker_threads": None,
+            "keepalive_timeout": 15,
             "max_image_size": 2048,
+            "max_batch_entries": 100,
+            "include_timings": False,
+            "analyzer_mode": "rules_only",
             "timeout_seconds": 30,
+            "timeout_grace_seconds": 5,
+            "worker_processes": 0,
+            "max_queue_depth": 64,
+            "result_cache_size": 256,
+            "result_cache_ttl": 60,
+            "image_cache_size": 32,
+            "image_cache_distance": 3,
+            "image_cache_ttl": 30,
             "enable_websocket": True,
+            "websocket_port": None,
+            "websocket_history": 500,
+            "websocket_max_subscriptions": 50,
             "enable_cors": True,
             "log_requests": True
         }
@@ -97,6 +146,46 @@ class CryptoAIServer:
         
         return default_config
     
+    def start_analysis_pool(self):
+        """Fork the warm analyzer worker processes when worker_processes > 0"""
+        processes = self.config.get("worker_processes", 0)
+        if not processes or not self.ai_analyzer:
+            return 0
+        
+        self.analysis_pool = AnalysisPool(
+            processes,
+            max_queue_depth=self.config.get("max_queue_depth", 64),
+            timeout_seconds=self.config.get("timeout_seconds", 30),
+            rules_only=self.ai_analyzer.rules_only,
+            timeout_grace_seconds=self.config.get("timeout_grace_seconds", 5)
+        )
+        ready = self.analysis_pool.start()
+        if not ready:
+            # Worker gagal warm-up: server tetap jalan dengan analisis di thread request
+            self.log("Analysis workers failed to start, analyzing in-process", "ERROR")
+            self.analysis_pool = None
+        return ready
+    
+    def run_analysis(self, method_name, *args, **kwargs):
+        """Call an analyzer method in the worker pool, or in-process without one"""
+        if self.analysis_pool is None:
+            return getattr(self.ai_analyzer, method_name)(*args, **kwargs)
+        return self.analysis_pool.run(method_name, *args, **kwargs)
+    
+    def start_websocket_server(self):
+        """Start the streaming signal feed when it is enabled and available"""
+        if not (self.config.get("enable_websocket", True) and WEBSOCKET_AVAILABLE and self.ai_analyzer):
+            return False
+        
+        from websocket_feed import SignalFeed
+        self.websocket_feed = SignalFeed(
+            self,
+            history_limit=self.config.get("websocket_history", 500),
+            max_subscriptions=self.config.get("websocket_max_subscriptions", 50)
+        )
+        self.websocket_server = self.websocket_feed.start(self.host, self.websocket_port)
+        return True
+    
     def log(self, message, level="INFO"):
         """Enhanced logging with timestamps"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -108,62 +197,90 @@ class CryptoAIServer:
             with open(log_file, "a", encoding="utf-8") as f:
                 f.write(f"[{timestamp}] [{level}] {message}\n")
 
-class AIRequestHandler(BaseHTTPRequestHandler):
-    def __init__(self, request, client_address, server):
-        self.ai_server = server.ai_server
-        super().__init__(request, client_address, server)
-    
-    def do_OPTIONS(self):
-        """Handle CORS preflight requests"""
-        if self.ai_server.config.get("enable_cors", True):
-            self.send_response(200)
-            self.send_header("Access-Control-Allow-Origin", "*")
-            self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
-            self.send_header("Access-Control-Allow-Headers", "Content-Type, Authorization")
-            self.end_headers()
-        else:
-            self.send_error(405)
-    
-    def do_GET(self):
-        """Handle GET requests"""
-        try:
-            parsed_path = urlparse(self.path)
-            path = parsed_path.path
-            
-            if path == "/":
-                self.serve_status_page()
-            elif path == "/status":
-                self.serve_status_json()
-            elif path == "/health":
-                self.serve_health_check()
-            elif path == "/analyze":
-                # GET analyze with query parameters
-                params = parse_qs(parsed_path.query)
-                self.handle_analyze_request(params)
-            else:
-                self.send_error(404, "Endpoint not found")
-                
-        except Exception as e:
-            self.ai_server.log(f"Error in GET request: {str(e)}", "ERROR")
-            self.send_error(500, f"Internal server error: {str(e)}")
-    
-    def do_POST(self):
-        """Handle POST requests"""
+Response = namedtuple("Response", ["status", "reason", "content_type", "body", "headers"])
+
+class AIRequestRouter:
+    """Routes shared by the threaded and the asyncio front-end
+
+    Transports parse the request, call ``check_request`` before reading the
+    body and ``route`` afterwards, and write the returned ``Response``.
+    """
+    # Batas ukuran body per endpoint POST
+    BODY_LIMITS = {
+        "/analyze": 10 * 1024 * 1024,        # 10MB limit
+        "/analyze_batch": 50 * 1024 * 1024,  # 50MB limit for batches
+        "/analyze_image": 20 * 1024 * 1024   # 20MB limit for images
+    }
+
+    def __init__(self, ai_server):
+        self.ai_server = ai_server
+
+    def is_cpu_bound(self, method, target):
+        """Analysis endpoints are offloaded to a worker pool by async transports"""
+        return method == "POST" and urlparse(target).path in self.BODY_LIMITS
+
+    def check_request(self, method, target, content_length):
+        """Reject a request before its body is read; returns a Response or None"""
+        path = urlparse(target).path
+        if method != "POST" or path not in self.BODY_LIMITS:
+            return None
+
+        if not AI_AVAILABLE or not self.ai_server.ai_analyzer:
+            return self.error_response(503, "AI analyzer not available")
+
+        if content_length > self.BODY_LIMITS[path]:
+            message = "Image too large" if path == "/analyze_image" else "Request too large"
+            return self.error_response(413, message)
+
+        return None
+
+    def route(self, method, target, body=b"", content_type=""):
+        """Dispatch one request and return its Response"""
+        parsed_path = urlparse(target)
+        path = parsed_path.path
+
         try:
-            parsed_path = urlparse(self.path)
-            path = parsed_path.path
-            
-            if path == "/analyze":
-                self.handle_analyze_post()
-            elif path == "/analyze_image":
-                self.handle_image_analysis()
-            else:
-                self.send_error(404, "Endpoint not found")
-                
+            if method == "OPTIONS":
+                return self.serve_options()
+
+            if method == "GET":
+                if path == "/":
+                    return self.serve_status_page()
+                elif path == "/status":
+                    return self.serve_status_json()
+                elif path == "/health":
+                    return self.serve_health_check()
+                elif path == "/analyze":
+                    # GET analyze with query parameters
+                    params = parse_qs(parsed_path.query)
+                    return self.handle_analyze_request(params)
+                return self.error_response(404, "Endpoint not found")
+
+            if method == "POST":
+                if path == "/analyze":
+                    return self.handle_analyze_post(body, content_type)
+                elif path == "/analyze_batch":
+                    return self.handle_analyze_batch(body)
+                elif path == "/analyze_image":
+                    return self.handle_image_analysis(body, content_type, parse_qs(parsed_path.query))
+                return self.error_response(404, "Endpoint not found")
+
+            return self.error_response(501, f"Unsupported method ({method})")
+
         except Exception as e:
-            self.ai_server.log(f"Error in POST request: {str(e)}", "ERROR")
-            self.send_error(500, f"Internal server error: {str(e)}")
-    
+            self.ai_server.log(f"Error in {method} request: {str(e)}", "ERROR")
+            return self.error_response(500, f"Internal server error: {str(e)}")
+
+    def serve_options(self):
+        """Handle CORS preflight requests"""
+        if self.ai_server.config.get("enable_cors", True):
+            return Response(200, "OK", None, b"", [
+                ("Access-Control-Allow-Origin", "*"),
+                ("Access-Control-Allow-Methods", "GET, POST, OPTIONS"),
+                ("Access-Control-Allow-Headers", "Content-Type, Authorization")
+            ])
+        return self.error_response(405)
+
     def serve_status_page(self):
         """Serve HTML status page"""
         uptime = time.time() - self.ai_server.start_time
@@ -216,7 +333,8 @@ class AIRequestHandler(BaseHTTPRequestHandler):
             <div class="ai-status">
                 {'✅ AI Analyzer Ready' if AI_AVAILABLE else '❌ AI Analyzer Not Available'}
             </div>
-            {f'<div>Model loaded: {self.ai_server.ai_analyzer.model_path if self.ai_server.ai_analyzer else "N/A"}</div>' if AI_AVAILABLE else ''}
+            {f'<div>Analyzer mode: {self.ai_server.config.get("analyzer_mode", "rules_only")}</div>' if AI_AVAILABLE else ''}
+            {f'<div>Models loaded: {", ".join(self.ai_server.ai_analyzer.models_loaded) or "none"}</div>' if self.ai_server.ai_analyzer else ''}
         </div>
         
         <div class="status">
@@ -225,6 +343,7 @@ class AIRequestHandler(BaseHTTPRequestHandler):
             <div class="endpoint"><strong>GET /status</strong> - JSON status information</div>
             <div class="endpoint"><strong>GET /health</strong> - Health check</div>
             <div class="endpoint"><strong>POST /analyze</strong> - Analyze crypto data (JSON)</div>
+            <div class="endpoint"><strong>POST /analyze_batch</strong> - Analyze many symbols in one request (JSON)</div>
             <div class="endpoint"><strong>POST /analyze_image</strong> - Analyze chart image</div>
         </div>
         
@@ -232,19 +351,14 @@ class AIRequestHandler(BaseHTTPRequestHandler):
             <h2>Configuration</h2>
             <div>Host: {self.ai_server.host}:{self.ai_server.port}</div>
             <div>CORS: {'Enabled' if self.ai_server.config.get("enable_cors") else 'Disabled'}</div>
-            <div>WebSocket: {'Available' if WEBSOCKET_AVAILABLE else 'Not Available'}</div>
+            <div>WebSocket: {f'ws://{self.ai_server.host}:{self.ai_server.websocket_port}' if self.ai_server.websocket_feed else ('Available' if WEBSOCKET_AVAILABLE else 'Not Available')}</div>
         </div>
     </div>
 </body>
 </html>
 """
         
-        self.send_response(200)
-        self.send_header("Content-type", "text/html")
-        if self.ai_server.config.get("enable_cors", True):
-            self.send_header("Access-Control-Allow-Origin", "*")
-        self.end_headers()
-        self.wfile.write(html.encode())
+        return self.cors_response(200, "text/html", html.encode())
     
     def serve_status_json(self):
         """Serve JSON status information"""
@@ -256,7 +370,18 @@ class AIRequestHandler(BaseHTTPRequestHandler):
             "requests_handled": self.ai_server.request_count,
             "errors": self.ai_server.error_count,
             "ai_available": AI_AVAILABLE,
+            "analyzer_mode": self.ai_server.config.get("analyzer_mode", "rules_only"),
+            "models_loaded": self.ai_server.ai_analyzer.models_loaded if self.ai_server.ai_analyzer else [],
+            "analysis_pool": self.ai_server.analysis_pool.stats() if self.ai_server.analysis_pool else None,
+            "result_cache": self.ai_server.result_cache.stats() if self.ai_server.result_cache else None,
+            "image_cache": self.ai_server.image_cache.stats() if self.ai_server.image_cache else None,
             "websocket_available": WEBSOCKET_AVAILABLE,
+            "websocket": {
+                "running": self.ai_server.websocket_feed is not None,
+                "port": self.ai_server.websocket_port,
+                "connections": self.ai_server.websocket_feed.connections if self.ai_server.websocket_feed else 0,
+                "subscriptions": self.ai_server.websocket_feed.subscriptions if self.ai_server.websocket_feed else 0
+            },
             "server_info": {
                 "host": self.ai_server.host,
                 "port": self.ai_server.port,
@@ -265,7 +390,7 @@ class AIRequestHandler(BaseHTTPRequestHandler):
             "timestamp": datetime.now().isoformat()
         }
         
-        self.send_json_response(status)
+        return self.json_response(status)
     
     def serve_health_check(self):
         """Serve health check endpoint"""
@@ -275,13 +400,12 @@ class AIRequestHandler(BaseHTTPRequestHandler):
             "timestamp": datetime.now().isoformat()
         }
         
-        self.send_json_response(health)
+        return self.json_response(health)
     
     def handle_analyze_request(self, params):
         """Handle analyze request with parameters"""
         if not AI_AVAILABLE or not self.ai_server.ai_analyzer:
-            self.send_error(503, "AI analyzer not available")
-            return
+            return self.error_response(503, "AI analyzer not available")
         
         try:
             # Extract analysis parameters
@@ -292,81 +416,136 @@ class AIRequestHandler(BaseHTTPRequestHandler):
             # In real implementation, you would get actual price data
             result = self.generate_sample_analysis(symbol, timeframe)
             
-            self.send_json_response(result)
+            return self.json_response(result)
             
         except Exception as e:
             self.ai_server.error_count += 1
             self.ai_server.log(f"Error in analyze request: {str(e)}", "ERROR")
-            self.send_error(500, f"Analysis error: {str(e)}")
+            return self.error_response(500, f"Analysis error: {str(e)}")
     
-    def handle_analyze_post(self):
-        """Handle POST analyze request with JSON data"""
+    def handle_analyze_post(self, post_data, content_type=""):
+        """Handle POST analyze request with JSON or binary columnar data"""
         if not AI_AVAILABLE or not self.ai_server.ai_analyzer:
-            self.send_error(503, "AI analyzer not available")
-            return
+            return self.error_response(503, "AI analyzer not available")
         
         try:
-            content_length = int(self.headers.get('Content-Length', 0))
-            if content_length > 10 * 1024 * 1024:  # 10MB limit
-                self.send_error(413, "Request too large")
-                return
-            
-            post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
+            if content_type.split(";")[0].strip().lower() == COLUMNAR_CONTENT_TYPE:
+                # OHLCV sebagai array little-endian: dibungkus np.frombuffer, tanpa copy
+                metadata, columns = decode_columnar(post_data)
+                data = dict(metadata, price_data=columns)
+            else:
+                data = json.loads(post_data.decode('utf-8'))
             
             # Process the analysis request
             result = self.process_analysis_data(data)
             
-            self.send_json_response(result)
+            return self.json_response(result)
             
         except json.JSONDecodeError:
-            self.send_error(400, "Invalid JSON data")
+            return self.error_response(400, "Invalid JSON data")
+        except ColumnarFormatError as e:
+            return self.error_response(400, f"Invalid columnar data: {str(e)}")
+        except (AnalysisQueueFull, AnalysisTimeout) as e:
+            return self.pool_error_response(e)
         except Exception as e:
             self.ai_server.error_count += 1
             self.ai_server.log(f"Error in POST analyze: {str(e)}", "ERROR")
-            self.send_error(500, f"Analysis error: {str(e)}")
+            return self.error_response(500, f"Analysis error: {str(e)}")
     
-    def handle_image_analysis(self):
-        """Handle image analysis from screen capture"""
+    def handle_analyze_batch(self, post_data):
+        """Handle POST batch analyze request for many symbols at once"""
         if not AI_AVAILABLE or not self.ai_server.ai_analyzer:
-            self.send_error(503, "AI analyzer not available")
-            return
+            return self.error_response(503, "AI analyzer not available")
         
         try:
-            content_length = int(self.headers.get('Content-Length', 0))
-            if content_length > 20 * 1024 * 1024:  # 20MB limit for images
-                self.send_error(413, "Image too large")
-                return
-            
-            post_data = self.rfile.read(content_length)
             data = json.loads(post_data.decode('utf-8'))
             
-            # Extract base64 image data
-            if "image" not in data:
-                self.send_error(400, "No image data provided")
-                return
+            # Terima {"entries": [...]} atau langsung list entries
+            entries = data.get("entries") if isinstance(data, dict) else data
+            if not isinstance(entries, list) or not entries:
+                return self.error_response(400, "Expected a non-empty list of entries")
+            
+            max_entries = self.ai_server.config.get("max_batch_entries", 100)
+            if len(entries) > max_entries:
+                return self.error_response(413, f"Too many entries (max {max_entries})")
+            
+            results = self.ai_server.run_analysis("analyze_batch", entries)
+            
+            return self.json_response({
+                "success": True,
+                "timestamp": datetime.now().isoformat(),
+                "count": len(results),
+                "error_count": sum(1 for result in results if not result["success"]),
+                "results": results
+            })
+            
+        except json.JSONDecodeError:
+            return self.error_response(400, "Invalid JSON data")
+        except (AnalysisQueueFull, AnalysisTimeout) as e:
+            return self.pool_error_response(e)
+        except Exception as e:
+            self.ai_server.error_count += 1
+            self.ai_server.log(f"Error in POST analyze_batch: {str(e)}", "ERROR")
+            return self.error_response(500, f"Batch analysis error: {str(e)}")
+    
+    def handle_image_analysis(self, post_data, content_type="", params=None):
+        """Handle image analysis from screen capture
+        
+        Accepts a raw image body (application/octet-stream or image/*, with
+        symbol/timeframe/timings in the query string), multipart/form-data
+        with an "image" part, or the JSON {"image": base64} format.
+        """
+        if not AI_AVAILABLE or not self.ai_server.ai_analyzer:
+            return self.error_response(503, "AI analyzer not available")
+        
+        try:
+            media_type = content_type.split(";")[0].strip().lower()
             
-            image_data = data["image"]
-            if image_data.startswith("data:image"):
-                # Remove data URL prefix
-                image_data = image_data.split(",")[1]
+            if media_type == "application/octet-stream" or media_type.startswith("image/"):
+                # Raw upload: body adalah file gambar, di-decode langsung tanpa copy
+                data = {name: values[0] for name, values in (params or {}).items()}
+                image_bytes = post_data
+            elif media_type == "multipart/form-data":
+                data, image_bytes = parse_multipart_upload(post_data, content_type)
+            else:
+                data = json.loads(post_data.decode('utf-8'))
+                
+                # Extract base64 image data
+                if "image" not in data:
+                    return self.error_response(400, "No image data provided")
+                
+                image_data = data["image"]
+                if image_data.startswith("data:image"):
+                    # Remove data URL prefix
+                    image_data = image_data.split(",")[1]
+                
+                image_bytes = base64.b64decode(image_data)
             
-            # Decode base64 image
-            image_bytes = base64.b64decode(image_data)
-            image = Image.open(io.BytesIO(image_bytes))
+            # Skala harga opsional: harga di baris pixel paling atas / bawah screenshot
+            try:
+                price_scale = tuple(float(data[name]) if data.get(name) is not None else None
+                                    for name in ("price_top", "price_bottom"))
+            except (TypeError, ValueError):
+                return self.error_response(400, "price_top and price_bottom must be numbers")
             
-            # Convert to numpy array for processing
-            image_array = np.array(image)
+            # Decode sekali ke BGR, diperkecil saat decode sesuai max_image_size
+            image_array = decode_image(image_bytes, self.ai_server.config.get("max_image_size", 2048))
             
             # Process image analysis
-            result = self.process_image_analysis(image_array, data)
+            result = self.process_image_analysis(image_array, data, price_scale)
             
-            self.send_json_response(result)
+            return self.json_response(result)
             
+        except json.JSONDecodeError:
+            return self.error_response(400, "Invalid JSON data")
+        except ImageDecodeError as e:
+            return self.error_response(400, str(e))
+        except (AnalysisQueueFull, AnalysisTimeout) as e:
+            return self.pool_error_response(e)
         except Exception as e:
             self.ai_server.error_count += 1
             self.ai_server.log(f"Error in image analysis: {str(e)}", "ERROR")
-            self.send_error(500, f"Image analysis error: {str(e)}")
+            return self.error_response(500, f"Image analysis error: {str(e)}")
     
     def process_analysis_data(self, data):
         """Process analysis request with price/indicator data"""
@@ -378,32 +557,99 @@ class AIRequestHandler(BaseHTTPRequestHandler):
             if not price_data:
                 return self.generate_sample_analysis(symbol, timeframe)
             
-            # Use AI analyzer to process real data
-            # This is where you'd implement the actual AI analysis
-            result = self.ai_server.ai_analyzer.analyze_comprehensive(
-                price_data=price_data,
-                symbol=symbol,
-                timeframe=timeframe
-            )
+            result, cached = self.analyze_price_data(price_data, symbol, timeframe,
+                                                     self.wants_timings(data))
             
             return {
                 "success": True,
                 "symbol": symbol,
                 "timeframe": timeframe,
                 "timestamp": datetime.now().isoformat(),
+                "cached": cached,
                 "analysis": result
             }
             
+        except (AnalysisQueueFull, AnalysisTimeout):
+            raise
         except Exception as e:
             raise Exception(f"Analysis processing failed: {str(e)}")
     
-    def process_image_analysis(self, image_array, metadata):
-        """Process chart image analysis"""
+    def analyze_price_data(self, price_data, symbol, timeframe, include_timings=False):
+        """Run analyze_comprehensive through the result cache; returns (analysis, cached)"""
+        cache = self.ai_server.result_cache
+        cached = False
+        
+        if cache is None:
+            result = self.ai_server.run_analysis(
+                "analyze_comprehensive",
+                price_data=price_data,
+                symbol=symbol,
+                timeframe=timeframe,
+                include_timings=include_timings
+            )
+        else:
+            lookup_start = time.perf_counter()
+            
+            # Konversi ke array sekali: dipakai untuk fingerprint dan untuk analisis
+            frame = self.ai_server.ai_analyzer.price_data_to_frame(price_data)
+            columns = {column: frame[column].to_numpy() for column in OHLCV_COLUMNS}
+            key = fingerprint(symbol, timeframe, columns)
+            stored = cache.get(key)
+            
+            if stored is None:
+                result = self.ai_server.run_analysis(
+                    "analyze_comprehensive",
+                    price_data=columns,
+                    symbol=symbol,
+                    timeframe=timeframe,
+                    include_timings=include_timings
+                )
+                cache.put(key, {name: value for name, value in result.items() if name != "timings"})
+            else:
+                # Timing pipeline lama tidak berlaku untuk hit; laporkan lookup-nya saja
+                cached = True
+                result = dict(stored)
+                if include_timings:
+                    lookup_ms = round((time.perf_counter() - lookup_start) * 1000, 3)
+                    result["timings"] = {"cache_lookup": lookup_ms, "total": lookup_ms}
+        
+        return result, cached
+    
+    def process_image_analysis(self, image_array, metadata, price_scale=(None, None)):
+        """Process chart image analysis
+        
+        ``price_scale`` is (price_top, price_bottom): the prices of the first
+        and last pixel rows. Without it prices are in pixel units.
+        """
         try:
-            # Extract candlestick data from image
-            candlesticks = self.extract_candlesticks_from_image(image_array)
+            # Screenshot yang hampir identik dengan yang baru diproses memakai ulang candle-nya
+            cache = self.ai_server.image_cache
+            image_hash = None
+            candlesticks = None
+            if cache is not None:
+                try:
+                    image_hash = cache.hash_image(image_array)
+                    candlesticks = cache.lookup(image_hash)
+                except ValueError:
+                    pass  # Gambar terlalu kecil untuk di-hash
+            image_cached = candlesticks is not None
+            
+            if candlesticks is None:
+                # Extract candlestick data from image
+                extract_start = time.perf_counter()
+                try:
+                    candlesticks = self.extract_candlesticks_from_image(image_array)
+                except ChartExtractionError as e:
+                    # Chart terlalu padat: lebih baik gagal daripada candle karangan
+                    return {
+                        "success": False,
+                        "error": str(e),
+                        "timestamp": datetime.now().isoformat()
+                    }
+                if image_hash is not None and candlesticks is not None and len(candlesticks["x"]):
+                    cache.put(image_hash, candlesticks, (time.perf_counter() - extract_start) * 1000)
             
-            if not candlesticks:
+            if candlesticks is None or not len(candlesticks["x"]):
                 return {
                     "success": False,
                     "error": "No candlestick data found in image",
@@ -414,54 +660,46 @@ class AIRequestHandler(BaseHTTPRequestHandler):
             symbol = metadata.get("symbol", "Unknown")
             timeframe = metadata.get("timeframe", "Unknown")
             
-            result = self.ai_server.ai_analyzer.analyze_comprehensive(
-                price_data=candlesticks,
-                symbol=symbol,
-                timeframe=timeframe
-            )
+            # Cache menyimpan posisi pixel; skala harga bisa berbeda per request
+            price_data = pixels_to_prices(candlesticks, *price_scale)
+            
+            result, cached = self.analyze_price_data(price_data, symbol, timeframe,
+                                                     self.wants_timings(metadata))
             
             return {
                 "success": True,
                 "symbol": symbol,
                 "timeframe": timeframe,
-                "candlesticks_detected": len(candlesticks),
+                "candlesticks_detected": len(candlesticks["x"]),
                 "timestamp": datetime.now().isoformat(),
+                "image_cached": image_cached,
+                "cached": cached,
                 "analysis": result
             }
             
+        except (AnalysisQueueFull, AnalysisTimeout):
+            raise
         except Exception as e:
             raise Exception(f"Image analysis failed: {str(e)}")
     
+    def wants_timings(self, data):
+        """Per-stage timings are returned when requested or enabled in config"""
+        timings = data.get("timings", self.ai_server.config.get("include_timings", False))
+        if isinstance(timings, str):
+            # Dari query string / multipart field
+            return timings.lower() in ("1", "true", "yes")
+        return bool(timings)
+    
     def extract_candlesticks_from_image(self, image_array):
-        """Extract candlestick data from chart image using computer vision"""
+        """Locate candles in a BGR chart image (pixel rows, see chart_extraction)"""
         try:
-            # This is a simplified implementation
-            # In a real scenario, you'd use sophisticated computer vision
-            # to detect and extract candlestick patterns from chart images
-            
-            # Convert to OpenCV format
-            if len(image_array.shape) == 3:
-                cv_image = cv2.cvtColor(image_array, cv2.COLOR_RGB2BGR)
-            else:
-                cv_image = image_array
-            
-            # Generate sample data based on image analysis
-            # Replace this with actual computer vision candlestick detection
-            candlesticks = []
-            for i in range(20):  # Sample 20 candlesticks
-                candlesticks.append({
-                    "open": 50000 + i * 100 + np.random.randint(-500, 500),
-                    "high": 50500 + i * 100 + np.random.randint(-300, 800),
-                    "low": 49500 + i * 100 + np.random.randint(-800, 300),
-                    "close": 50000 + i * 100 + np.random.randint(-500, 500),
-                    "volume": np.random.randint(1000, 10000)
-                })
-            
-            return candlesticks
+            return find_candles(image_array)
             
+        except ChartExtractionError:
+            raise
         except Exception as e:
             self.ai_server.log(f"Error extracting candlesticks: {str(e)}", "ERROR")
-            return []
+            return None
     
     def generate_sample_analysis(self, symbol, timeframe):
         """Generate sample analysis for demonstration"""
@@ -498,23 +736,93 @@ class AIRequestHandler(BaseHTTPRequestHandler):
             }
         }
     
-    def send_json_response(self, data):
-        """Send JSON response with proper headers"""
+    def json_response(self, data):
+        """Build a JSON response with proper headers"""
         self.ai_server.request_count += 1
         
         json_data = json.dumps(data, indent=2)
-        
-        self.send_response(200)
-        self.send_header("Content-type", "application/json")
+        return self.cors_response(200, "application/json", json_data.encode())
+    
+    def cors_response(self, status, content_type, body):
+        """Build a response carrying the CORS header when it is enabled"""
+        headers = []
         if self.ai_server.config.get("enable_cors", True):
-            self.send_header("Access-Control-Allow-Origin", "*")
-        self.end_headers()
-        self.wfile.write(json_data.encode())
+            headers.append(("Access-Control-Allow-Origin", "*"))
+        return Response(status, BaseHTTPRequestHandler.responses[status][0], content_type, body, headers)
     
-    def send_error(self, code, message):
-        """Send error response"""
+    def pool_error_response(self, error):
+        """503 with Retry-After when the worker queue is full, 504 on a job timeout"""
+        if isinstance(error, AnalysisQueueFull):
+            return self.error_response(503, "Analysis queue full",
+                                       [("Retry-After", str(error.retry_after))])
+        return self.error_response(504, str(error))
+    
+    def error_response(self, code, message=None, headers=None):
+        """Build an error response in the same format as BaseHTTPRequestHandler.send_error"""
         self.ai_server.error_count += 1
-        super().send_error(code, message)
+        
+        short, explain = BaseHTTPRequestHandler.responses.get(code, ("???", "???"))
+        message = message or short
+        body = BaseHTTPRequestHandler.error_message_format % {
+            "code": code,
+            "message": html.escape(message, quote=False),
+            "explain": html.escape(explain, quote=False)
+        }
+        return Response(code, message, BaseHTTPRequestHandler.error_content_type,
+                        body.encode("UTF-8", "replace"), [("Connection", "close")] + (headers or []))
+
+class AIRequestHandler(BaseHTTPRequestHandler):
+    """Thread-per-connection transport for AIRequestRouter"""
+    def __init__(self, request, client_address, server):
+        self.ai_server = server.ai_server
+        super().__init__(request, client_address, server)
+    
+    def do_OPTIONS(self):
+        """Handle CORS preflight requests"""
+        self.dispatch("OPTIONS")
+    
+    def do_GET(self):
+        """Handle GET requests"""
+        self.dispatch("GET")
+    
+    def do_POST(self):
+        """Handle POST requests"""
+        self.dispatch("POST")
+    
+    def dispatch(self, method):
+        """Read the request body if any and write the routed response"""
+        router = self.ai_server.router
+        body = b""
+        
+        if method == "POST":
+            try:
+                content_length = int(self.headers.get('Content-Length', 0))
+            except ValueError:
+                self.send_routed_response(router.error_response(400, "Invalid Content-Length"))
+                return
+            
+            rejection = router.check_request(method, self.path, content_length)
+            if rejection is not None:
+                self.send_routed_response(rejection)
+                return
+            
+            body = self.rfile.read(content_length)
+        
+        content_type = self.headers.get("Content-Type", "")
+        self.send_routed_response(router.route(method, self.path, body, content_type))
+    
+    def send_routed_response(self, response):
+        """Write a Response produced by the router"""
+        self.send_response(response.status, response.reason)
+        if response.content_type:
+            self.send_header("Content-Type", response.content_type)
+        for name, value in response.headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(response.body)))
+        self.end_headers()
+        
+        if response.body:
+            self.wfile.write(response.body)
     
     def log_message(self, format, *args):
         """Override default logging"""
@@ -525,6 +833,7 @@ class ThreadedHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
     """Thread-per-request HTTP server"""
     allow_reuse_address = True
     daemon_threads = True
+    request_queue_size = 128  # Default socketserver (5) me-reset koneksi saat burst
     
     def __init__(self, server_address, RequestHandlerClass, ai_server):
         self.ai_server = ai_server
@@ -553,20 +862,38 @@ def main():
         # Create AI server instance
         ai_server = CryptoAIServer()
         
-        # Create HTTP server
+        # Fork worker sebelum thread lain (websocket, HTTP) berjalan
+        worker_count = ai_server.start_analysis_pool()
+        
+        # Create HTTP server: "threaded" (thread per connection) atau
+        # "asyncio" (satu event loop dengan HTTP/1.1 keep-alive)
+        server_mode = ai_server.config.get("server_mode", "threaded")
         server_address = (ai_server.host, ai_server.port)
-        httpd = ThreadedHTTPServer(server_address, AIRequestHandler, ai_server)
+        if server_mode == "asyncio":
+            from async_http_server import AsyncHTTPFrontend
+            httpd = AsyncHTTPFrontend(ai_server)
+        else:
+            httpd = ThreadedHTTPServer(server_address, AIRequestHandler, ai_server)
         ai_server.server = httpd
+        websocket_running = ai_server.start_websocket_server()
         ai_server.running = True
         
         print(f"✅ Server started successfully!")
-        print(f"🌐 Listening on http://{ai_server.host}:{ai_server.port}")
+        print(f"🌐 Listening on http://{ai_server.host}:{ai_server.port} ({server_mode})")
         print(f"🤖 AI Status: {'Ready' if AI_AVAILABLE else 'Not Available'}")
-        print(f"📊 WebSocket: {'Available' if WEBSOCKET_AVAILABLE else 'Not Available'}")
+        if worker_count:
+            print(f"⚙️  Analysis workers: {worker_count} processes (queue depth {ai_server.analysis_pool.max_queue_depth})")
+        elif server_mode == "asyncio":
+            print("⚠️  asyncio mode without worker_processes: analysis threads share one core (GIL)")
+        if websocket_running:
+            print(f"📊 WebSocket: ws://{ai_server.host}:{ai_server.websocket_port} - Streaming signal feed")
+        else:
+            print(f"📊 WebSocket: {'Available (disabled)' if WEBSOCKET_AVAILABLE else 'Not Available'}")
         print(f"⏰ Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("\n📋 Available endpoints:")
         print(f"   • http://{ai_server.host}:{ai_server.port}/ - Status page")
         print(f"   • http://{ai_server.host}:{ai_server.port}/analyze - Analysis API")
+        print(f"   • http://{ai_server.host}:{ai_server.port}/analyze_batch - Batch analysis API")
         print(f"   • http://{ai_server.host}:{ai_server.port}/analyze_image - Image analysis")
         print("\n🛑 Press Ctrl+C to stop the server")
         
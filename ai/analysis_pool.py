@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+PROCESS-POOL ANALYSIS EXECUTOR
+Worker process yang sudah di-fork saat startup, masing-masing memegang
+AdvancedCryptoAnalyzer yang sudah warm, supaya analisis dari banyak request
+berjalan paralel di semua core tanpa terhalang GIL. Antrian dibatasi
+(max_queue_depth): kalau penuh, request langsung ditolak dengan perkiraan
+Retry-After, bukan menumpuk sampai timeout.
+
+Job yang melewati timeout_seconds dijawab AnalysisTimeout; kalau masih
+berjalan setelah timeout_grace_seconds lagi, worker dianggap macet: pool
+diganti dengan yang baru dan proses worker lama dihentikan, supaya job
+macet tidak memegang worker dan slot antrian selamanya.
+"""
+
+import math
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+# Analyzer milik worker process ini (diisi oleh _init_worker)
+_worker_analyzer = None
+
+
+class AnalysisQueueFull(Exception):
+    """Raised when max_queue_depth jobs are already queued or running"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Analysis queue full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class AnalysisTimeout(Exception):
+    """Raised when a job does not finish within timeout_seconds"""
+
+
+def _init_worker(rules_only):
+    """Build and warm this worker's analyzer once, before it takes any job"""
+    global _worker_analyzer
+    # Ctrl+C ditangani oleh proses server, bukan oleh tiap worker
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    from advanced_crypto_analyzer import AdvancedCryptoAnalyzer
+    from synthetic_data import generate_ohlcv
+
+    _worker_analyzer = AdvancedCryptoAnalyzer(rules_only=rules_only)
+    if not rules_only:
+        _worker_analyzer.setup_advanced_models()
+
+    # Satu analisis dummy memuat semua import dan code path (pandas, scipy, ...)
+    warmup = generate_ohlcv(100, seed=0).to_dict("records")
+    _worker_analyzer.analyze_comprehensive(warmup)
+
+
+def _worker_ready():
+    # Tahan worker sebentar supaya ping berikutnya diambil worker lain
+    time.sleep(0.05)
+    return os.getpid()
+
+
+def _run_analyzer(method_name, args, kwargs):
+    return getattr(_worker_analyzer, method_name)(*args, **kwargs)
+
+
+class AnalysisPool:
+    """Bounded pool of warm analyzer processes"""
+
+    def __init__(self, processes, max_queue_depth=64, timeout_seconds=30, rules_only=True,
+                 timeout_grace_seconds=5):
+        self.processes = max(1, int(processes))
+        self.max_queue_depth = max(self.processes, int(max_queue_depth))
+        self.timeout_seconds = timeout_seconds
+        self.timeout_grace_seconds = timeout_grace_seconds
+        self.rules_only = rules_only
+
+        self.executor = None
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.killed = 0
+        self.average_seconds = 0.0
+
+    def start(self, wait_seconds=120):
+        """Fork every worker now and wait up to ``wait_seconds`` for them to warm up
+
+        Returns how many workers answered. 0 means no worker came up (the
+        initializer failed or hung); the pool is then stopped and the caller
+        should analyze in-process instead.
+        """
+        self.executor = ProcessPoolExecutor(max_workers=self.processes, initializer=_init_worker,
+                                            initargs=(self.rules_only,))
+        # Worker hanya menjawab ping setelah initializer (warm-up) selesai
+        ready = set()
+        deadline = time.monotonic() + wait_seconds
+        try:
+            while len(ready) < self.processes and time.monotonic() < deadline:
+                pings = [self.executor.submit(_worker_ready) for _ in range(self.processes)]
+                for future in pings:
+                    ready.add(future.result(timeout=max(0, deadline - time.monotonic())))
+        except FutureTimeoutError:
+            pass  # Worker yang belum siap tetap warm-up di background
+        except BrokenProcessPool:
+            ready.clear()  # Initializer error: pool pengganti akan gagal dengan cara yang sama
+
+        if not ready:
+            executor, self.executor = self.executor, None
+            self._stop_workers(executor)
+        return len(ready)
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def retry_after(self):
+        """Seconds until a slot should free up, from the observed job time"""
+        backlog = self.in_flight / self.processes
+        return max(1, math.ceil(backlog * self.average_seconds))
+
+    def run(self, method_name, *args, **kwargs):
+        """Run ``analyzer.<method_name>(*args, **kwargs)`` in a worker and return the result"""
+        with self.lock:
+            if self.in_flight >= self.max_queue_depth:
+                self.rejected += 1
+                raise AnalysisQueueFull(self.retry_after())
+            self.in_flight += 1
+
+        started = time.perf_counter()
+        executor = self.executor
+        try:
+            future = executor.submit(_run_analyzer, method_name, args, kwargs)
+        except BrokenProcessPool:
+            self._release(started, failed=True)
+            self.restart(executor)
+            raise
+        # Slot baru dilepas saat job benar-benar selesai (atau workernya dihentikan)
+        future.add_done_callback(
+            lambda done: self._release(started, failed=done.cancelled() or done.exception() is not None))
+
+        try:
+            return future.result(timeout=self.timeout_seconds)
+        except FutureTimeoutError:
+            with self.lock:
+                self.timed_out += 1
+            watchdog = threading.Timer(self.timeout_grace_seconds, self._kill_if_running,
+                                       (executor, future))
+            watchdog.daemon = True
+            watchdog.start()
+            raise AnalysisTimeout(f"Analysis timed out after {self.timeout_seconds}s")
+        except BrokenProcessPool:
+            self.restart(executor)
+            raise
+
+    def _release(self, started, failed=False):
+        elapsed = time.perf_counter() - started
+        with self.lock:
+            self.in_flight -= 1
+            if failed:
+                # Tidak pernah jalan, error, atau workernya dihentikan: bukan job selesai
+                self.failed += 1
+                return
+            self.completed += 1
+            # Rata-rata bergerak untuk perkiraan Retry-After
+            self.average_seconds += (elapsed - self.average_seconds) * 0.1
+
+    def _kill_if_running(self, executor, future):
+        """Replace the pool and stop its workers when a timed-out job is still running"""
+        if future.done():
+            return
+        with self.lock:
+            self.killed += 1
+        # Job lain di pool lama ikut gagal (BrokenProcessPool), job baru masuk pool pengganti
+        workers = list((getattr(executor, "_processes", None) or {}).values())
+        self.restart(executor)
+        self._terminate(workers)
+
+    def _stop_workers(self, executor):
+        """Shut a pool down without waiting and stop workers stuck in a job or initializer"""
+        workers = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        self._terminate(workers)
+
+    @staticmethod
+    def _terminate(workers):
+        for process in workers:
+            if process.is_alive():
+                process.terminate()
+
+    def restart(self, broken):
+        """Replace a pool whose worker died (killed by the OS or by the timeout watchdog)"""
+        with self.lock:
+            if self.executor is not broken:
+                return  # Sudah diganti oleh thread lain
+            self.executor = ProcessPoolExecutor(max_workers=self.processes, initializer=_init_worker,
+                                                initargs=(self.rules_only,))
+            # Fork dan warm-up worker baru sekarang, bukan saat job pertama datang
+            for _ in range(self.processes):
+                self.executor.submit(_worker_ready)
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "processes": self.processes,
+                "in_flight": self.in_flight,
+                "max_queue_depth": self.max_queue_depth,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+                "killed": self.killed,
+                "average_ms": round(self.average_seconds * 1000, 3)
+            }
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+ASYNCIO HTTP FRONT-END
+HTTP/1.1 front-end untuk CryptoAIServer: satu event loop menerima semua koneksi
+dengan keep-alive, jumlah request yang diproses bersamaan dibatasi, dan analisis
+CPU-bound dijalankan di worker pool supaya event loop tidak pernah terblokir.
+Route-nya sama persis dengan ThreadedHTTPServer (lewat AIRequestRouter).
+
+Thread pool hanya menjaga event loop tetap responsif; analisisnya tetap
+terkunci GIL di satu core kecuali worker_processes > 0, sehingga thread cukup
+menunggu AnalysisPool (proses terpisah).
+"""
+
+import asyncio
+import os
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+
+MAX_HEADER_BYTES = 64 * 1024
+SERVER_NAME = "CryptoAIServer/1.0"
+
+
+class AsyncHTTPFrontend:
+    """Keep-alive HTTP/1.1 server running AIRequestRouter on an event loop"""
+
+    def __init__(self, ai_server):
+        self.ai_server = ai_server
+        self.router = ai_server.router
+        config = ai_server.config
+
+        self.max_concurrency = max(1, int(config.get("max_concurrent_requests", 32)))
+        # Dengan analysis pool, thread hanya menunggu worker process: sediakan
+        # cukup thread supaya backpressure (503) datang dari antrian pool
+        pool = ai_server.analysis_pool
+        default_workers = pool.max_queue_depth + 1 if pool else os.cpu_count() or 1
+        self.workers = config.get("worker_threads") or default_workers
+        self.keepalive_timeout = float(config.get("keepalive_timeout", 15))
+        self.body_timeout = float(config.get("timeout_seconds", 30))
+        self.log_requests = config.get("log_requests", True)
+
+        # Bind di sini supaya "address already in use" muncul sebelum serve_forever
+        self.socket = socket.create_server((ai_server.host, ai_server.port))
+        self.executor = None
+        self.log_executor = None
+        self.semaphore = None
+
+    def serve_forever(self):
+        """Run the event loop until the process is stopped"""
+        try:
+            asyncio.run(self._serve())
+        finally:
+            self.socket.close()
+
+    async def _serve(self):
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="analysis")
+        # ai_server.log menulis ke file secara sinkron: satu thread sendiri, urutan log tetap
+        self.log_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="access-log")
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        try:
+            server = await asyncio.start_server(self.handle_connection, sock=self.socket,
+                                                limit=MAX_HEADER_BYTES)
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.log_executor.shutdown(wait=True)
+
+    async def handle_connection(self, reader, writer):
+        """Serve requests on one connection until either side closes it"""
+        peer = writer.get_extra_info("peername")
+        client = peer[0] if peer else "-"
+        try:
+            keep_alive = True
+            while keep_alive:
+                keep_alive = await self.handle_request(reader, writer, client)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def handle_request(self, reader, writer, client):
+        """Read, route and answer one request; returns whether to keep the connection"""
+        # Koneksi idle ditutup setelah keepalive_timeout
+        head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.keepalive_timeout)
+        lines = head.decode("latin-1").split("\r\n")
+        request_line = lines[0]
+
+        parts = request_line.split()
+        if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+            await self.write_response(writer, self.router.error_response(400, "Bad request syntax"),
+                                      False, client, request_line)
+            return False
+        method, target, version = parts
+
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.0":
+            keep_alive = "keep-alive" in connection
+        else:
+            keep_alive = "close" not in connection
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            response = self.router.error_response(411, "Chunked request bodies are not supported")
+            await self.write_response(writer, response, False, client, request_line)
+            return False
+
+        try:
+            content_length = int(headers.get("content-length", 0))
+        except ValueError:
+            content_length = -1
+        if content_length < 0:
+            response = self.router.error_response(400, "Invalid Content-Length")
+            await self.write_response(writer, response, False, client, request_line)
+            return False
+
+        # Tolak sebelum body dibaca (503/413); body yang belum dibaca memaksa close
+        rejection = self.router.check_request(method, target, content_length)
+        if rejection is not None:
+            await self.write_response(writer, rejection, False, client, request_line)
+            return False
+
+        body = b""
+        if content_length:
+            if headers.get("expect", "").lower() == "100-continue":
+                writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+            body = await asyncio.wait_for(reader.readexactly(content_length), self.body_timeout)
+
+        content_type = headers.get("content-type", "")
+        async with self.semaphore:
+            if self.router.is_cpu_bound(method, target):
+                loop = asyncio.get_running_loop()
+                response = await loop.run_in_executor(self.executor, self.router.route,
+                                                      method, target, body, content_type)
+            else:
+                response = self.router.route(method, target, body, content_type)
+
+        await self.write_response(writer, response, keep_alive, client, request_line)
+        return keep_alive
+
+    async def write_response(self, writer, response, keep_alive, client, request_line):
+        """Serialize a router Response as HTTP/1.1"""
+        reason = response.reason.replace("\r", " ").replace("\n", " ")
+        head = [
+            f"HTTP/1.1 {response.status} {reason}",
+            f"Server: {SERVER_NAME}",
+            f"Date: {formatdate(usegmt=True)}"
+        ]
+        if response.content_type:
+            head.append(f"Content-Type: {response.content_type}")
+        head.extend(f"{name}: {value}" for name, value in response.headers
+                    if name.lower() != "connection")
+        head.append(f"Content-Length: {len(response.body)}")
+        if keep_alive:
+            head.append("Connection: keep-alive")
+            head.append(f"Keep-Alive: timeout={int(self.keepalive_timeout)}")
+        else:
+            head.append("Connection: close")
+
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1", "replace") + response.body)
+        await writer.drain()
+
+        if self.log_requests:
+            self.log_executor.submit(self.ai_server.log, f'{client} - "{request_line}" {response.status} -')
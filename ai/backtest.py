@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+VECTORIZED MASTER-SIGNAL BACKTESTER
+Backtest aturan AdvancedCryptoAnalyzer.generate_master_signal untuk seluruh
+history tanpa memanggil analyzer per bar:
+
+    1. Indikator (indicators.py), candle pattern, chart pattern
+       (pattern_scanner) dan sentiment dihitung sekali untuk semua bar.
+       Nilai bar t sama dengan analisis df[:t + 1]; hanya window high yang
+       rata sempurna (slope 0) bisa beda arah trend karena pembulatan.
+    2. Skor buy/sell dan action per bar dari signal_scoring.
+    3. Setiap BUY/SELL masuk di close bar sinyal dengan stop loss 2% dan take
+       profit 4%. Bar pertama setelah entry yang menyentuh salah satu level
+       dicari per blok (16, 32, ... bar ke depan) untuk semua trade
+       sekaligus. Bila SL dan TP tersentuh di bar yang sama, SL dianggap
+       kena duluan; trade yang belum kena sampai akhir data ditutup di close
+       terakhir.
+
+Default satu posisi sekaligus: sinyal berikutnya baru diambil mulai bar
+exit. PnL dalam fraksi nilai posisi per trade (tanpa fee/slippage).
+
+Usage: python backtest.py [--bars 1000000] [--allow-overlap] [--volatility 0.02] [--seed 42]
+"""
+
+import argparse
+import time
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from indicators import (ADX_PERIOD, BB_DEVIATIONS, BB_PERIOD, EMA_FAST_PERIOD, EMA_SLOW_PERIOD,
+                        RSI_PERIOD, adx, as_float_array, bollinger_bands, candle_patterns, ema,
+                        macd, rsi)
+from signal_scoring import BEARISH_PATTERNS, BULLISH_PATTERNS, compute_master_scores, scores_to_actions
+
+# Sama dengan RISK MANAGEMENT di generate_master_signal
+STOP_LOSS_PCT = 0.02
+TAKE_PROFIT_PCT = 0.04
+
+# Blok pencarian first-touch: mulai kecil (kebanyakan trade selesai cepat), lalu membesar
+_FIRST_BLOCK = 16
+_MAX_BLOCK = 1024
+
+
+def master_signal_columns(price_data, pattern_flags=None):
+    """Per-bar inputs of generate_master_signal, as the analyzer sees df[:bar + 1]
+
+    ``pattern_flags`` is the scan_patterns bitmask; it is computed here
+    when not given.
+    """
+    open_, high, low, close = (as_float_array(price_data[name]) for name in ('open', 'high', 'low', 'close'))
+    if pattern_flags is None:
+        from pattern_scanner import scan_patterns
+        pattern_flags = scan_patterns(price_data)
+    from pattern_scanner import PATTERN_BITS, rolling_slopes
+
+    # Hanya indikator yang dipakai aturan, dengan parameter yang sama dengan compute_indicators
+    series = {
+        'rsi': rsi(close, RSI_PERIOD),
+        'adx': adx(high, low, close, ADX_PERIOD),
+        'ema_12': ema(close, EMA_FAST_PERIOD),
+        'ema_26': ema(close, EMA_SLOW_PERIOD)
+    }
+    series['macd'], series['macd_signal'], _ = macd(close)
+    series['bb_upper'], _, series['bb_lower'] = bollinger_bands(close, BB_PERIOD, BB_DEVIATIONS)
+    candles = candle_patterns(open_, high, low, close)
+    bars = np.arange(len(close))
+
+    def value(name, default):
+        # indicator_snapshot: indikator yang masih warm-up memakai default netral
+        return np.where(np.isnan(series[name]), default, series[name])
+
+    columns = {
+        'rsi': value('rsi', 50.0),
+        'macd': value('macd', 0.0),
+        'macd_signal': value('macd_signal', 0.0),
+        'adx': value('adx', 25.0),
+        'ema_12': value('ema_12', close),
+        'ema_26': value('ema_26', close),
+        'hammer': 100.0 * candles['is_hammer'],
+        'shooting_star': -100.0 * candles['is_shooting_star'],
+        'engulfing': np.where(candles['is_bullish'] != 0, 100.0, -100.0) * candles['is_engulfing']
+    }
+    upper, lower = value('bb_upper', close * 1.02), value('bb_lower', close * 0.98)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Band nol lebar (series datar): posisi tengah, sama dengan indicator_snapshot
+        columns['bb_position'] = np.where(upper == lower, 0.5, (close - lower) / (upper - lower))
+
+    # Trend: slope high 10 candle terakhir, mulai 20 candle
+    trend = np.sign(rolling_slopes(high, 10))
+    columns['trend'] = np.where(bars >= 19, np.nan_to_num(trend), 0.0)
+
+    # Sentiment: perubahan close 10 candle terakhir di luar +-2%
+    change = np.full(len(close), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change[9:] = (close[9:] - close[:-9]) / close[:-9]
+        columns['sentiment'] = np.where(change > 0.02, 1.0, np.where(change < -0.02, -1.0, 0.0))
+
+    # Satu kolom 0/1 per chart pattern yang dinilai aturan
+    for name in BULLISH_PATTERNS + BEARISH_PATTERNS:
+        columns[name] = ((pattern_flags & PATTERN_BITS[name]) != 0).astype(np.float64)
+    return columns
+
+
+def master_signals(price_data, pattern_flags=None, columns=None):
+    """(actions, buy_score, sell_score) per bar; actions 1 BUY, -1 SELL, 0 HOLD
+
+    ``columns`` is a prebuilt master_signal_columns result (e.g. reused
+    across several backtests of the same data); price_data and
+    pattern_flags are then not read.
+    """
+    if columns is None:
+        columns = master_signal_columns(price_data, pattern_flags)
+    buy_score, sell_score = compute_master_scores(columns)
+    return scores_to_actions(buy_score, sell_score), buy_score, sell_score
+
+
+def first_touch(high, low, entries, upper, lower):
+    """First bar after each entry whose high >= upper or low <= lower
+
+    Returns (exit_bars, touched_upper, touched_lower); exit_bars is -1 for
+    entries never touched before the end of the data.
+    """
+    high, low = as_float_array(high), as_float_array(low)
+    exit_bars = np.full(len(entries), -1)
+    touched_upper = np.zeros(len(entries), dtype=bool)
+    touched_lower = np.zeros(len(entries), dtype=bool)
+
+    # Padding supaya blok terakhir tidak keluar array; -inf/+inf tidak pernah menyentuh level
+    padded_high = np.concatenate((high, np.full(_MAX_BLOCK, -np.inf)))
+    padded_low = np.concatenate((low, np.full(_MAX_BLOCK, np.inf)))
+
+    pending = np.arange(len(entries))
+    offset, block = 1, _FIRST_BLOCK
+    while len(pending):
+        starts = entries[pending] + offset
+        inside = starts < len(high)
+        pending, starts = pending[inside], starts[inside]
+        if not len(pending):
+            break
+
+        hits_upper = sliding_window_view(padded_high, block)[starts] >= upper[pending, None]
+        hits_lower = sliding_window_view(padded_low, block)[starts] <= lower[pending, None]
+        touched = hits_upper | hits_lower
+        found = touched.any(axis=1)
+        first = touched[found].argmax(axis=1)
+
+        resolved = pending[found]
+        exit_bars[resolved] = starts[found] + first
+        touched_upper[resolved] = hits_upper[found, first]
+        touched_lower[resolved] = hits_lower[found, first]
+
+        pending = pending[~found]
+        offset += block
+        block = min(block * 2, _MAX_BLOCK)
+
+    return exit_bars, touched_upper, touched_lower
+
+
+def _chain_trades(entries, exit_bars, outcome):
+    """Indices of the trades taken one position at a time, starting with the first
+
+    Each trade is followed by the first signal at or after its exit bar.
+    The chain is collected by pointer doubling: after round r it holds the
+    first 2**r trades and ``jump`` points 2**r trades ahead.
+    """
+    count = len(entries)
+    jump = np.searchsorted(entries, exit_bars, side='left')
+    jump[outcome == 0] = count  # trade yang masih terbuka mengakhiri rantai
+    jump = np.append(jump, count)
+
+    taken = np.zeros(count + 1, dtype=bool)
+    taken[0] = True
+    while True:
+        taken[jump[taken]] = True
+        if jump[0] == count:
+            break
+        jump = jump[jump]
+    return np.flatnonzero(taken[:count])
+
+
+def simulate_trades(price_data, actions, allow_overlap=False,
+                    stop_loss=STOP_LOSS_PCT, take_profit=TAKE_PROFIT_PCT):
+    """Trades for every BUY/SELL action with fixed-percentage SL/TP
+
+    Returns a dict of per-trade arrays: entry/exit bar, direction (1 long,
+    -1 short), entry/exit price, outcome (1 take profit, -1 stop loss,
+    0 still open at the end) and return.
+    """
+    high, low, close = (as_float_array(price_data[name]) for name in ('high', 'low', 'close'))
+    entries = np.flatnonzero(actions)
+    direction = actions[entries].astype(np.int64)
+    entry_price = close[entries]
+
+    # Level seperti generate_master_signal; long: TP di atas, short: TP di bawah
+    long = direction > 0
+    upper = np.where(long, entry_price * (1 + take_profit), entry_price * (1 + stop_loss))
+    lower = np.where(long, entry_price * (1 - stop_loss), entry_price * (1 - take_profit))
+    exit_bars, touched_upper, touched_lower = first_touch(high, low, entries, upper, lower)
+
+    # SL dan TP di bar yang sama: SL dianggap kena duluan
+    stopped = np.where(long, touched_lower, touched_upper)
+    outcome = np.where(exit_bars < 0, 0, np.where(stopped, -1, 1))
+    exit_price = np.where(outcome == 0, close[-1] if len(close) else np.nan,
+                          np.where(stopped == long, lower, upper))
+    exit_bars = np.where(exit_bars < 0, len(close) - 1, exit_bars)
+
+    if not allow_overlap and len(entries):
+        taken = _chain_trades(entries, exit_bars, outcome)
+        entries, direction, entry_price = entries[taken], direction[taken], entry_price[taken]
+        exit_bars, exit_price, outcome = exit_bars[taken], exit_price[taken], outcome[taken]
+
+    return {
+        'entry_bar': entries,
+        'exit_bar': exit_bars,
+        'direction': direction,
+        'entry_price': entry_price,
+        'exit_price': exit_price,
+        'outcome': outcome,
+        'return': direction * (exit_price - entry_price) / entry_price
+    }
+
+
+def summarize_trades(trades):
+    """PnL, hit rate and drawdown of simulate_trades output"""
+    returns = trades['return']
+    wins = int(np.sum(trades['outcome'] > 0))
+    losses = int(np.sum(trades['outcome'] < 0))
+
+    # Equity (jumlah return, ukuran posisi tetap) menurut urutan exit
+    equity = np.cumsum(returns[np.argsort(trades['exit_bar'], kind='stable')])
+    peaks = np.maximum.accumulate(np.concatenate(([0.0], equity)))[1:]
+    return {
+        'trades': len(returns),
+        'long_trades': int(np.sum(trades['direction'] > 0)),
+        'short_trades': int(np.sum(trades['direction'] < 0)),
+        'wins': wins,
+        'losses': losses,
+        'open': len(returns) - wins - losses,
+        'hit_rate': wins / (wins + losses) if wins + losses else 0.0,
+        'pnl': float(returns.sum()),
+        'average_return': float(returns.mean()) if len(returns) else 0.0,
+        'max_drawdown': float(np.max(peaks - equity)) if len(equity) else 0.0,
+        'average_bars_held': float(np.mean(trades['exit_bar'] - trades['entry_bar'])) if len(returns) else 0.0
+    }
+
+
+def run_backtest(price_data, pattern_flags=None, allow_overlap=False, columns=None):
+    """Backtest generate_master_signal over a DataFrame or dict of OHLCV arrays
+
+    ``columns`` is an optional prebuilt master_signal_columns result for
+    ``price_data``. Returns the summarize_trades report plus ``signals``
+    (number of BUY/SELL bars) and the per-trade arrays under ``trade_log``.
+    """
+    actions = master_signals(price_data, pattern_flags, columns)[0]
+    trades = simulate_trades(price_data, actions, allow_overlap)
+    report = summarize_trades(trades)
+    report['bars'] = len(actions)
+    report['signals'] = int(np.count_nonzero(actions))
+    report['trade_log'] = trades
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest the master signal rules on synthetic data")
+    parser.add_argument("--bars", type=int, default=1_000_000)
+    parser.add_argument("--allow-overlap", action="store_true",
+                        help="Trade every signal, even while a position is open")
+    parser.add_argument("--volatility", type=float, default=0.02,
+                        help="Per-bar volatility of the synthetic series")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    from pattern_scanner import scan_patterns
+    from synthetic_data import generate_ohlcv
+
+    df = generate_ohlcv(args.bars, seed=args.seed, volatility=args.volatility)
+
+    start = time.perf_counter()
+    pattern_flags = scan_patterns(df)
+    scan_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    columns = master_signal_columns(df, pattern_flags)
+    columns_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    report = run_backtest(df, allow_overlap=args.allow_overlap, columns=columns)
+    backtest_seconds = time.perf_counter() - start
+    total_seconds = scan_seconds + columns_seconds + backtest_seconds
+
+    print(f"📊 Master signal backtest ({report['bars']:,} bars, {report['signals']:,} signals)")
+    print(f"   trades {report['trades']:,} (long {report['long_trades']:,}, short {report['short_trades']:,}, "
+          f"open {report['open']})")
+    print(f"   hit rate {report['hit_rate']:.1%}, PnL {report['pnl']:+.2f}, "
+          f"avg {report['average_return']:+.4%}/trade, max drawdown {report['max_drawdown']:.2f}, "
+          f"avg hold {report['average_bars_held']:.1f} bars")
+    print(f"   pattern scan {scan_seconds:.2f} s ({report['bars'] / scan_seconds:,.0f} bars/s), "
+          f"indicator columns {columns_seconds:.2f} s ({report['bars'] / columns_seconds:,.0f} bars/s), "
+          f"scores + trades {backtest_seconds:.2f} s ({report['bars'] / backtest_seconds:,.0f} bars/s)")
+    print(f"   end-to-end {total_seconds:.2f} s ({report['bars'] / total_seconds:,.0f} bars/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+CHART IMAGE PIPELINE BENCHMARK
+Render chart sintetis (generate_ohlcv -> chart_rendering, PNG) di beberapa
+theme dan resolusi, lalu jalankan pipeline /analyze_image yang sama dengan
+server untuk setiap chart:
+
+    decode   decode_image (dengan max_image_size)
+    extract  find_candles + pixels_to_prices
+    analyze  AdvancedCryptoAnalyzer.analyze_comprehensive (rules only)
+
+Laporan per theme/resolusi: persentase chart yang cocok (jumlah candle tepat
+dan error rekonstruksi <= --match-tolerance pixel), persentase chart yang
+ditolak (ChartExtractionError, candle < 3 pixel), error rekonstruksi OHLC
+(pixel gambar hasil decode dan % tinggi chart, semua chart dengan jumlah
+candle tepat) dan latency p50/p99; di akhir throughput total. Rendering tidak
+ikut diukur.
+
+Usage: python benchmark_chart_extraction.py [--charts 2000] [--themes ...] [--resolutions ...]
+                                            [--max-image-size 2048] [--dense-charts 100]
+                                            [--match-tolerance 1.5]
+                                            [--no-analyze] [--save-dir DIR]
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from chart_extraction import ChartExtractionError, find_candles, pixels_to_prices
+from chart_rendering import RESOLUTIONS, THEMES, render_chart_png
+from image_upload import decode_image
+from synthetic_data import generate_ohlcv
+
+STAGES = ('decode', 'extract', 'analyze')
+
+
+def reconstruction_error(extracted, df, price_top, price_bottom, height):
+    """Largest |extracted - true| over OHLC, in pixels of the decoded image"""
+    pixel = (price_top - price_bottom) / (height - 1)
+    return max(np.max(np.abs(extracted[name] - df[name].to_numpy()))
+               for name in ('open', 'high', 'low', 'close')) / pixel
+
+
+def run_chart(png, price_top, price_bottom, max_image_size, analyzer):
+    """Run one PNG through the image pipeline; returns (extracted, height, stage seconds)
+
+    ``extracted`` is None when the chart is rejected as too dense.
+    """
+    timings = {}
+
+    start = time.perf_counter()
+    image = decode_image(png, max_image_size)
+    timings['decode'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    try:
+        extracted = pixels_to_prices(find_candles(image), price_top, price_bottom)
+    except ChartExtractionError:
+        extracted = None
+    timings['extract'] = time.perf_counter() - start
+
+    if analyzer is not None and extracted is not None and len(extracted['close']):
+        start = time.perf_counter()
+        analyzer.analyze_comprehensive(extracted, "BENCH", "1h")
+        timings['analyze'] = time.perf_counter() - start
+
+    return extracted, image.shape[0], timings
+
+
+def run_benchmark(charts, themes, resolutions, max_image_size, min_candles, max_candles,
+                  analyze=True, seed=42, save_dir=None, dense_charts=0, match_tolerance=1.5):
+    """Benchmark the image pipeline over ``charts`` rendered charts and print a report
+
+    ``dense_charts`` extra charts pack width // 4 .. width // 2 candles, so
+    after downscaling to ``max_image_size`` candles are only 1-2 pixels wide
+    and most of them should be rejected instead of extracted. A chart only
+    counts as matched when the candle count is exact and its reconstruction
+    error is at most ``match_tolerance`` pixels; the error percentiles cover
+    every chart with the right count.
+    """
+    analyzer = None
+    if analyze:
+        from advanced_crypto_analyzer import AdvancedCryptoAnalyzer
+        analyzer = AdvancedCryptoAnalyzer(rules_only=True)
+    if save_dir:
+        os.makedirs(save_dir, exist_ok=True)
+
+    # Warm-up: import lazy (cv2, scipy) dan alokasi pertama tidak ikut terukur
+    warmup = generate_ohlcv(100, seed=seed)
+    run_chart(render_chart_png(warmup, "720p")[0], 0.0, 1.0, max_image_size, analyzer)
+
+    combos = [(theme, resolution) for resolution in resolutions for theme in themes]
+    rng = np.random.default_rng(seed)
+    # Chart biasa minimal ~6 pixel per candle (masih terbaca di layar); chart padat
+    # 2-4 pixel sebelum decode memperkecil gambar
+    jobs = [combos[index % len(combos)] + (False,) for index in range(charts)]
+    jobs += [combos[index % len(combos)] + (True,) for index in range(dense_charts)]
+    results = {(f"{theme} dense" if dense else theme, resolution): {
+                   'matched': 0, 'rejected': 0, 'charts': 0, 'errors': [], 'total': [],
+                   **{stage: [] for stage in STAGES}}
+               for theme, resolution, dense in jobs}
+
+    print(f"📊 Chart image pipeline benchmark ({charts} charts + {dense_charts} dense, "
+          f"max_image_size={max_image_size})")
+    wall_start = time.perf_counter()
+    for index, (theme, resolution, dense) in enumerate(jobs):
+        width = RESOLUTIONS[resolution][0]
+        if dense:
+            count = int(rng.integers(width // 4, width // 2 + 1))
+        else:
+            count = int(rng.integers(min_candles, max(min_candles, min(max_candles, width // 6)) + 1))
+        df = generate_ohlcv(count, seed=seed + index, base_price=float(rng.uniform(0.5, 60000)))
+        png, price_top, price_bottom = render_chart_png(df, resolution, theme)
+        if save_dir:
+            with open(os.path.join(save_dir, f"chart_{index:05d}_{theme}_{resolution}.png"), "wb") as output:
+                output.write(png)
+
+        extracted, height, timings = run_chart(png, price_top, price_bottom, max_image_size, analyzer)
+
+        result = results[(f"{theme} dense" if dense else theme, resolution)]
+        result['charts'] += 1
+        result['height'] = height
+        result['total'].append(sum(timings.values()))
+        for stage, seconds in timings.items():
+            result[stage].append(seconds)
+        if extracted is None:
+            result['rejected'] += 1
+        elif len(extracted['close']) == count:
+            error = reconstruction_error(extracted, df, price_top, price_bottom, height)
+            result['errors'].append(error)
+            result['matched'] += error <= match_tolerance
+    wall_time = time.perf_counter() - wall_start
+
+    print(f"{'theme':<24} {'resolution':<10} {'match':>6} {'reject':>6} {'err p50':>8} {'err p99':>8} {'% range':>8} "
+          + " ".join(f"{stage + ' p50':>12}" for stage in STAGES) + f" {'total p50':>10} {'total p99':>10}")
+    all_totals = []
+    for (theme, resolution), result in results.items():
+        if not result['charts']:
+            continue
+        all_totals.extend(result['total'])
+        errors = np.array(result['errors']) if result['errors'] else np.array([np.nan])
+        stage_p50 = " ".join(
+            f"{np.percentile(result[stage], 50) * 1000:>9.2f} ms" if result[stage] else f"{'-':>12}"
+            for stage in STAGES)
+        total_ms = np.array(result['total']) * 1000
+        print(f"{theme:<24} {resolution:<10} {result['matched'] / result['charts']:>6.1%} "
+              f"{result['rejected'] / result['charts']:>6.1%} "
+              f"{np.percentile(errors, 50):>6.2f}px {np.percentile(errors, 99):>6.2f}px "
+              f"{np.percentile(errors, 99) / (result['height'] - 1):>8.3%} {stage_p50} "
+              f"{np.percentile(total_ms, 50):>7.2f} ms {np.percentile(total_ms, 99):>7.2f} ms")
+
+    total_ms = np.array(all_totals) * 1000
+    print(f"\n  pipeline latency p50 {np.percentile(total_ms, 50):.2f} ms, p99 {np.percentile(total_ms, 99):.2f} ms")
+    print(f"  throughput {len(total_ms) / (total_ms.sum() / 1000):.1f} charts/s per core "
+          f"(wall time incl. rendering {wall_time:.1f} s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the /analyze_image pipeline on synthetic charts")
+    parser.add_argument("--charts", type=int, default=2000)
+    parser.add_argument("--themes", nargs="+", default=list(THEMES), choices=list(THEMES))
+    parser.add_argument("--resolutions", nargs="+", default=list(RESOLUTIONS), choices=list(RESOLUTIONS))
+    parser.add_argument("--max-image-size", type=int, default=2048,
+                        help="Same as the server's max_image_size config")
+    parser.add_argument("--min-candles", type=int, default=40)
+    parser.add_argument("--max-candles", type=int, default=300)
+    parser.add_argument("--dense-charts", type=int, default=100,
+                        help="Extra charts with 2-4 pixels per candle before decoding")
+    parser.add_argument("--match-tolerance", type=float, default=1.5,
+                        help="Largest OHLC error in decoded pixels for a chart to count as matched")
+    parser.add_argument("--no-analyze", action="store_true", help="Only time decode + extraction")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save-dir", help="Also write every rendered PNG to this directory")
+    args = parser.parse_args()
+
+    run_benchmark(args.charts, args.themes, args.resolutions, args.max_image_size,
+                  args.min_candles, args.max_candles, not args.no_analyze, args.seed, args.save_dir,
+                  args.dense_charts, args.match_tolerance)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+INDICATOR MICRO-BENCHMARK
+Bandingkan CCI lama (rolling().apply(lambda) per baris) dengan kernel
+vectorized di indicators.py, termasuk cek toleransi floating-point.
+
+Usage: python benchmark_indicators.py [--sizes 100000 10000000] [--window 20]
+
+Versi lama sangat lambat, jadi di atas --legacy-limit versi lama hanya diukur
+pada prefix dan waktunya diekstrapolasi linear (ditandai "est.").
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from indicators import commodity_channel_index
+from synthetic_data import generate_ohlcv
+
+
+def legacy_cci(df, window=20):
+    """CCI exactly as calculate_technical_indicators computed it before"""
+    tp = (df['high'] + df['low'] + df['close']) / 3
+    sma_tp = tp.rolling(window=window).mean()
+    mad = tp.rolling(window=window).apply(lambda x: np.mean(np.abs(x - x.mean())))
+    return ((tp - sma_tp) / (0.015 * mad)).to_numpy()
+
+
+def time_call(func, *args, **kwargs):
+    """Return (result, elapsed seconds) for a single call"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def run_benchmark(sizes, window=20, seed=42, legacy_limit=200_000):
+    """Benchmark legacy vs vectorized CCI for each size and print a report"""
+    print(f"📊 CCI benchmark (window={window})")
+    print(f"{'rows':>12} {'legacy (s)':>12} {'vectorized (s)':>15} {'speedup':>10} {'max rel err':>12}")
+
+    for size in sizes:
+        df = generate_ohlcv(size, seed=seed)
+
+        new, new_time = time_call(
+            commodity_channel_index, df['high'], df['low'], df['close'], window
+        )
+        # Rolling window di prefix identik, jadi legacy cukup diukur di prefix
+        legacy_rows = min(size, legacy_limit)
+        old, old_time = time_call(legacy_cci, df.iloc[:legacy_rows], window)
+        old_time *= size / legacy_rows
+        estimated = " (est.)" if legacy_rows < size else ""
+
+        new_prefix = new[:legacy_rows]
+        valid = np.isfinite(old)
+        if not np.array_equal(valid, np.isfinite(new_prefix)):
+            raise AssertionError("NaN layout differs between legacy and vectorized CCI")
+        scale = np.maximum(np.abs(old[valid]), 1.0)
+        max_rel_err = float(np.max(np.abs(new_prefix[valid] - old[valid]) / scale)) if valid.any() else 0.0
+
+        print(f"{size:>12,} {old_time:>12.3f} {new_time:>15.4f} "
+              f"{old_time / new_time:>9.0f}x {max_rel_err:>12.2e}{estimated}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized CCI kernel")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 10_000_000])
+    parser.add_argument("--window", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--legacy-limit", type=int, default=200_000,
+                        help="Largest size the legacy lambda is timed on in full")
+    args = parser.parse_args()
+
+    run_benchmark(args.sizes, args.window, args.seed, args.legacy_limit)
+
+
+if __name__ == "__main__":
+    main()
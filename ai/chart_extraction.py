@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+CHART SCREENSHOT CANDLE EXTRACTION
+Ubah screenshot chart candlestick menjadi candle OHLC tanpa loop per pixel:
+
+    1. Warna candle disegmentasi dengan mask HSV (cv2.inRange) untuk bullish
+       (hijau/teal) dan bearish (merah).
+    2. Mask direduksi per kolom pixel; kolom berurutan yang berwarna = satu
+       candle. Profil baris tiap candle (total chroma pixel candle per baris)
+       dihitung sekaligus untuk semua candle dari satu integral image.
+    3. Baris dengan profil > 60% baris terkuat candle adalah body, sisanya
+       wick. Puncak/dasar wick = high/low, tepi body = open/close.
+    4. Koordinat y dipetakan ke harga secara linear: price_top adalah harga di
+       baris pixel paling atas, price_bottom di baris paling bawah. Tanpa skala
+       harga, hasilnya dalam satuan pixel di atas dasar gambar.
+
+Volume tidak diekstrak (kolom volume berisi nol). Gunakan plot_area untuk
+membuang panel volume / legend yang memakai warna yang sama. Screenshot PNG
+memberi error <= 0.5 pixel (~1 pixel setelah diperkecil saat decode) selama
+candle minimal 3 pixel lebar; JPEG kualitas >= 90 masih terbaca, di bawah itu
+artefak kompresi mulai memotong wick dan menyambung candle.
+
+Chart padat (candle 1-2 pixel setelah decode, mis. 500+ candle di 720p/1080p)
+tidak bisa dibaca: body tidak bisa dibedakan dari wick dan gap antar candle
+hilang, jadi find_candles raise ChartExtractionError alih-alih mengembalikan
+candle karangan.
+"""
+
+import numpy as np
+
+# Range HSV OpenCV (H 0-180, S dan V 0-255); merah melingkar di H=0
+DEFAULT_COLOR_RANGES = {
+    "bullish": [((35, 40, 50), (95, 255, 255))],
+    "bearish": [((0, 40, 50), (10, 255, 255)), ((165, 40, 50), (180, 255, 255))]
+}
+
+# Run yang jauh lebih lebar dari median biasanya label harga / legend, yang jauh
+# lebih sempit biasanya artefak JPEG di sela candle
+_MAX_WIDTH_RATIO = 3.0
+_MIN_WIDTH_RATIO = 1 / 3
+# Run >= 1.6x median (tapi bukan label) adalah candle yang menyatu karena gap-nya hilang
+_MERGED_WIDTH_RATIO = 1.6
+# Baris dengan bobot > 60% baris terkuat candle dihitung body, sisanya wick
+_BODY_FRACTION = 0.6
+# Lebar candle minimal (kuartil bawah lebar run, tidak terpengaruh run yang menyatu);
+# di bawah ini body/wick dan batas antar candle tidak bisa dibedakan
+_MIN_CANDLE_WIDTH = 3
+# Kolom di dalam run dengan bobot < 80% kedua tetangganya = gap yang ter-blend.
+# Chart normal hampir tidak punya (<= 0.05 per run); candle 1-2 pixel yang
+# menyatu jadi run lebar punya >= 1 per run
+_GAP_DIP_RATIO = 0.8
+_MAX_GAPS_PER_RUN = 0.25
+
+
+class ChartExtractionError(ValueError):
+    """Raised when the candles in a chart are too narrow to extract reliably"""
+
+
+def color_mask(hsv, ranges):
+    """uint8 mask (0/255) of the pixels inside any of the HSV ``ranges``"""
+    import cv2
+
+    mask = None
+    for lower, upper in ranges:
+        part = cv2.inRange(hsv, np.array(lower, dtype=np.uint8), np.array(upper, dtype=np.uint8))
+        mask = part if mask is None else cv2.bitwise_or(mask, part)
+    return mask
+
+
+def _column_runs(active):
+    """(starts, ends) of the runs of True in a 1-D bool array, ends exclusive"""
+    edges = np.diff(np.concatenate(([0], active.view(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def _run_sums(values, starts, ends):
+    """Sum of a 1-D array over every [start, end) run"""
+    cumulative = np.concatenate(([0], np.cumsum(values, dtype=np.int64)))
+    return cumulative[ends] - cumulative[starts]
+
+
+def _blended_gaps(column_weights, active):
+    """Number of columns inside a run that are much weaker than both neighbours"""
+    weights = column_weights.astype(np.float64)
+    dips = weights[1:-1] < _GAP_DIP_RATIO * np.minimum(weights[:-2], weights[2:])
+    return int(np.count_nonzero(dips & active[:-2] & active[1:-1] & active[2:]))
+
+
+def _split_merged_runs(starts, ends, column_weights, median_width):
+    """Split runs of two or more candles whose gap was blended shut by resizing
+
+    A run about k times the median width is cut at the k - 1 weakest columns
+    near the expected candle boundaries.
+    """
+    merged = np.flatnonzero((ends - starts) >= median_width * _MERGED_WIDTH_RATIO)
+    merged = merged[(ends[merged] - starts[merged]) <= median_width * _MAX_WIDTH_RATIO]
+    if len(merged) == 0:
+        return starts, ends
+
+    pieces_starts, pieces_ends = [starts], [ends]
+    for run in merged:
+        start, end = int(starts[run]), int(ends[run])
+        pieces = int(round((end - start) / median_width))
+        step = (end - start) / pieces
+        cuts = []
+        for piece in range(1, pieces):
+            # Kolom terlemah di sekitar batas yang diharapkan
+            low = max(start + 1, int(start + piece * step - step / 2))
+            high = min(end - 1, int(start + piece * step + step / 2))
+            cuts.append(low + int(np.argmin(column_weights[low:high])))
+        pieces_starts.append(np.array([start] + [cut + 1 for cut in cuts]))
+        pieces_ends.append(np.array(cuts + [end]))
+
+    # Run asli yang dipecah diganti potongan-potongannya
+    keep = np.ones(len(starts), dtype=bool)
+    keep[merged] = False
+    pieces_starts[0], pieces_ends[0] = starts[keep], ends[keep]
+    starts, ends = np.concatenate(pieces_starts), np.concatenate(pieces_ends)
+    order = np.argsort(starts, kind="stable")
+    return starts[order], ends[order]
+
+
+def _first_rows(rows):
+    """Index of the first True row in each column of a 2-D bool array"""
+    return rows.argmax(axis=0)
+
+
+def _last_rows(rows):
+    """Index of the last True row in each column of a 2-D bool array"""
+    return rows.shape[0] - 1 - rows[::-1].argmax(axis=0)
+
+
+def find_candles(image, color_ranges=None):
+    """Locate candles in a BGR chart image, in pixel coordinates
+
+    Returns a dict of equal-length arrays: ``x`` (centre column) and
+    ``open``/``high``/``low``/``close`` as pixel rows (0 = top), plus the
+    image ``height`` needed to map rows to prices. Raises
+    ChartExtractionError when candles are narrower than 3 pixels or most
+    of them have blended together.
+    """
+    import cv2
+
+    ranges = color_ranges or DEFAULT_COLOR_RANGES
+    height = image.shape[0]
+    empty = np.empty(0, dtype=np.float64)
+    result = {"x": empty, "open": empty, "high": empty, "low": empty, "close": empty,
+              "height": height}
+
+    hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+    bullish = color_mask(hsv, ranges["bullish"])
+    bearish = color_mask(hsv, ranges["bearish"])
+    candles = cv2.bitwise_or(bullish, bearish)
+
+    # Reduksi per kolom: jumlah pixel bullish/bearish, kolom aktif = yang punya pixel candle
+    bullish_columns = cv2.reduce(bullish, 0, cv2.REDUCE_SUM, dtype=cv2.CV_32S).ravel()
+    bearish_columns = cv2.reduce(bearish, 0, cv2.REDUCE_SUM, dtype=cv2.CV_32S).ravel()
+    active = (bullish_columns | bearish_columns) > 0
+    if not active.any():
+        return result
+    starts, ends = _column_runs(active)
+
+    # Bobot = chroma (S * V) pixel candle: turun baik saat warna ter-blend dengan
+    # background terang maupun gelap. Membedakan body dari wick yang melebar setelah
+    # resize (wick 1 pixel jadi 2 kolom pudar), dan gap yang ter-blend dari kolom body
+    chroma = cv2.multiply(cv2.extractChannel(hsv, 1), cv2.extractChannel(hsv, 2), scale=1 / 255)
+    weights = cv2.bitwise_and(chroma, candles)
+    column_weights = cv2.reduce(weights, 0, cv2.REDUCE_SUM, dtype=cv2.CV_32S).ravel()
+
+    # Chart terlalu padat ditolak: candle karangan lebih buruk daripada error
+    candle_width = np.percentile(ends - starts, 25)
+    if (candle_width < _MIN_CANDLE_WIDTH
+            or _blended_gaps(column_weights, active) > len(starts) * _MAX_GAPS_PER_RUN):
+        raise ChartExtractionError(
+            f"Candles are too dense to extract (need at least {_MIN_CANDLE_WIDTH} px per candle "
+            "after decoding): show fewer candles, crop the chart or raise max_image_size")
+    median_width = np.median(ends - starts)
+    starts, ends = _split_merged_runs(starts, ends, column_weights, median_width)
+    widths = ends - starts
+    keep = (widths <= median_width * _MAX_WIDTH_RATIO) & (widths >= median_width * _MIN_WIDTH_RATIO)
+    starts, ends, widths = starts[keep], ends[keep], widths[keep]
+    if len(starts) == 0:
+        return result
+
+    # Profil baris (H x jumlah candle): total bobot pixel candle di tiap baris,
+    # untuk semua candle dari satu integral image (int32 cukup sampai ~8 MP)
+    depth = cv2.CV_32S if weights.size * 255 < 2 ** 31 else cv2.CV_64F
+    integral = cv2.integral(weights, sdepth=depth)
+    profile = np.diff(integral.take(ends, axis=1) - integral.take(starts, axis=1), axis=0)
+    present = profile > 0
+    body = profile > profile.max(axis=0) * _BODY_FRACTION
+    # Candle tanpa baris "penuh" (mis. garis diagonal) memakai seluruh rentangnya
+    flat = ~body.any(axis=0)
+    body[:, flat] = present[:, flat]
+
+    high = _first_rows(present)
+    low = _last_rows(present)
+    body_top = _first_rows(body)
+    body_bottom = _last_rows(body)
+
+    is_bullish = _run_sums(bullish_columns, starts, ends) >= _run_sums(bearish_columns, starts, ends)
+
+    result.update({
+        "x": (starts + ends - 1) / 2.0,
+        "open": np.where(is_bullish, body_bottom, body_top).astype(np.float64),
+        "high": high.astype(np.float64),
+        "low": low.astype(np.float64),
+        "close": np.where(is_bullish, body_top, body_bottom).astype(np.float64)
+    })
+    return result
+
+
+def pixels_to_prices(candles, price_top=None, price_bottom=None):
+    """Map the pixel rows from find_candles to OHLCV price columns
+
+    ``price_top``/``price_bottom`` are the prices at the first and last pixel
+    row; without them prices are pixels above the bottom row.
+    """
+    last_row = max(candles["height"] - 1, 1)
+    if price_top is None or price_bottom is None:
+        price_top, price_bottom = float(last_row), 0.0
+    scale = (float(price_top) - float(price_bottom)) / last_row
+
+    columns = {name: float(price_top) - candles[name] * scale
+               for name in ("open", "high", "low", "close")}
+    columns["volume"] = np.zeros(len(candles["x"]))
+    return columns
+
+
+def extract_candles(image, price_top=None, price_bottom=None, plot_area=None, color_ranges=None):
+    """Extract OHLCV columns from a BGR chart screenshot
+
+    ``plot_area`` is an optional (x0, y0, x1, y1) crop of the price panel;
+    ``price_top``/``price_bottom`` then refer to its first and last rows.
+    Raises ChartExtractionError for charts with candles narrower than 3 pixels.
+    """
+    if plot_area is not None:
+        x0, y0, x1, y1 = (int(value) for value in plot_area)
+        image = image[y0:y1, x0:x1]
+    return pixels_to_prices(find_candles(image, color_ranges), price_top, price_bottom)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+SYNTHETIC CANDLESTICK CHART RENDERER
+Gambar candle OHLC ke array BGR / PNG dengan skala harga yang diketahui,
+sebagai ground truth untuk menguji dan mem-benchmark chart_extraction.
+
+Rendering deterministik: data yang sama dengan theme dan resolusi yang sama
+selalu menghasilkan pixel (dan byte PNG) yang sama. Theme meniru warna
+platform chart populer; resolusi dari layar laptop sampai screenshot HP.
+"""
+
+import numpy as np
+
+# Warna BGR per theme
+THEMES = {
+    "tradingview_dark": {"background": (34, 23, 19), "grid": (54, 42, 42),
+                         "bullish": (154, 166, 38), "bearish": (80, 83, 239)},
+    "tradingview_light": {"background": (255, 255, 255), "grid": (238, 234, 232),
+                          "bullish": (154, 166, 38), "bearish": (80, 83, 239)},
+    "binance": {"background": (32, 26, 24), "grid": (48, 40, 37),
+                "bullish": (129, 203, 14), "bearish": (93, 70, 246)},
+    "classic": {"background": (0, 0, 0), "grid": (40, 40, 40),
+                "bullish": (0, 200, 0), "bearish": (0, 0, 220)}
+}
+
+# (width, height)
+RESOLUTIONS = {
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "1440p": (2560, 1440),
+    "mobile": (1080, 2340)
+}
+
+DEFAULT_THEME = "tradingview_dark"
+
+
+def render_chart(columns, width=1920, height=1080, body_ratio=0.7, margin=0.05, theme=DEFAULT_THEME):
+    """Draw OHLC ``columns`` as a candlestick chart
+
+    Returns (image, price_top, price_bottom): the BGR uint8 image and the
+    prices of its first and last pixel rows.
+    """
+    import cv2
+
+    colors = THEMES[theme]
+    opens, highs, lows, closes = (np.asarray(columns[name], dtype=np.float64)
+                                  for name in ("open", "high", "low", "close"))
+    count = len(closes)
+    spacing = width / count
+    if spacing < 2:
+        raise ValueError(f"{count} candles do not fit in {width} pixels")
+
+    padding = (highs.max() - lows.min()) * margin
+    price_top, price_bottom = highs.max() + padding, lows.min() - padding
+
+    def rows(prices):
+        return np.rint((price_top - prices) / (price_top - price_bottom) * (height - 1)).astype(int)
+
+    image = np.empty((height, width, 3), dtype=np.uint8)
+    image[:] = colors["background"]
+    for y in np.linspace(0, height - 1, 9).astype(int):
+        image[y, :] = colors["grid"]
+    for x in np.linspace(0, width - 1, 13).astype(int):
+        image[:, x] = colors["grid"]
+
+    # Body selalu menyisakan minimal 1 pixel gap supaya candle tidak menyatu
+    body_width = int(min(max(1, spacing * body_ratio), spacing - 1))
+    centers = ((np.arange(count) + 0.5) * spacing).astype(int)
+    lefts = centers - body_width // 2
+    high_rows, low_rows = rows(highs), rows(lows)
+    top_rows, bottom_rows = rows(np.maximum(opens, closes)), rows(np.minimum(opens, closes))
+
+    for i in range(count):
+        color = colors["bullish"] if closes[i] >= opens[i] else colors["bearish"]
+        cv2.line(image, (int(centers[i]), int(high_rows[i])), (int(centers[i]), int(low_rows[i])), color, 1)
+        cv2.rectangle(image, (int(lefts[i]), int(top_rows[i])),
+                      (int(lefts[i] + body_width - 1), int(bottom_rows[i])), color, cv2.FILLED)
+
+    return image, price_top, price_bottom
+
+
+def render_chart_png(columns, resolution="1080p", theme=DEFAULT_THEME, **kwargs):
+    """Render ``columns`` at a named resolution and encode it as PNG
+
+    Returns (png bytes, price_top, price_bottom).
+    """
+    import cv2
+
+    width, height = RESOLUTIONS[resolution]
+    image, price_top, price_bottom = render_chart(columns, width, height, theme=theme, **kwargs)
+    ok, encoded = cv2.imencode(".png", image)
+    if not ok:
+        raise ValueError("PNG encoding failed")
+    return encoded.tobytes(), price_top, price_bottom
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+BINARY COLUMNAR OHLCV FORMAT
+Alternatif JSON untuk POST /analyze: OHLCV dikirim sebagai array float
+little-endian yang contiguous, sehingga server cukup membungkus body request
+dengan np.frombuffer (tanpa parse ribuan object kecil dan tanpa copy).
+
+Layout (Content-Type: application/x-ohlcv):
+    offset  size  field
+    0       4     magic b"OHLC"
+    4       1     version (1)
+    5       1     itemsize: 4 = float32, 8 = float64
+    6       1     columns: 4 = open/high/low/close, 5 = + volume
+    7       1     reserved (0)
+    8       4     uint32 candle count
+    12      4     uint32 metadata length (UTF-8 JSON: symbol, timeframe, timings)
+    16      n     metadata, lalu padding nol sampai kelipatan 8 byte
+    ...           kolom berurutan (column-major), masing-masing count * itemsize byte
+"""
+
+import json
+import struct
+
+import numpy as np
+
+COLUMNAR_CONTENT_TYPE = "application/x-ohlcv"
+COLUMNAR_MAGIC = b"OHLC"
+COLUMNAR_VERSION = 1
+COLUMNAR_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+_HEADER = struct.Struct("<4sBBBBII")
+_DTYPES = {4: np.dtype('<f4'), 8: np.dtype('<f8')}
+
+
+class ColumnarFormatError(ValueError):
+    """Raised when a columnar request body is malformed"""
+
+
+def _padded(length):
+    return (length + 7) & ~7
+
+
+def encode_columnar(columns, dtype=np.float64, **metadata):
+    """Pack a dict of OHLC(V) arrays (plus symbol/timeframe metadata) into one buffer"""
+    dtype = np.dtype(dtype).newbyteorder('<')
+    if dtype.itemsize not in _DTYPES or dtype.kind != 'f':
+        raise ColumnarFormatError("dtype must be float32 or float64")
+
+    names = COLUMNAR_COLUMNS if columns.get('volume') is not None else COLUMNAR_COLUMNS[:4]
+    arrays = [np.ascontiguousarray(columns[name], dtype=dtype) for name in names]
+    count = len(arrays[0])
+    if any(array.ndim != 1 or len(array) != count for array in arrays):
+        raise ColumnarFormatError("All columns must be 1-D arrays of the same length")
+
+    meta = json.dumps(metadata).encode('utf-8') if metadata else b""
+    header = _HEADER.pack(COLUMNAR_MAGIC, COLUMNAR_VERSION, dtype.itemsize, len(names), 0,
+                          count, len(meta))
+    padding = b"\0" * (_padded(_HEADER.size + len(meta)) - _HEADER.size - len(meta))
+    return b"".join([header, meta, padding] + [array.tobytes() for array in arrays])
+
+
+def decode_columnar(buffer):
+    """Unpack a columnar buffer into (metadata, {column: array})
+
+    The arrays are read-only ``np.frombuffer`` views into ``buffer``; nothing
+    is copied. A missing volume column is returned as zeros.
+    """
+    buffer = memoryview(buffer)
+    if len(buffer) < _HEADER.size:
+        raise ColumnarFormatError("Buffer is shorter than the header")
+
+    magic, version, itemsize, column_count, _, count, meta_length = _HEADER.unpack_from(buffer)
+    if magic != COLUMNAR_MAGIC:
+        raise ColumnarFormatError("Bad magic, expected b'OHLC'")
+    if version != COLUMNAR_VERSION:
+        raise ColumnarFormatError(f"Unsupported version {version}")
+    if itemsize not in _DTYPES:
+        raise ColumnarFormatError(f"Unsupported itemsize {itemsize}")
+    if column_count not in (4, 5):
+        raise ColumnarFormatError(f"Expected 4 or 5 columns, got {column_count}")
+
+    data_offset = _padded(_HEADER.size + meta_length)
+    expected = data_offset + column_count * count * itemsize
+    if len(buffer) != expected:
+        raise ColumnarFormatError(f"Expected {expected} bytes, got {len(buffer)}")
+
+    metadata = {}
+    if meta_length:
+        try:
+            metadata = json.loads(bytes(buffer[_HEADER.size:_HEADER.size + meta_length]))
+        except ValueError:
+            raise ColumnarFormatError("Metadata is not valid JSON")
+        if not isinstance(metadata, dict):
+            raise ColumnarFormatError("Metadata must be a JSON object")
+
+    values = np.frombuffer(buffer, dtype=_DTYPES[itemsize], count=column_count * count,
+                           offset=data_offset).reshape(column_count, count)
+    columns = dict(zip(COLUMNAR_COLUMNS, values))
+    if column_count == 4:
+        columns['volume'] = np.zeros(count, dtype=values.dtype)
+    return metadata, columns
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+FLOAT32 FEATURE STORE
+Fitur training (FEATURE_COLUMNS) ditulis sekali ke disk, lalu training dan
+evaluasi cukup memory-map file itu tanpa generate dan hitung ulang indikator
+untuk 100k candle di setiap run.
+
+Layout direktori store:
+    features.npy    float32 (rows, features) Fortran order: tiap kolom fitur
+                    contiguous, dibaca dengan np.load(mmap_mode='r')
+    signals.npy     int8 label -2..2 per row
+    metadata.json   versi, urutan kolom, jumlah row, parameter min-max scaler
+                    per kolom dan info sumber data (num_samples, seed, ...)
+
+Fitur disimpan mentah (trainer memakainya tanpa scaling); min/max per kolom
+hanya dicatat di metadata untuk pemakai yang perlu scaler (minmax_scaler).
+Row dengan NaN di salah satu fitur atau label dibuang saat menulis (sama
+dengan extract_feature_matrix). metadata.json ditulis paling akhir, jadi
+store tanpa metadata dianggap belum lengkap.
+"""
+
+import json
+import os
+from collections import namedtuple
+
+import numpy as np
+
+FEATURE_STORE_VERSION = 1
+FEATURES_FILE = "features.npy"
+SIGNALS_FILE = "signals.npy"
+METADATA_FILE = "metadata.json"
+
+FeatureStore = namedtuple('FeatureStore', ['columns', 'features', 'signals', 'metadata'])
+
+
+class FeatureStoreError(ValueError):
+    """Raised when a feature store is missing, incomplete or has other columns"""
+
+
+def write_feature_store(path, df, columns, signal_column='signal', **source):
+    """Write the NaN-free ``columns`` and ``signal_column`` of ``df`` to the store at ``path``
+
+    ``source`` (e.g. num_samples, seed) is kept in the metadata so callers
+    can tell whether the store still matches the data they would generate.
+    Returns the metadata dict.
+    """
+    columns = list(columns)
+    os.makedirs(path, exist_ok=True)
+    metadata_path = os.path.join(path, METADATA_FILE)
+    if os.path.exists(metadata_path):
+        os.remove(metadata_path)
+
+    keep = df[columns + [signal_column]].notna().all(axis=1).to_numpy()
+    rows = int(keep.sum())
+
+    # Ditulis kolom per kolom: di Fortran order setiap kolom satu blok contiguous
+    features_path = os.path.join(path, FEATURES_FILE)
+    features = np.lib.format.open_memmap(features_path + ".tmp", mode='w+', dtype=np.float32,
+                                         shape=(rows, len(columns)), fortran_order=True)
+    data_min, data_max = [], []
+    for index, name in enumerate(columns):
+        column = features[:, index]
+        column[:] = df[name].to_numpy(dtype=np.float32)[keep]
+        data_min.append(float(column.min()) if rows else 0.0)
+        data_max.append(float(column.max()) if rows else 0.0)
+    features.flush()
+    del features
+    os.replace(features_path + ".tmp", features_path)
+
+    signals = df[signal_column].to_numpy()[keep].astype(np.int8)
+    np.save(os.path.join(path, SIGNALS_FILE), signals, allow_pickle=False)
+
+    metadata = {
+        'version': FEATURE_STORE_VERSION,
+        'columns': columns,
+        'rows': rows,
+        'dtype': 'float32',
+        'order': 'F',
+        'scaler': {'type': 'minmax', 'data_min': data_min, 'data_max': data_max},
+        'source': source
+    }
+    with open(metadata_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2)
+    os.replace(metadata_path + ".tmp", metadata_path)
+    return metadata
+
+
+def read_feature_metadata(path):
+    """Metadata of the store at ``path``, or None when it is missing or incomplete"""
+    try:
+        with open(os.path.join(path, METADATA_FILE), encoding="utf-8") as f:
+            metadata = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return metadata if metadata.get('version') == FEATURE_STORE_VERSION else None
+
+
+def open_feature_store(path, columns=None):
+    """Memory-map the store at ``path`` (read-only)
+
+    ``columns`` is the column order the caller expects; a store written with
+    other columns raises FeatureStoreError instead of feeding wrong features.
+    """
+    metadata = read_feature_metadata(path)
+    if metadata is None:
+        raise FeatureStoreError(f"No complete feature store at {path}")
+    if columns is not None and list(columns) != metadata['columns']:
+        raise FeatureStoreError(f"Feature store {path} has columns {metadata['columns']}")
+
+    features = np.load(os.path.join(path, FEATURES_FILE), mmap_mode='r', allow_pickle=False)
+    signals = np.load(os.path.join(path, SIGNALS_FILE), mmap_mode='r', allow_pickle=False)
+    if features.shape != (metadata['rows'], len(metadata['columns'])) or len(signals) != metadata['rows']:
+        raise FeatureStoreError(f"Feature store {path} does not match its metadata")
+    return FeatureStore(metadata['columns'], features, signals, metadata)
+
+
+def minmax_scaler(metadata, feature_range=(0, 1)):
+    """sklearn MinMaxScaler fitted with the per-column min/max kept in ``metadata``"""
+    from sklearn.preprocessing import MinMaxScaler
+
+    scaler = metadata['scaler']
+    # Fit pada dua baris (min, max) menghasilkan parameter yang sama dengan fit seluruh data
+    return MinMaxScaler(feature_range=feature_range).fit(
+        np.array([scaler['data_min'], scaler['data_max']], dtype=np.float64))
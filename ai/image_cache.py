@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+PERCEPTUAL-HASH CHART IMAGE CACHE
+Client screen-capture mengirim screenshot chart yang hampir sama setiap
+beberapa detik. Cache ini menyimpan candle hasil ekstraksi per screenshot,
+dengan key difference-hash (dHash) dari gambar yang diperkecil; screenshot
+baru yang jarak Hamming-nya kecil ke entry yang ada memakai ulang candle itu
+tanpa ekstraksi ulang.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+# Jumlah bit 1 untuk setiap nilai byte (popcount lookup)
+_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def perceptual_hash(image, hash_size=16):
+    """dHash of a BGR or grayscale image: hash_size**2 bits packed into uint8
+
+    Each bit says whether a cell of a (hash_size x hash_size+1) grid of mean
+    intensities is brighter than its right neighbour.
+    """
+    import cv2
+
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    height, width = gray.shape
+    block_height, block_width = height // hash_size, width // (hash_size + 1)
+    if block_height == 0 or block_width == 0:
+        raise ValueError(f"Image is smaller than the {hash_size}x{hash_size + 1} hash grid")
+
+    # Crop ke kelipatan grid supaya INTER_AREA memakai jalur cepat (rasio integer)
+    cropped = gray[:block_height * hash_size, :block_width * (hash_size + 1)]
+    cells = cv2.resize(cropped, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    return np.packbits(cells[:, 1:] > cells[:, :-1])
+
+
+def hamming_distances(hashes, query):
+    """Bit distance between each row of ``hashes`` and ``query``"""
+    return _POPCOUNT[np.bitwise_xor(hashes, query)].sum(axis=-1, dtype=np.int64)
+
+
+class PerceptualImageCache:
+    """LRU/TTL cache whose lookups match any hash within ``max_distance`` bits"""
+
+    def __init__(self, max_entries=32, max_distance=3, ttl_seconds=30, hash_size=16):
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self.ttl_seconds = ttl_seconds
+        self.hash_size = hash_size
+        self.entries = OrderedDict()  # id -> (hash, expires_at, cost_ms, value)
+        self.next_id = 0
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.saved_ms = 0.0
+        self.hash_ms = 0.0
+
+    def hash_image(self, image):
+        """Perceptual hash of ``image``, timed so /status can show the net saving"""
+        start = time.perf_counter()
+        image_hash = perceptual_hash(image, self.hash_size)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self.lock:
+            self.hash_ms += elapsed_ms
+        return image_hash
+
+    def lookup(self, image_hash):
+        """Value of the closest live entry within max_distance bits, or None"""
+        now = time.monotonic()
+        with self.lock:
+            for entry_id in [entry_id for entry_id, entry in self.entries.items() if entry[1] <= now]:
+                del self.entries[entry_id]
+
+            if self.entries:
+                ids = list(self.entries)
+                hashes = np.stack([self.entries[entry_id][0] for entry_id in ids])
+                distances = hamming_distances(hashes, image_hash)
+                closest = int(np.argmin(distances))
+                if distances[closest] <= self.max_distance:
+                    entry_id = ids[closest]
+                    self.entries.move_to_end(entry_id)
+                    self.hits += 1
+                    self.saved_ms += self.entries[entry_id][2]
+                    return self.entries[entry_id][3]
+
+            self.misses += 1
+            return None
+
+    def put(self, image_hash, value, cost_ms):
+        """Store ``value`` for ``image_hash``; ``cost_ms`` is what a hit will save"""
+        with self.lock:
+            self.entries[self.next_id] = (image_hash, time.monotonic() + self.ttl_seconds,
+                                          cost_ms, value)
+            self.next_id += 1
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "max_entries": self.max_entries,
+                "max_distance": self.max_distance,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "saved_ms": round(self.saved_ms, 3),
+                "hash_ms": round(self.hash_ms, 3)
+            }
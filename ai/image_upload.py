@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+CHART IMAGE UPLOAD DECODING
+Decode screenshot chart satu kali langsung dari buffer request dengan
+cv2.imdecode (hasil BGR), tanpa JSON/base64/PIL di tengah. Gambar yang lebih
+besar dari max_image_size diperkecil tepat ke max_image_size; JPEG besar
+sudah diperkecil saat decode (IMREAD_REDUCED_*: libjpeg men-decode langsung
+di skala 1/2, 1/4 atau 1/8).
+
+Upload yang didukung /analyze_image:
+    application/octet-stream atau image/*   body = file gambar, metadata lewat query string
+    multipart/form-data                     part "image" (file) + field symbol/timeframe/timings
+    application/json                        {"image": "<base64>", ...} (format lama)
+"""
+
+import re
+import struct
+
+import numpy as np
+
+# (flag name, scale) dari reduksi terkecil ke terbesar
+_REDUCED_FLAGS = [("IMREAD_REDUCED_COLOR_2", 2), ("IMREAD_REDUCED_COLOR_4", 4),
+                  ("IMREAD_REDUCED_COLOR_8", 8)]
+_MIN_REDUCED_FRACTION = 0.75
+_JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+class ImageDecodeError(ValueError):
+    """Raised when an upload cannot be parsed or decoded as an image"""
+
+
+def image_dimensions(buffer):
+    """(width, height) from a PNG or JPEG header, or None for other formats"""
+    view = memoryview(buffer)
+
+    if bytes(view[:8]) == b"\x89PNG\r\n\x1a\n" and len(view) >= 24:
+        width, height = struct.unpack_from(">II", view, 16)
+        return width, height
+
+    if bytes(view[:2]) == b"\xff\xd8":
+        position = 2
+        while position + 9 <= len(view):
+            if view[position] != 0xFF:
+                return None
+            marker = view[position + 1]
+            if marker == 0xFF:  # Padding byte
+                position += 1
+                continue
+            if marker in _JPEG_SOF_MARKERS:
+                height, width = struct.unpack_from(">HH", view, position + 5)
+                return width, height
+            segment_length, = struct.unpack_from(">H", view, position + 2)
+            position += 2 + segment_length
+
+    return None
+
+
+def decode_image(buffer, max_size=None):
+    """Decode image bytes into a BGR uint8 array no larger than ``max_size`` pixels per side"""
+    import cv2
+
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    flags = cv2.IMREAD_COLOR
+
+    # Hanya JPEG yang benar-benar di-decode lebih cepat di skala kecil (libjpeg);
+    # format lain di-decode penuh lalu di-resize oleh OpenCV juga
+    if max_size and bytes(memoryview(buffer)[:2]) == b"\xff\xd8":
+        dimensions = image_dimensions(buffer)
+        if dimensions is not None:
+            longest = max(dimensions)
+            # Reduksi terbesar yang masih menyisakan >= 3/4 max_size: gambar tidak
+            # diperkecil berlebihan (candle yang rapat bisa menyatu) dan sisa
+            # resize-nya cukup INTER_LINEAR
+            for flag_name, scale in _REDUCED_FLAGS:
+                if -(-longest // scale) < max_size * _MIN_REDUCED_FRACTION:
+                    break
+                flags = getattr(cv2, flag_name)
+
+    image = cv2.imdecode(data, flags)
+    if image is None:
+        raise ImageDecodeError("Could not decode image data")
+
+    longest = max(image.shape[:2])
+    if max_size and longest > max_size:
+        ratio = max_size / longest
+        size = (max(1, round(image.shape[1] * ratio)), max(1, round(image.shape[0] * ratio)))
+        interpolation = cv2.INTER_LINEAR if ratio >= 0.5 else cv2.INTER_AREA
+        image = cv2.resize(image, size, interpolation=interpolation)
+
+    return image
+
+
+def parse_multipart_upload(body, content_type):
+    """Split a multipart/form-data body into (fields, image bytes)
+
+    The image part is returned as a memoryview into ``body`` (no copy);
+    other parts are decoded as UTF-8 text fields.
+    """
+    match = re.search(r'boundary="?([^";]+)"?', content_type)
+    if not match:
+        raise ImageDecodeError("Multipart request without a boundary")
+
+    delimiter = b"--" + match.group(1).encode("latin-1")
+    view = memoryview(body)
+    fields = {}
+    image = None
+
+    position = body.find(delimiter)
+    while position != -1:
+        start = position + len(delimiter)
+        if body[start:start + 2] == b"--":
+            break  # Delimiter penutup
+
+        header_end = body.find(b"\r\n\r\n", start)
+        end = body.find(b"\r\n" + delimiter, header_end)
+        if header_end == -1 or end == -1:
+            raise ImageDecodeError("Malformed multipart body")
+
+        headers = body[start:header_end].decode("latin-1")
+        name = re.search(r'name="([^"]*)"', headers)
+        content = view[header_end + 4:end]
+        if image is None and (name and name.group(1) == "image" or "filename=" in headers):
+            image = content
+        elif name:
+            fields[name.group(1)] = bytes(content).decode("utf-8")
+
+        position = end + 2
+
+    if image is None:
+        raise ImageDecodeError("No image part in multipart body")
+    return fields, image
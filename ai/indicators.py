@@ -0,0 +1,551 @@
+#!/usr/bin/env python3
+"""
+UNIFIED TECHNICAL INDICATOR ENGINE
+Satu implementasi indikator yang dipakai bersama oleh trainer dan analyzer,
+supaya fitur saat inference sama persis dengan fitur saat training.
+
+Definisi mengikuti TA-Lib (Wilder RSI/ADX, EMA dengan seed SMA, Bollinger
+dengan population stddev, fast stochastic). Jika talib terpasang dan input
+1-D, talib dipakai; selain itu dipakai kernel NumPy yang menghasilkan angka
+yang sama. Kernel NumPy bekerja di sepanjang axis terakhir, sehingga input
+2-D (symbols, bars) dihitung sekaligus.
+"""
+
+import importlib.util
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# talib dan scipy.signal di-import saat pertama dipakai, bukan saat module di-import
+talib = None
+TALIB_AVAILABLE = importlib.util.find_spec("talib") is not None
+_lfilter = None
+
+# Jumlah window per blok, membatasi memori sementara ke ~chunk * window floats
+_CHUNK_WINDOWS = 1 << 16
+
+# Default periods, shared by training and inference
+SMA_FAST_PERIOD = 20
+SMA_SLOW_PERIOD = 50
+EMA_FAST_PERIOD = 12
+EMA_SLOW_PERIOD = 26
+MACD_SIGNAL_PERIOD = 9
+RSI_PERIOD = 14
+BB_PERIOD = 20
+BB_DEVIATIONS = 2.0
+STOCH_PERIOD = 14
+STOCH_D_PERIOD = 3
+WILLIAMS_PERIOD = 14
+CCI_PERIOD = 20
+ADX_PERIOD = 14
+VOLUME_SMA_PERIOD = 20
+MOMENTUM_PERIOD = 10
+ROC_PERIOD = 12
+
+
+def as_float_array(values):
+    """Return values as a C-contiguous float64 array (no copy if already one)"""
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def _use_talib(*arrays):
+    """talib only handles 1-D float64 input; imports talib on first use"""
+    global talib, TALIB_AVAILABLE
+    if not TALIB_AVAILABLE or any(array.ndim != 1 for array in arrays):
+        return False
+
+    if talib is None:
+        try:
+            import talib as talib_module
+        except ImportError:
+            TALIB_AVAILABLE = False
+            return False
+        talib = talib_module
+    return True
+
+
+def _load_lfilter():
+    """Return scipy.signal.lfilter (imported on first use) or None"""
+    global _lfilter
+    if _lfilter is None:
+        try:
+            from scipy.signal import lfilter
+        except ImportError:
+            lfilter = False
+        _lfilter = lfilter
+    return _lfilter or None
+
+
+def _nan_like(values):
+    return np.full(values.shape, np.nan)
+
+
+def _shift(values, periods):
+    """Shift along the last axis, filling with NaN"""
+    result = _nan_like(values)
+    if periods < values.shape[-1]:
+        result[..., periods:] = values[..., :values.shape[-1] - periods]
+    return result
+
+
+def _rolling_reduce(values, window, reducer):
+    """Apply ``reducer(block)`` over sliding windows of the last axis, block-wise
+
+    ``reducer`` receives an array of shape (..., k, window) and must return
+    (..., k). The first ``window - 1`` outputs are NaN.
+    """
+    result = _nan_like(values)
+    length = values.shape[-1]
+    if length < window:
+        return result
+
+    windows = sliding_window_view(values, window, axis=-1)
+    num_windows = windows.shape[-2]
+    for start in range(0, num_windows, _CHUNK_WINDOWS):
+        block = windows[..., start:start + _CHUNK_WINDOWS, :]
+        result[..., window - 1 + start:window - 1 + start + block.shape[-2]] = reducer(block)
+
+    return result
+
+
+def _recursive_filter(values, decay, gain, initial):
+    """y[t] = decay * y[t-1] + gain * x[t] along the last axis, y[-1] = initial"""
+    initial = np.asarray(initial, dtype=np.float64)
+    if values.shape[-1] == 0:
+        return values.copy()
+
+    lfilter = _load_lfilter()
+    if lfilter is not None:
+        zi = (decay * initial)[..., np.newaxis]
+        output, _ = lfilter([gain], [1.0, -decay], values, axis=-1, zi=zi)
+        return output
+
+    output = np.empty_like(values)
+    previous = initial
+    for t in range(values.shape[-1]):
+        previous = decay * previous + gain * values[..., t]
+        output[..., t] = previous
+    return output
+
+
+def _seeded_ema(values, period, start, alpha):
+    """EMA that starts at ``start`` with the SMA of the ``period`` values ending there"""
+    result = _nan_like(values)
+    if start >= values.shape[-1]:
+        return result
+
+    seed = values[..., start - period + 1:start + 1].mean(axis=-1)
+    result[..., start] = seed
+    result[..., start + 1:] = _recursive_filter(values[..., start + 1:], 1.0 - alpha, alpha, seed)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Trend
+# ---------------------------------------------------------------------------
+
+def sma(values, period):
+    """Simple moving average"""
+    values = as_float_array(values)
+    if _use_talib(values):
+        return talib.SMA(values, timeperiod=period)
+
+    result = _nan_like(values)
+    if values.shape[-1] < period:
+        return result
+
+    zeros = np.zeros(values.shape[:-1] + (1,))
+    cumsum = np.cumsum(np.concatenate([zeros, values], axis=-1), axis=-1)
+    result[..., period - 1:] = (cumsum[..., period:] - cumsum[..., :-period]) / period
+    return result
+
+
+def ema(values, period):
+    """Exponential moving average seeded with the SMA of the first ``period`` values"""
+    values = as_float_array(values)
+    if _use_talib(values):
+        return talib.EMA(values, timeperiod=period)
+
+    return _seeded_ema(values, period, period - 1, 2.0 / (period + 1))
+
+
+def macd(values, fast_period=EMA_FAST_PERIOD, slow_period=EMA_SLOW_PERIOD,
+         signal_period=MACD_SIGNAL_PERIOD):
+    """MACD line, signal line and histogram
+
+    As in TA-Lib, both EMAs start at the slow EMA's first bar and all three
+    outputs start once the signal line is defined.
+    """
+    values = as_float_array(values)
+    if _use_talib(values):
+        return talib.MACD(values, fastperiod=fast_period, slowperiod=slow_period,
+                          signalperiod=signal_period)
+
+    start = slow_period - 1
+    fast = _seeded_ema(values, fast_period, start, 2.0 / (fast_period + 1))
+    slow = _seeded_ema(values, slow_period, start, 2.0 / (slow_period + 1))
+    macd_line = fast - slow
+
+    signal_start = start + signal_period - 1
+    signal_line = _seeded_ema(np.nan_to_num(macd_line), signal_period, signal_start,
+                              2.0 / (signal_period + 1))
+    macd_line[..., :signal_start] = np.nan
+
+    return macd_line, signal_line, macd_line - signal_line
+
+
+# ---------------------------------------------------------------------------
+# Momentum
+# ---------------------------------------------------------------------------
+
+def rsi(values, period=RSI_PERIOD):
+    """Relative Strength Index with Wilder smoothing"""
+    values = as_float_array(values)
+    if _use_talib(values):
+        return talib.RSI(values, timeperiod=period)
+
+    result = _nan_like(values)
+    if values.shape[-1] <= period:
+        return result
+
+    delta = np.diff(values, axis=-1)
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+
+    # Seed dengan rata-rata sederhana lalu Wilder smoothing (alpha = 1/period)
+    alpha = 1.0 / period
+    avg_gain = _seeded_ema(gain, period, period - 1, alpha)[..., period - 1:]
+    avg_loss = _seeded_ema(loss, period, period - 1, alpha)[..., period - 1:]
+    total = avg_gain + avg_loss
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result[..., period:] = np.where(total != 0, 100 * avg_gain / total, 0.0)
+    return result
+
+
+def stochastic(high, low, close, k_period=STOCH_PERIOD, d_period=STOCH_D_PERIOD):
+    """Fast stochastic %K and its SMA %D (both start once %D is defined)"""
+    high, low, close = as_float_array(high), as_float_array(low), as_float_array(close)
+    if _use_talib(high, low, close):
+        return talib.STOCHF(high, low, close, fastk_period=k_period,
+                            fastd_period=d_period, fastd_matype=0)
+
+    highest = _rolling_reduce(high, k_period, lambda block: block.max(axis=-1))
+    lowest = _rolling_reduce(low, k_period, lambda block: block.min(axis=-1))
+    price_range = highest - lowest
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stoch_k = np.where(price_range != 0, 100 * (close - lowest) / price_range, 0.0)
+    stoch_k[..., :k_period - 1] = np.nan
+
+    stoch_d = _nan_like(close)
+    first = k_period - 1
+    stoch_d[..., first:] = _rolling_reduce(stoch_k[..., first:], d_period,
+                                           lambda block: block.mean(axis=-1))
+    stoch_k[..., :first + d_period - 1] = np.nan
+
+    return stoch_k, stoch_d
+
+
+def williams_r(high, low, close, period=WILLIAMS_PERIOD):
+    """Williams %R"""
+    high, low, close = as_float_array(high), as_float_array(low), as_float_array(close)
+    if _use_talib(high, low, close):
+        return talib.WILLR(high, low, close, timeperiod=period)
+
+    highest = _rolling_reduce(high, period, lambda block: block.max(axis=-1))
+    lowest = _rolling_reduce(low, period, lambda block: block.min(axis=-1))
+    price_range = highest - lowest
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.where(price_range != 0, -100 * (highest - close) / price_range, 0.0)
+    result[..., :period - 1] = np.nan
+    return result
+
+
+def rolling_mean_and_mad(values, window=CCI_PERIOD):
+    """Rolling mean and mean absolute deviation around each window's own mean
+
+    The MAD is equivalent to ``pd.Series(values).rolling(window).apply(lambda x:
+    np.mean(np.abs(x - x.mean())))`` but is evaluated block-wise on strided
+    views instead of one Python call per row. The first ``window - 1``
+    values of both arrays are NaN.
+    """
+    values = as_float_array(values)
+
+    def mad_reducer(block):
+        block_mean = block.mean(axis=-1, keepdims=True)
+        return np.abs(block - block_mean).mean(axis=-1)
+
+    mad = _rolling_reduce(values, window, mad_reducer)
+    mean = _rolling_reduce(values, window, lambda block: block.mean(axis=-1))
+    return mean, mad
+
+
+def rolling_mean_abs_deviation(values, window=CCI_PERIOD):
+    """Rolling mean absolute deviation (see rolling_mean_and_mad)"""
+    return rolling_mean_and_mad(values, window)[1]
+
+
+def commodity_channel_index(high, low, close, window=CCI_PERIOD):
+    """Commodity Channel Index: (TP - SMA(TP)) / (0.015 * MAD(TP)), 0 when MAD is 0"""
+    high, low, close = as_float_array(high), as_float_array(low), as_float_array(close)
+    if _use_talib(high, low, close):
+        return talib.CCI(high, low, close, timeperiod=window)
+
+    typical_price = (high + low + close) / 3
+    sma_tp, mad = rolling_mean_and_mad(typical_price, window)
+    deviation = typical_price - sma_tp
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.where((mad != 0) & (deviation != 0), deviation / (0.015 * mad), 0.0)
+    result[..., :window - 1] = np.nan
+    return result
+
+
+def adx(high, low, close, period=ADX_PERIOD):
+    """Average Directional Index with Wilder smoothing
+
+    In the degenerate case of a zero true range or zero DI sum the NumPy
+    kernel uses DX = 0, where TA-Lib skips the update.
+    """
+    high, low, close = as_float_array(high), as_float_array(low), as_float_array(close)
+    if _use_talib(high, low, close):
+        return talib.ADX(high, low, close, timeperiod=period)
+
+    result = _nan_like(close)
+    length = close.shape[-1]
+    if length < 2 * period:
+        return result
+
+    diff_plus = np.diff(high, axis=-1)
+    diff_minus = -np.diff(low, axis=-1)
+    minus_dm = np.where((diff_minus > 0) & (diff_plus < diff_minus), diff_minus, 0.0)
+    plus_dm = np.where(~((diff_minus > 0) & (diff_plus < diff_minus)) &
+                       (diff_plus > 0) & (diff_plus > diff_minus), diff_plus, 0.0)
+    prev_close = close[..., :-1]
+    true_range = np.maximum(high[..., 1:] - low[..., 1:],
+                            np.maximum(np.abs(high[..., 1:] - prev_close),
+                                       np.abs(low[..., 1:] - prev_close)))
+
+    # Wilder sums: seed dengan jumlah period-1 nilai pertama, lalu S = S - S/n + x
+    decay = 1.0 - 1.0 / period
+
+    def wilder_sum(series):
+        seed = series[..., :period - 1].sum(axis=-1)
+        return _recursive_filter(series[..., period - 1:], decay, 1.0, seed)
+
+    smoothed_plus = wilder_sum(plus_dm)
+    smoothed_minus = wilder_sum(minus_dm)
+    smoothed_tr = wilder_sum(true_range)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        plus_di = 100 * smoothed_plus / smoothed_tr
+        minus_di = 100 * smoothed_minus / smoothed_tr
+        di_sum = plus_di + minus_di
+        dx = np.where((smoothed_tr != 0) & (di_sum != 0),
+                      100 * np.abs(plus_di - minus_di) / di_sum, 0.0)
+
+    # dx[j] belongs to bar j + period; ADX = Wilder average of DX
+    adx_values = _seeded_ema(dx, period, period - 1, 1.0 / period)
+    result[..., 2 * period - 1:] = adx_values[..., period - 1:]
+    return result
+
+
+def momentum(values, period=MOMENTUM_PERIOD):
+    """Fractional change over ``period`` bars (pandas pct_change)"""
+    values = as_float_array(values)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return values / _shift(values, period) - 1
+
+
+def rate_of_change(values, period=ROC_PERIOD):
+    """Percent change over ``period`` bars"""
+    return momentum(values, period) * 100
+
+
+# ---------------------------------------------------------------------------
+# Volatility
+# ---------------------------------------------------------------------------
+
+def bollinger_bands(values, period=BB_PERIOD, deviations=BB_DEVIATIONS):
+    """Upper, middle and lower Bollinger Bands (population standard deviation)"""
+    values = as_float_array(values)
+    if _use_talib(values):
+        return talib.BBANDS(values, timeperiod=period, nbdevup=deviations,
+                            nbdevdn=deviations, matype=0)
+
+    middle = sma(values, period)
+    std = _rolling_reduce(values, period, lambda block: block.std(axis=-1))
+    return middle + deviations * std, middle, middle - deviations * std
+
+
+# ---------------------------------------------------------------------------
+# Volume
+# ---------------------------------------------------------------------------
+
+def on_balance_volume(close, volume):
+    """On Balance Volume, starting from the first bar's volume"""
+    close, volume = as_float_array(close), as_float_array(volume)
+    if _use_talib(close, volume):
+        return talib.OBV(close, volume)
+
+    direction = np.sign(np.diff(close, axis=-1))
+    steps = np.concatenate([volume[..., :1], direction * volume[..., 1:]], axis=-1)
+    return np.cumsum(steps, axis=-1)
+
+
+def accumulation_distribution(high, low, close, volume):
+    """Chaikin Accumulation/Distribution line"""
+    high, low, close, volume = (as_float_array(high), as_float_array(low),
+                                as_float_array(close), as_float_array(volume))
+    if _use_talib(high, low, close, volume):
+        return talib.AD(high, low, close, volume)
+
+    price_range = high - low
+    with np.errstate(divide='ignore', invalid='ignore'):
+        money_flow = np.where(price_range > 0,
+                              ((close - low) - (high - close)) / price_range * volume, 0.0)
+    return np.cumsum(money_flow, axis=-1)
+
+
+# ---------------------------------------------------------------------------
+# Candlestick patterns
+# ---------------------------------------------------------------------------
+
+def candle_patterns(open_, high, low, close):
+    """Candle properties and pattern flags (0/1 int arrays) for every bar"""
+    open_, high, low, close = (as_float_array(open_), as_float_array(high),
+                               as_float_array(low), as_float_array(close))
+
+    body = np.abs(close - open_)
+    upper_shadow = high - np.maximum(open_, close)
+    lower_shadow = np.minimum(open_, close) - low
+    total_range = high - low
+
+    is_bullish = close > open_
+    prev_body = _shift(body, 1)
+    prev_bullish = np.zeros_like(is_bullish)
+    prev_bullish[..., 1:] = is_bullish[..., :-1]
+    # Bar pertama: shift(1) di pandas memberi NaN, jadi selalu "berbeda"
+    direction_changed = is_bullish != prev_bullish
+    direction_changed[..., :1] = True
+
+    with np.errstate(invalid='ignore'):
+        is_engulfing = (body > prev_body * 1.5) & direction_changed
+
+    return {
+        'body': body,
+        'upper_shadow': upper_shadow,
+        'lower_shadow': lower_shadow,
+        'total_range': total_range,
+        'is_bullish': is_bullish.astype(int),
+        'is_bearish': (close < open_).astype(int),
+        'is_doji': (body < total_range * 0.1).astype(int),
+        'is_hammer': ((lower_shadow > body * 2) & (upper_shadow < body * 0.5)).astype(int),
+        'is_shooting_star': ((upper_shadow > body * 2) & (lower_shadow < body * 0.5)).astype(int),
+        'prev_body': prev_body,
+        'is_engulfing': is_engulfing.astype(int)
+    }
+
+
+# ---------------------------------------------------------------------------
+# Full indicator set
+# ---------------------------------------------------------------------------
+
+def compute_indicators(open_, high, low, close, volume):
+    """Compute the full indicator set used for training and inference
+
+    Returns a dict of arrays keyed by the trainer's feature column names.
+    Inputs may be 1-D (bars,) or 2-D (symbols, bars).
+    """
+    open_, high, low, close, volume = (as_float_array(open_), as_float_array(high),
+                                       as_float_array(low), as_float_array(close),
+                                       as_float_array(volume))
+    indicators = {}
+
+    # 1. TREND INDICATORS
+    indicators['sma_20'] = sma(close, SMA_FAST_PERIOD)
+    indicators['sma_50'] = sma(close, SMA_SLOW_PERIOD)
+    indicators['ema_12'] = ema(close, EMA_FAST_PERIOD)
+    indicators['ema_26'] = ema(close, EMA_SLOW_PERIOD)
+
+    # 2. MOMENTUM INDICATORS
+    indicators['macd'], indicators['macd_signal'], indicators['macd_histogram'] = macd(close)
+    indicators['rsi'] = rsi(close, RSI_PERIOD)
+    indicators['stoch_k'], indicators['stoch_d'] = stochastic(high, low, close)
+    indicators['williams_r'] = williams_r(high, low, close, WILLIAMS_PERIOD)
+    indicators['cci'] = commodity_channel_index(high, low, close, CCI_PERIOD)
+    indicators['adx'] = adx(high, low, close, ADX_PERIOD)
+    indicators['momentum'] = momentum(close, MOMENTUM_PERIOD)
+    indicators['roc'] = rate_of_change(close, ROC_PERIOD)
+
+    # 3. VOLATILITY INDICATORS
+    upper, middle, lower = bollinger_bands(close, BB_PERIOD, BB_DEVIATIONS)
+    indicators['bb_upper'], indicators['bb_middle'], indicators['bb_lower'] = upper, middle, lower
+    with np.errstate(divide='ignore', invalid='ignore'):
+        indicators['bb_position'] = (close - lower) / (upper - lower)
+
+    # 4. VOLUME INDICATORS
+    indicators['volume_sma'] = sma(volume, VOLUME_SMA_PERIOD)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        indicators['volume_ratio'] = volume / indicators['volume_sma']
+    indicators['obv'] = on_balance_volume(close, volume)
+    indicators['ad'] = accumulation_distribution(high, low, close, volume)
+
+    return indicators
+
+
+def indicator_snapshot(latest, patterns, close, volume):
+    """Build the analyzer's indicator dict from the latest bar's values
+
+    ``latest`` maps compute_indicators names to scalars (NaN while an
+    indicator is still warming up) and ``patterns`` maps candle_patterns
+    flags to scalars. Warming-up indicators fall back to neutral defaults.
+    """
+    close = float(close)
+
+    def value(name, default):
+        current = latest[name]
+        return float(default if np.isnan(current) else current)
+
+    indicators = {}
+
+    # 1. TREND INDICATORS
+    indicators['sma_20'] = value('sma_20', close)
+    indicators['sma_50'] = value('sma_50', close)
+    indicators['ema_12'] = value('ema_12', close)
+    indicators['ema_26'] = value('ema_26', close)
+
+    # 2. MOMENTUM INDICATORS
+    indicators['rsi'] = value('rsi', 50)
+    indicators['macd'] = value('macd', 0)
+    indicators['macd_signal'] = value('macd_signal', 0)
+    indicators['macd_hist'] = value('macd_histogram', 0)
+
+    # 3. VOLATILITY INDICATORS
+    indicators['bb_upper'] = value('bb_upper', close * 1.02)
+    indicators['bb_lower'] = value('bb_lower', close * 0.98)
+    band_width = indicators['bb_upper'] - indicators['bb_lower']
+    # Series datar: band nol lebar, harga tepat di tengah band
+    indicators['bb_position'] = (close - indicators['bb_lower']) / band_width if band_width != 0 else 0.5
+
+    # 4. VOLUME INDICATORS
+    indicators['obv'] = value('obv', volume)
+    indicators['ad'] = value('ad', 0)
+
+    # 5. ADVANCED INDICATORS
+    indicators['adx'] = value('adx', 25)
+    indicators['cci'] = value('cci', 0)
+    indicators['williams_r'] = value('williams_r', -50)
+    indicators['stoch_k'] = value('stoch_k', 50)
+    indicators['stoch_d'] = value('stoch_d', 50)
+
+    # 6. PATTERN RECOGNITION (skala ala talib CDL*: +100 bullish, -100 bearish)
+    direction = 100 if patterns['is_bullish'] else -100
+    indicators['hammer'] = 100 * int(patterns['is_hammer'])
+    indicators['doji'] = 100 * int(patterns['is_doji'])
+    indicators['engulfing'] = direction * int(patterns['is_engulfing'])
+    indicators['shooting_star'] = -100 * int(patterns['is_shooting_star'])
+
+    return indicators
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+PARALLEL SIGNAL PARAMETER SWEEP
+Evaluasi grid threshold generate_master_signal (RSI, BB, ADX, skor minimum)
+plus parameter analyzer yang belum dipakai: confidence_threshold (sinyal
+dengan confidence lebih rendah dibuang), max_drawdown (stop loss per trade)
+dan risk_reward_ratio (take profit = max_drawdown * risk_reward_ratio).
+
+Kolom input per bar (backtest.master_signal_columns) plus high/low/close
+dihitung sekali lalu ditaruh di satu blok multiprocessing.shared_memory;
+worker process menempel ke blok itu saat start, sehingga task hanya berisi
+satu kombinasi threshold sinyal. Tiap task menghitung skor sekali lalu
+mensimulasikan semua kombinasi confidence/SL/RR.
+
+Hasil: structured array NumPy (parameter + metrik), diurutkan dari yang
+terbaik menurut rank_by, disimpan dengan np.save (.npy).
+
+Usage: python parameter_sweep.py [--bars 200000] [--processes N] [--output sweep_results.npy]
+                                 [--rank-by pnl] [--param rsi_oversold=25,30,35 ...]
+"""
+
+import argparse
+import itertools
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from backtest import (STOP_LOSS_PCT, TAKE_PROFIT_PCT, master_signal_columns, simulate_trades,
+                      summarize_trades)
+from signal_scoring import MASTER_SIGNAL_PARAMS, compute_master_scores, scores_to_actions
+
+# Default = perilaku sekarang (confidence_threshold 0: tidak ada sinyal yang dibuang)
+TRADE_PARAMS = {
+    'confidence_threshold': 0.0,
+    'max_drawdown': STOP_LOSS_PCT,
+    'risk_reward_ratio': TAKE_PROFIT_PCT / STOP_LOSS_PCT
+}
+SWEEP_PARAMETERS = list(MASTER_SIGNAL_PARAMS) + list(TRADE_PARAMS)
+
+DEFAULT_GRID = {
+    'rsi_oversold': (25, 30, 35),
+    'rsi_overbought': (65, 70, 75),
+    'bb_oversold': (0.1, 0.2),
+    'bb_overbought': (0.8, 0.9),
+    'adx_threshold': (20, 25, 30),
+    'score_threshold': (2.5, 3, 3.5, 4),
+    'confidence_threshold': (0.0, 0.6, 0.75),
+    'max_drawdown': (0.01, 0.02, 0.03),
+    'risk_reward_ratio': (1.5, 2.0, 3.0)
+}
+
+# Metrik yang makin kecil makin baik: rank_by metrik ini mengurutkan naik
+LOWER_IS_BETTER = {'losses', 'drawdown'}
+
+RESULT_DTYPE = np.dtype([(name, np.float64) for name in SWEEP_PARAMETERS] + [
+    ('trades', np.int64), ('wins', np.int64), ('losses', np.int64), ('hit_rate', np.float64),
+    ('pnl', np.float64), ('average_return', np.float64), ('drawdown', np.float64)
+])
+
+# Kolom milik worker process ini (view ke shared memory, diisi oleh _attach_shared)
+_worker_columns = None
+_worker_memory = None
+_worker_allow_overlap = False
+
+
+def _attach_shared(name, shape, column_names, allow_overlap):
+    """Map the shared column block into this worker, once per process"""
+    global _worker_columns, _worker_memory, _worker_allow_overlap
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    _worker_memory = shared_memory.SharedMemory(name=name)
+    block = np.ndarray(shape, dtype=np.float64, buffer=_worker_memory.buf)
+    _worker_columns = dict(zip(column_names, block))
+    _worker_allow_overlap = allow_overlap
+
+
+def _evaluate(columns, signal_params, trade_grid, allow_overlap):
+    """Result rows for one set of signal thresholds and every trade parameter combination"""
+    buy_score, sell_score = compute_master_scores(columns, signal_params)
+    rows = []
+    for confidence_threshold in sorted({params['confidence_threshold'] for params in trade_grid}):
+        actions = scores_to_actions(buy_score, sell_score, signal_params['score_threshold'],
+                                    confidence_threshold)
+        for params in trade_grid:
+            if params['confidence_threshold'] != confidence_threshold:
+                continue
+            stop_loss = params['max_drawdown']
+            trades = simulate_trades(columns, actions, allow_overlap, stop_loss,
+                                     stop_loss * params['risk_reward_ratio'])
+            report = summarize_trades(trades)
+            rows.append(tuple(signal_params[name] for name in MASTER_SIGNAL_PARAMS)
+                        + tuple(params[name] for name in TRADE_PARAMS)
+                        + (report['trades'], report['wins'], report['losses'], report['hit_rate'],
+                           report['pnl'], report['average_return'], report['max_drawdown']))
+    return rows
+
+
+def _run_task(signal_params, trade_grid):
+    return _evaluate(_worker_columns, signal_params, trade_grid, _worker_allow_overlap)
+
+
+def _expand(grid, names, defaults):
+    """Every combination of ``names`` from ``grid`` (missing names use the default)"""
+    values = [grid.get(name, (defaults[name],)) for name in names]
+    return [dict(zip(names, map(float, combo))) for combo in itertools.product(*values)]
+
+
+def run_sweep(price_data, grid=None, processes=None, pattern_flags=None, rank_by='pnl',
+              allow_overlap=False, ascending=None):
+    """Backtest every parameter combination in ``grid`` and rank the results
+
+    ``grid`` maps SWEEP_PARAMETERS names to candidate values (defaults to
+    DEFAULT_GRID; missing names keep their current value). Returns a
+    RESULT_DTYPE array sorted by ``rank_by``, best first: ascending for
+    LOWER_IS_BETTER metrics, descending otherwise, unless ``ascending`` says.
+    """
+    grid = DEFAULT_GRID if grid is None else grid
+    unknown = set(grid) - set(SWEEP_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(sorted(unknown))}")
+    if rank_by not in RESULT_DTYPE.names:
+        raise ValueError(f"Cannot rank by {rank_by!r}")
+
+    signal_grid = _expand(grid, list(MASTER_SIGNAL_PARAMS), MASTER_SIGNAL_PARAMS)
+    trade_grid = _expand(grid, list(TRADE_PARAMS), TRADE_PARAMS)
+
+    columns = master_signal_columns(price_data, pattern_flags)
+    for name in ('high', 'low', 'close'):
+        columns[name] = np.asarray(price_data[name], dtype=np.float64)
+
+    if processes is None:
+        processes = min(len(signal_grid), os.cpu_count() or 1)
+
+    if processes <= 1 or len(signal_grid) <= 1:
+        rows = [row for params in signal_grid
+                for row in _evaluate(columns, params, trade_grid, allow_overlap)]
+    else:
+        # Satu blok (kolom x bar) di shared memory; task cukup membawa parameternya
+        names = list(columns)
+        shape = (len(names), len(columns['close']))
+        memory = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * 8))
+        try:
+            block = np.ndarray(shape, dtype=np.float64, buffer=memory.buf)
+            for row, name in enumerate(names):
+                block[row] = columns[name]
+            with ProcessPoolExecutor(max_workers=processes, initializer=_attach_shared,
+                                     initargs=(memory.name, shape, names, allow_overlap)) as executor:
+                chunks = executor.map(_run_task, signal_grid, itertools.repeat(trade_grid))
+                rows = [row for chunk in chunks for row in chunk]
+            del block
+        finally:
+            memory.close()
+            memory.unlink()
+
+    results = np.array(rows, dtype=RESULT_DTYPE)
+    if ascending is None:
+        ascending = rank_by in LOWER_IS_BETTER
+    ranking = results[rank_by] if ascending else -results[rank_by]
+    return results[np.argsort(ranking, kind='stable')]
+
+
+def save_results(results, path):
+    """Write ranked sweep results as a .npy structured array"""
+    np.save(path, results, allow_pickle=False)
+
+
+def load_results(path):
+    """Read results written by save_results"""
+    return np.load(path, allow_pickle=False)
+
+
+def _parse_param(text):
+    name, _, values = text.partition("=")
+    if not values:
+        raise argparse.ArgumentTypeError(f"Expected name=v1,v2,... got {text!r}")
+    return name, tuple(float(value) for value in values.split(","))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep master signal thresholds over a synthetic backtest")
+    parser.add_argument("--bars", type=int, default=200_000)
+    parser.add_argument("--volatility", type=float, default=0.005,
+                        help="Per-bar volatility of the synthetic series")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--param", type=_parse_param, action="append", default=[],
+                        help="Override one grid axis, e.g. --param rsi_oversold=20,25,30")
+    parser.add_argument("--rank-by", default="pnl")
+    parser.add_argument("--ascending", action="store_true", default=None,
+                        help="Rank lowest first (default only for losses/drawdown)")
+    parser.add_argument("--allow-overlap", action="store_true")
+    parser.add_argument("--output", default="sweep_results.npy")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    from synthetic_data import generate_ohlcv
+
+    grid = {**DEFAULT_GRID, **dict(args.param)}
+    df = generate_ohlcv(args.bars, seed=args.seed, volatility=args.volatility)
+
+    start = time.perf_counter()
+    results = run_sweep(df, grid, args.processes, rank_by=args.rank_by, allow_overlap=args.allow_overlap,
+                        ascending=args.ascending)
+    elapsed = time.perf_counter() - start
+    save_results(results, args.output)
+
+    print(f"📊 Parameter sweep: {len(results):,} combinations x {args.bars:,} bars in {elapsed:.1f} s "
+          f"-> {args.output}")
+    header = " ".join(f"{name:>10.10}" for name in RESULT_DTYPE.names)
+    print(header)
+    for row in results[:args.top]:
+        print(" ".join(f"{value:>10.4g}" for value in row.tolist()))
+
+
+if __name__ == "__main__":
+    main()
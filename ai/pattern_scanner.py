@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+VECTORIZED ROLLING CHART-PATTERN SCANNER
+detect_chart_patterns hanya mengecek 20 candle terakhir. Scanner ini
+mengevaluasi aturan yang sama untuk SETIAP bar (window 20 candle yang berakhir
+di bar itu) sekaligus, untuk backtest:
+
+    slope trendline   slope least-squares closed-form: sliding window @ bobot
+    peak / trough     local maxima (plateau-aware) sekali untuk seluruh series;
+                      kandidat tiap window adalah satu slice daftar puncak, dan
+                      filter distance find_peaks dijalankan sekali per slice
+    flag              range rolling 5 candle
+
+Hasilnya satu uint8 bitmask per bar (PATTERN_BITS); bar sebelum window
+pertama bernilai 0. Bit sama dengan detect_chart_patterns(df[:bar + 1]),
+kecuali bila dua puncak berdekatan sama tinggi persis: find_peaks memilih di
+antaranya lewat argsort yang tidak stabil, scanner memilih yang terakhir.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from advanced_crypto_analyzer import PatternContext
+from indicators import as_float_array
+
+PATTERN_BITS = {
+    'HEAD_AND_SHOULDERS': 1 << 0,
+    'DOUBLE_TOP': 1 << 1,
+    'DOUBLE_BOTTOM': 1 << 2,
+    'ASCENDING_TRIANGLE': 1 << 3,
+    'DESCENDING_TRIANGLE': 1 << 4,
+    'FLAG': 1 << 5,
+    'PENNANT': 1 << 6
+}
+
+# Bar per blok, supaya array sementara tetap kecil untuk jutaan bar
+_CHUNK_BARS = 1 << 18
+
+
+def rolling_slopes(values, window):
+    """Least-squares slope of every ``window``-long run ending at each bar (NaN before)"""
+    values = as_float_array(values)
+    slopes = np.full(len(values), np.nan)
+    if len(values) >= window > 1:
+        centered = np.arange(window) - (window - 1) / 2
+        slopes[window - 1:] = sliding_window_view(values, window) @ (centered / (centered @ centered))
+    return slopes
+
+
+def local_maxima(values):
+    """(midpoints, left_neighbours, right_neighbours) of every local maximum
+
+    Same peaks as scipy.signal.find_peaks without conditions: a plateau
+    counts once, at its middle, when both neighbours are strictly lower.
+    The neighbour indices say which windows contain the whole peak.
+    """
+    steps = np.diff(values)
+    changes = np.flatnonzero(steps != 0)
+    direction = np.sign(steps[changes])
+    # Naik lalu (setelah nol atau lebih langkah datar) turun = puncak
+    rises = np.flatnonzero((direction[:-1] > 0) & (direction[1:] < 0))
+    left, right = changes[rises], changes[rises + 1] + 1
+    return (left + 1 + right - 1) // 2, left, right
+
+
+def rolling_peaks(values, window, distance):
+    """find_peaks(window, distance=distance) for every window of ``values``
+
+    Returns (peaks, counts): ``peaks`` has one row per window start with the
+    kept peaks as series indices in ascending order, padded with -1.
+    """
+    values = as_float_array(values)
+    bars = len(values) - window + 1
+    midpoints, left, right = local_maxima(values)
+
+    # Kandidat window [s, s + window) = puncak yang kedua tetangganya di dalam window;
+    # left/right naik bersama midpoint, jadi kandidatnya slice [lo, hi) daftar puncak
+    window_starts = np.arange(bars)
+    lo = np.searchsorted(left, window_starts, side='left')
+    hi = np.searchsorted(right, window_starts + window - 1, side='right')
+    # Slice hanya berubah saat puncak masuk/keluar window: hitung sekali per slice
+    changed = np.ones(bars, dtype=bool)
+    changed[1:] = (lo[1:] != lo[:-1]) | (hi[1:] != hi[:-1])
+    groups = np.cumsum(changed) - 1
+    lo, hi = lo[changed], hi[changed]
+
+    counts = np.maximum(hi - lo, 0)
+    slots = np.arange(max(int(counts.max(initial=0)), 1))
+    valid = slots < counts[:, None]
+    # Slot kosong menunjuk sentinel di ujung daftar puncak
+    padded = np.concatenate((midpoints, np.full(len(slots), len(values))))
+    indices = padded[lo[:, None] + slots]
+
+    # Greedy seperti find_peaks: ambil kandidat tertinggi (tie -> index terakhir), buang
+    # kandidat berjarak < distance. Hanya slice dengan dua kandidat berdekatan yang perlu
+    distance = int(np.ceil(distance))
+    kept = valid.copy()
+    rows = np.flatnonzero((valid[:, 1:] & (np.diff(indices, axis=1) < distance)).any(axis=1))
+    kept[rows] = False
+    pending = valid[rows]
+    # Kolom dibalik supaya argmax (kemunculan pertama) memilih index terakhir saat tie
+    row_indices = indices[rows, ::-1]
+    heights = np.where(pending[:, ::-1], np.append(values, -np.inf)[np.minimum(row_indices, len(values))], -np.inf)
+    while len(rows):
+        chosen = heights.argmax(axis=1)
+        chosen_index = np.take_along_axis(row_indices, chosen[:, None], axis=1)
+        kept[rows, slots[-1] - chosen] = True
+        suppressed = np.abs(row_indices - chosen_index) < distance
+        heights[suppressed] = -np.inf
+        live = heights.max(axis=1) > -np.inf
+        rows, row_indices, heights = rows[live], row_indices[live], heights[live]
+
+    # Rapatkan puncak yang tersisa ke kiri (urut index), slot kosong = -1
+    peaks = np.sort(np.where(kept, indices, len(values)), axis=1)
+    peaks[peaks == len(values)] = -1
+    return peaks[groups], kept.sum(axis=1)[groups]
+
+
+def _last_two(peaks, counts):
+    """Series indices of the last two kept peaks per window (clipped when missing)"""
+    last = np.maximum(counts - 1, 0)[:, None]
+    return (np.take_along_axis(peaks, np.maximum(last - 1, 0), axis=1)[:, 0],
+            np.take_along_axis(peaks, last, axis=1)[:, 0])
+
+
+def _scan_chunk(highs, lows, closes, window, trend_window):
+    """Bitmask for every full window of one chunk (len - window + 1 bars)"""
+    flags = np.zeros(len(highs) - window + 1, dtype=np.uint8)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Head and Shoulders: tiga puncak pertama (distance 3), yang tengah tertinggi
+        peaks, counts = rolling_peaks(highs, window, 3)
+        if peaks.shape[1] >= 3:
+            left, head, right = (highs[peaks[:, slot]] for slot in range(3))
+            flags[(counts >= 3) & (head > left) & (head > right)] |= PATTERN_BITS['HEAD_AND_SHOULDERS']
+
+        # Double Top/Bottom: dua puncak / lembah terakhir (distance 5) selisih < 2%
+        peaks, counts = rolling_peaks(highs, window, 5)
+        first, second = (highs[index] for index in _last_two(peaks, counts))
+        flags[(counts >= 2) & (np.abs(second - first) / second < 0.02)] |= PATTERN_BITS['DOUBLE_TOP']
+
+        troughs, counts = rolling_peaks(-lows, window, 5)
+        first, second = (lows[index] for index in _last_two(troughs, counts))
+        flags[(counts >= 2) & (np.abs(second - first) / second < 0.02)] |= PATTERN_BITS['DOUBLE_BOTTOM']
+
+    # Triangles: slope 20 candle; Pennant: slope 10 candle terakhir
+    high_slope = rolling_slopes(highs, window)[window - 1:]
+    low_slope = rolling_slopes(lows, window)[window - 1:]
+    flags[(np.abs(high_slope) < 50) & (low_slope > 20)] |= PATTERN_BITS['ASCENDING_TRIANGLE']
+    flags[(np.abs(low_slope) < 50) & (high_slope < -20)] |= PATTERN_BITS['DESCENDING_TRIANGLE']
+
+    high_trend = rolling_slopes(highs, trend_window)[window - 1:]
+    low_trend = rolling_slopes(lows, trend_window)[window - 1:]
+    flags[(np.abs(high_trend) > 10) & (np.abs(low_trend) > 10)] |= PATTERN_BITS['PENNANT']
+
+    # Flag: range 5 close terakhir < 30% range 5 close sebelumnya
+    close_windows = sliding_window_view(closes, 5)
+    ranges = close_windows.max(axis=1) - close_windows.min(axis=1)
+    recent, previous = ranges[window - 5:], ranges[window - 10:len(ranges) - 5]
+    flags[recent < previous * 0.3] |= PATTERN_BITS['FLAG']
+
+    return flags
+
+
+def scan_patterns(price_data, window=PatternContext.PATTERN_WINDOW,
+                  trend_window=PatternContext.TREND_WINDOW):
+    """uint8 pattern bitmask for every bar of a DataFrame or dict of OHLC arrays"""
+    highs, lows, closes = (as_float_array(price_data[name]) for name in ('high', 'low', 'close'))
+    flags = np.zeros(len(closes), dtype=np.uint8)
+    if len(closes) < window:
+        return flags
+
+    # Blok yang saling overlap window - 1 bar
+    for start in range(0, len(closes) - window + 1, _CHUNK_BARS):
+        stop = min(start + _CHUNK_BARS + window - 1, len(closes))
+        flags[start + window - 1:stop] = _scan_chunk(
+            highs[start:stop], lows[start:stop], closes[start:stop], window, trend_window)
+    return flags
+
+
+def decode_patterns(flags):
+    """Pattern names set in one bitmask value"""
+    return [name for name, bit in PATTERN_BITS.items() if int(flags) & bit]
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+ANALYSIS RESULT CACHE
+LRU + TTL cache di depan pipeline analisis. Key-nya fingerprint blake2b dari
+symbol, timeframe dan buffer OHLCV, jadi beberapa layar app yang meminta pair
+dan timeframe yang sama dengan candle yang sama cukup dihitung sekali.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from advanced_crypto_analyzer import OHLCV_COLUMNS
+
+
+def fingerprint(symbol, timeframe, columns):
+    """16-byte blake2b digest of symbol, timeframe and the OHLCV column bytes"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{symbol}|{timeframe}|".encode("utf-8"))
+    for column in OHLCV_COLUMNS:
+        values = np.ascontiguousarray(columns[column], dtype=np.float64)
+        digest.update(len(values).to_bytes(8, "little"))
+        digest.update(memoryview(values).cast("B"))
+    return digest.digest()
+
+
+class ResultCache:
+    """Thread-safe LRU cache whose entries expire after ``ttl_seconds``"""
+
+    def __init__(self, max_entries=256, ttl_seconds=60):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()  # key -> (expires_at, value)
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """Cached value for ``key``, or None on a miss"""
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= now:
+                del self.entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self.lock:
+            self.entries[key] = (expires_at, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
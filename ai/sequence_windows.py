@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+ZERO-COPY SEQUENCE WINDOWS
+Membangun input sequence (N, lookback, features) untuk model LSTM+CNN
+sebagai strided view di atas satu matrix fitur float32 yang contiguous
+(C order, atau Fortran order dari feature store). sequence_dataset membangun
+window yang sama per batch di dalam pipeline tf.data untuk model.fit.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def as_feature_matrix(features, dtype=np.float32):
+    """Return features as one contiguous 2-D matrix (copies only if needed)
+
+    Fortran-order input (e.g. a feature_store memmap) is kept as is.
+    """
+    matrix = np.asarray(features, dtype=dtype)
+    if not (matrix.flags.c_contiguous or matrix.flags.f_contiguous):
+        matrix = np.ascontiguousarray(matrix)
+    if matrix.ndim != 2:
+        raise ValueError(f"Expected a 2-D feature matrix, got shape {matrix.shape}")
+    return matrix
+
+
+def build_sequence_windows(features, lookback_window=60):
+    """Build a read-only (N - lookback, lookback, F) view of sliding windows
+
+    Window ``k`` covers rows ``k .. k + lookback - 1`` and is paired with the
+    target at row ``k + lookback``, matching the original Python loop.
+    """
+    matrix = as_feature_matrix(features)
+    num_windows = max(len(matrix) - lookback_window, 0)
+
+    if num_windows == 0:
+        return np.empty((0, lookback_window, matrix.shape[1]), dtype=matrix.dtype)
+
+    # sliding_window_view memberi shape (windows, F, lookback) dan read-only
+    windows = sliding_window_view(matrix, lookback_window, axis=0)[:num_windows]
+    return windows.transpose(0, 2, 1)
+
+
+def align_sequence_targets(targets, lookback_window=60):
+    """Return the targets that belong to each window of build_sequence_windows"""
+    return np.asarray(targets)[lookback_window:]
+
+
+def iter_sequence_batches(features, targets, lookback_window=60, batch_size=64,
+                          indices=None, shuffle=False, seed=None):
+    """Yield (X_batch, y_batch) pairs without materializing the full 3-D tensor
+
+    Only one batch of windows is copied into memory at a time. ``indices``
+    selects a subset of window positions (e.g. a train/validation split).
+    """
+    windows = build_sequence_windows(features, lookback_window)
+    window_targets = align_sequence_targets(targets, lookback_window)
+
+    if indices is None:
+        indices = np.arange(len(windows))
+    else:
+        indices = np.asarray(indices)
+
+    if shuffle:
+        indices = np.random.default_rng(seed).permutation(indices)
+
+    for start in range(0, len(indices), batch_size):
+        batch_indices = indices[start:start + batch_size]
+        # Fancy indexing menyalin hanya window untuk batch ini
+        yield windows[batch_indices], window_targets[batch_indices]
+
+
+def feature_tensor(features):
+    """The flat (rows, F) feature matrix as one TensorFlow tensor
+
+    Build it once and pass it to every sequence_dataset (train, validation,
+    test) so the matrix is held in TensorFlow only once.
+    """
+    import tensorflow as tf
+
+    # TF butuh C order: matrix Fortran (feature store) disalin sekali di sini
+    return tf.constant(np.ascontiguousarray(as_feature_matrix(features)))
+
+
+def sequence_dataset(features, targets, lookback_window=60, batch_size=64, indices=None,
+                     shuffle=False, seed=None, num_classes=None, cache=None):
+    """tf.data pipeline of (X_batch, y_batch) windows built on the fly
+
+    Same windows and targets as iter_sequence_batches, but inside TensorFlow:
+    ``features`` is the flat (rows, F) matrix, preferably a feature_tensor
+    shared by all datasets, and each batch of windows is gathered in a
+    parallel map, so memory grows with ``batch_size`` instead
+    of the number of windows. ``targets`` are class ids when ``num_classes``
+    is given (one-hot encoded per batch). ``cache`` is a tf.data cache
+    filename ('' = memory) for the finished batches; only for fixed-order
+    (unshuffled) datasets such as validation data.
+    """
+    import tensorflow as tf
+
+    if shuffle and cache is not None:
+        raise ValueError("A cached dataset would repeat the first shuffled order every epoch")
+
+    data = features if tf.is_tensor(features) else feature_tensor(features)
+    window_targets = np.asarray(align_sequence_targets(targets, lookback_window))
+    if indices is None:
+        indices = np.arange(max(int(data.shape[0]) - lookback_window, 0))
+    indices = np.asarray(indices, dtype=np.int64)
+
+    offsets = tf.range(lookback_window, dtype=tf.int64)
+
+    # Elemen dataset hanya posisi window + target; shuffle/batch bekerja di atas itu
+    dataset = tf.data.Dataset.from_tensor_slices((indices, window_targets[indices].astype(np.int64)))
+    if shuffle:
+        dataset = dataset.shuffle(max(len(indices), 1), seed=seed, reshuffle_each_iteration=True)
+    dataset = dataset.batch(batch_size)
+
+    def build_windows(batch_indices, batch_targets):
+        # (batch, lookback) row index -> (batch, lookback, F)
+        X_batch = tf.gather(data, batch_indices[:, None] + offsets)
+        if num_classes is not None:
+            batch_targets = tf.one_hot(batch_targets, num_classes)
+        return X_batch, batch_targets
+
+    dataset = dataset.map(build_windows, num_parallel_calls=tf.data.AUTOTUNE)
+    if cache is not None:
+        dataset = dataset.cache(cache)
+    return dataset.prefetch(tf.data.AUTOTUNE)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+COLUMNAR SIGNAL SCORING ENGINE
+Aturan skor sinyal ditulis sebagai tabel deklaratif (Rule: sisi, bobot,
+kondisi, alasan) lalu di-compile sekali menjadi evaluator NumPy. Evaluator
+yang sama dipakai untuk:
+
+    batch   skor setiap candle sekaligus (label training, backtest, sweep)
+    live    skor satu bar plus daftar alasan (generate_master_signal)
+
+Dua tabel: TRAINING_RULES (label trainer) dan MASTER_RULES (sinyal analyzer).
+Aturan yang sama persis di keduanya didefinisikan sekali (_OSCILLATOR_RULES),
+sisanya memang berbeda dan terlihat berdampingan di sini.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+# side: 'buy', 'sell', atau 'confirm' (bobot ditambahkan ke sisi yang sedang unggul,
+# dievaluasi setelah semua aturan lain). conditions: tuple (kolom, op, operand) yang
+# di-AND; operand berupa angka, nama kolom lain, atau Param (threshold yang bisa diubah)
+Rule = namedtuple('Rule', ['side', 'weight', 'conditions', 'reason'])
+Param = namedtuple('Param', ['name'])
+
+_OPERATORS = {
+    '<': np.less, '<=': np.less_equal, '>': np.greater, '>=': np.greater_equal,
+    '==': np.equal, '!=': np.not_equal
+}
+
+# Threshold yang di-hard-code generate_master_signal
+MASTER_SIGNAL_PARAMS = {
+    'rsi_oversold': 30.0,
+    'rsi_overbought': 70.0,
+    'bb_oversold': 0.2,
+    'bb_overbought': 0.8,
+    'adx_threshold': 25.0,
+    'score_threshold': 3.0
+}
+
+BULLISH_PATTERNS = ('DOUBLE_BOTTOM', 'ASCENDING_TRIANGLE', 'FLAG')
+BEARISH_PATTERNS = ('DOUBLE_TOP', 'HEAD_AND_SHOULDERS', 'DESCENDING_TRIANGLE')
+# Urutan deteksi detect_chart_patterns (urutan alasan di sinyal live)
+_PATTERN_ORDER = ('HEAD_AND_SHOULDERS', 'DOUBLE_TOP', 'DOUBLE_BOTTOM', 'ASCENDING_TRIANGLE',
+                  'DESCENDING_TRIANGLE', 'FLAG')
+
+_OSCILLATOR_RULES = (
+    Rule('buy', 2.0, (('rsi', '<', Param('rsi_oversold')),), 'RSI Oversold'),
+    Rule('sell', 2.0, (('rsi', '>', Param('rsi_overbought')),), 'RSI Overbought'),
+    Rule('buy', 1.5, (('macd', '>', 'macd_signal'), ('macd', '>', 0)), 'MACD Bullish'),
+    Rule('sell', 1.5, (('macd', '<', 'macd_signal'), ('macd', '<', 0)), 'MACD Bearish'),
+    Rule('buy', 1.0, (('bb_position', '<', Param('bb_oversold')),), 'BB Oversold'),
+    Rule('sell', 1.0, (('bb_position', '>', Param('bb_overbought')),), 'BB Overbought')
+)
+
+# Label training: kolom DataFrame trainer, flag candle 0/1 (NaN dianggap aktif seperti versi scalar)
+TRAINING_RULES = _OSCILLATOR_RULES + (
+    Rule('buy', 0.5, (('stoch_k', '<', 20),), 'Stochastic Oversold'),
+    Rule('sell', 0.5, (('stoch_k', '>', 80),), 'Stochastic Overbought'),
+    Rule('buy', 1.5, (('is_hammer', '!=', 0),), 'Hammer Pattern'),
+    Rule('sell', 1.5, (('is_shooting_star', '!=', 0),), 'Shooting Star Pattern'),
+    Rule('buy', 1.0, (('is_engulfing', '!=', 0), ('is_bullish', '!=', 0)), 'Bullish Engulfing'),
+    Rule('sell', 1.0, (('is_engulfing', '!=', 0), ('is_bullish', '==', 0)), 'Bearish Engulfing'),
+    Rule('buy', 1.0, (('close', '>', 'sma_20'), ('sma_20', '>', 'sma_50')), 'MA Uptrend'),
+    Rule('sell', 1.0, (('close', '<', 'sma_20'), ('sma_20', '<', 'sma_50')), 'MA Downtrend'),
+    Rule('confirm', 0.5, (('volume_ratio', '>', 1.5),), 'Volume Confirmation')
+)
+
+# Sinyal analyzer: nilai indicator_snapshot (flag candle skala +-100), trend/sentiment
+# +1/-1/0 dan satu kolom 0/1 per chart pattern
+MASTER_RULES = _OSCILLATOR_RULES + (
+    Rule('buy', 1.0, (('adx', '>', Param('adx_threshold')), ('ema_12', '>', 'ema_26')), 'Strong Uptrend'),
+    Rule('sell', 1.0, (('adx', '>', Param('adx_threshold')), ('ema_12', '<=', 'ema_26')), 'Strong Downtrend'),
+    Rule('buy', 1.5, (('trend', '>', 0),), 'Bullish Trend'),
+    Rule('sell', 1.5, (('trend', '<', 0),), 'Bearish Trend'),
+) + tuple(
+    Rule('buy' if pattern in BULLISH_PATTERNS else 'sell', 1.0, ((pattern, '!=', 0),),
+         f"{'Bullish' if pattern in BULLISH_PATTERNS else 'Bearish'} {pattern}")
+    for pattern in _PATTERN_ORDER
+) + (
+    Rule('buy', 0.5, (('sentiment', '>', 0),), 'Bullish Sentiment'),
+    Rule('sell', 0.5, (('sentiment', '<', 0),), 'Bearish Sentiment'),
+    Rule('buy', 1.0, (('hammer', '>', 0),), 'Hammer Pattern'),
+    # Shooting star bernilai -100, jadi aturan "> 0" versi scalar tidak pernah aktif
+    Rule('sell', 1.0, (('shooting_star', '>', 0),), 'Shooting Star Pattern'),
+    # Versi scalar hanya mencapai cabang bullish (engulfing > 0)
+    Rule('buy', 1.0, (('engulfing', '>', 0),), 'Bullish Engulfing')
+)
+
+
+class CompiledRules:
+    """A rule table resolved into NumPy ufunc calls, evaluated per column array"""
+
+    def __init__(self, rules, params=None):
+        self.rules = tuple(rules)
+        self.params = dict(params or {})
+        self.columns = []
+        self._compiled = []
+        for rule in self.rules:
+            if rule.side not in ('buy', 'sell', 'confirm'):
+                raise ValueError(f"Unknown rule side {rule.side!r} ({rule.reason})")
+            clauses = []
+            for column, op, operand in rule.conditions:
+                if op not in _OPERATORS:
+                    raise ValueError(f"Unknown operator {op!r} ({rule.reason})")
+                self._require(column)
+                if isinstance(operand, str):
+                    self._require(operand)
+                elif not isinstance(operand, Param):
+                    operand = float(operand)
+                clauses.append((column, _OPERATORS[op], operand))
+            self._compiled.append((rule.side, float(rule.weight), tuple(clauses)))
+
+    def _require(self, column):
+        if column not in self.columns:
+            self.columns.append(column)
+
+    def _operand(self, operand, values, params):
+        if isinstance(operand, Param):
+            return params[operand.name]
+        if isinstance(operand, str):
+            return values[operand]
+        return operand
+
+    def fired(self, columns, params=None):
+        """Bool mask per rule (rules x rows) of the rules whose conditions hold"""
+        params = {**self.params, **(params or {})}
+        values = {name: np.asarray(columns[name], dtype=np.float64) for name in self.columns}
+        masks = []
+        with np.errstate(invalid='ignore'):
+            for _, _, clauses in self._compiled:
+                mask = None
+                for column, ufunc, operand in clauses:
+                    clause = ufunc(values[column], self._operand(operand, values, params))
+                    mask = clause if mask is None else mask & clause
+                masks.append(mask)
+        return masks
+
+    def score(self, columns, params=None):
+        """(buy_score, sell_score) arrays for every row of ``columns``"""
+        return self._accumulate(self.fired(columns, params))
+
+    def _accumulate(self, masks):
+        shape = np.shape(masks[0]) if masks else ()
+        buy_score, sell_score = np.zeros(shape), np.zeros(shape)
+        confirmations = []
+        for (side, weight, _), mask in zip(self._compiled, masks):
+            if side == 'confirm':
+                confirmations.append((weight, mask))
+            else:
+                target = buy_score if side == 'buy' else sell_score
+                np.add(target, weight, out=target, where=mask)
+
+        # Konfirmasi memperkuat sisi yang unggul setelah semua aturan lain
+        if confirmations:
+            leading = np.sign(buy_score - sell_score)
+            for weight, mask in confirmations:
+                np.add(buy_score, weight, where=mask & (leading > 0), out=buy_score)
+                np.add(sell_score, weight, where=mask & (leading < 0), out=sell_score)
+        return buy_score, sell_score
+
+    def score_bar(self, values, params=None):
+        """(buy_score, sell_score, reasons) for one bar given as a dict of scalars"""
+        masks = self.fired(values, params)
+        buy_score, sell_score = self._accumulate(masks)
+        leading = np.sign(buy_score - sell_score)
+        reasons = [rule.reason for rule, mask in zip(self.rules, masks)
+                   if bool(mask) and (rule.side != 'confirm' or leading != 0)]
+        return float(buy_score), float(sell_score), reasons
+
+
+def compile_rules(rules, params=None):
+    """Compile a rule table once; ``params`` are the default Param values"""
+    return CompiledRules(rules, params)
+
+
+TRAINING_SCORER = compile_rules(TRAINING_RULES, MASTER_SIGNAL_PARAMS)
+MASTER_SCORER = compile_rules(MASTER_RULES, MASTER_SIGNAL_PARAMS)
+
+# Kolom yang dibutuhkan untuk scoring label training / sinyal analyzer
+SCORING_COLUMNS = list(TRAINING_SCORER.columns)
+MASTER_SCORING_COLUMNS = list(MASTER_SCORER.columns)
+
+
+def compute_signal_scores(df):
+    """Compute the raw trading signal score (buy - sell) for every row at once"""
+    buy_score, sell_score = TRAINING_SCORER.score(df)
+    return buy_score - sell_score
+
+
+def scores_to_labels(scores):
+    """Convert raw scores to -2..2 classification labels"""
+    return np.select(
+        [scores >= 2, scores >= 1, scores <= -2, scores <= -1],
+        [2, 1, -2, -1],
+        default=0
+    ).astype(np.int64)
+
+
+def generate_signal_labels(df):
+    """Generate -2..2 signal labels for every row of an indicator DataFrame"""
+    return scores_to_labels(compute_signal_scores(df))
+
+
+def compute_master_scores(columns, params=None):
+    """(buy_score, sell_score) of generate_master_signal for every row
+
+    ``columns`` hold MASTER_SCORING_COLUMNS per bar; ``params`` overrides
+    MASTER_SIGNAL_PARAMS.
+    """
+    return MASTER_SCORER.score(columns, params)
+
+
+def scores_to_actions(buy_score, sell_score, score_threshold=MASTER_SIGNAL_PARAMS['score_threshold'],
+                      confidence_threshold=0.0):
+    """Master signal per row: 1 BUY, -1 SELL, 0 HOLD
+
+    ``confidence_threshold`` additionally drops signals whose confidence
+    (as generate_master_signal computes it) is lower; 0 keeps them all.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        confidence = np.minimum(0.95, np.maximum(buy_score, sell_score) / (buy_score + sell_score))
+    confident = confidence >= confidence_threshold
+    return np.select(
+        [(buy_score > sell_score) & (buy_score >= score_threshold) & confident,
+         (sell_score > buy_score) & (sell_score >= score_threshold) & confident],
+        [1, -1],
+        default=0
+    ).astype(np.int8)
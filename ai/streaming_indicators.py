@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+STREAMING (INCREMENTAL) INDICATORS
+Indikator dengan state O(window) yang di-update O(1) per candle baru, sehingga
+symbol live bisa di-score ulang setiap tick tanpa menghitung ulang history.
+
+Setiap class mengikuti definisi yang sama dengan indicators.py (TA-Lib):
+warm-up period, seed SMA untuk EMA/Wilder dan alignment MACD/stochastic.
+Selama warm-up nilai indikator adalah NaN.
+"""
+
+import math
+from collections import deque
+
+import indicators as batch
+from indicators import indicator_snapshot
+
+NAN = float('nan')
+
+# Running sums dihitung ulang dari window setiap N update untuk membuang drift
+_RESYNC_INTERVAL = 1024
+
+
+class RollingExtreme:
+    """Rolling max (or min) over the last ``window`` values, amortized O(1)"""
+
+    def __init__(self, window, find_max=True):
+        self.window = window
+        self.find_max = find_max
+        self.candidates = deque()  # (index, value), monotonic
+        self.index = -1
+
+    def update(self, value):
+        self.index += 1
+        if self.find_max:
+            while self.candidates and self.candidates[-1][1] <= value:
+                self.candidates.pop()
+        else:
+            while self.candidates and self.candidates[-1][1] >= value:
+                self.candidates.pop()
+        self.candidates.append((self.index, value))
+
+        while self.candidates[0][0] <= self.index - self.window:
+            self.candidates.popleft()
+        return self.value
+
+    @property
+    def ready(self):
+        return self.index >= self.window - 1
+
+    @property
+    def value(self):
+        return self.candidates[0][1] if self.ready else NAN
+
+
+class RollingSum:
+    """Rolling sum (and sum of squares) over the last ``window`` values"""
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.updates = 0
+
+    def update(self, value):
+        if len(self.values) == self.window:
+            oldest = self.values[0]
+            self.total -= oldest
+            self.total_squares -= oldest * oldest
+        self.values.append(value)
+        self.total += value
+        self.total_squares += value * value
+
+        self.updates += 1
+        if self.updates % _RESYNC_INTERVAL == 0:
+            self.total = math.fsum(self.values)
+            self.total_squares = math.fsum(v * v for v in self.values)
+
+    @property
+    def ready(self):
+        return len(self.values) == self.window
+
+
+class StreamingSMA:
+    """Simple moving average"""
+
+    def __init__(self, period):
+        self.period = period
+        self.sums = RollingSum(period)
+        self.value = NAN
+
+    def update(self, value):
+        self.sums.update(value)
+        if self.sums.ready:
+            self.value = self.sums.total / self.period
+        return self.value
+
+
+class StreamingEMA:
+    """EMA seeded with the SMA of the first ``period`` values
+
+    ``alpha`` defaults to 2 / (period + 1); use 1 / period for Wilder smoothing.
+    """
+
+    def __init__(self, period, alpha=None):
+        self.period = period
+        self.alpha = 2.0 / (period + 1) if alpha is None else alpha
+        self.seed_values = []
+        self.value = NAN
+
+    def update(self, value):
+        if self.seed_values is not None:
+            self.seed_values.append(value)
+            if len(self.seed_values) == self.period:
+                self.value = math.fsum(self.seed_values) / self.period
+                self.seed_values = None
+        else:
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+    @property
+    def ready(self):
+        return self.seed_values is None
+
+
+class StreamingRSI:
+    """Relative Strength Index with Wilder smoothing"""
+
+    def __init__(self, period=batch.RSI_PERIOD):
+        self.avg_gain = StreamingEMA(period, alpha=1.0 / period)
+        self.avg_loss = StreamingEMA(period, alpha=1.0 / period)
+        self.previous = None
+        self.value = NAN
+
+    def update(self, close):
+        if self.previous is not None:
+            delta = close - self.previous
+            gain = self.avg_gain.update(delta if delta > 0 else 0.0)
+            loss = self.avg_loss.update(-delta if delta < 0 else 0.0)
+            if self.avg_gain.ready:
+                total = gain + loss
+                self.value = 100 * gain / total if total != 0 else 0.0
+        self.previous = close
+        return self.value
+
+
+class StreamingMACD:
+    """MACD line, signal line and histogram with TA-Lib alignment"""
+
+    def __init__(self, fast_period=batch.EMA_FAST_PERIOD, slow_period=batch.EMA_SLOW_PERIOD,
+                 signal_period=batch.MACD_SIGNAL_PERIOD):
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+        self.fast_alpha = 2.0 / (fast_period + 1)
+        self.slow_alpha = 2.0 / (slow_period + 1)
+        self.seed_values = deque(maxlen=slow_period)
+        self.fast = None
+        self.slow = None
+        self.signal = StreamingEMA(signal_period)
+        self.value = (NAN, NAN, NAN)
+
+    def update(self, close):
+        if self.slow is None:
+            self.seed_values.append(close)
+            if len(self.seed_values) < self.slow_period:
+                return self.value
+            # Kedua EMA mulai di bar yang sama (bar pertama slow EMA)
+            seed_values = list(self.seed_values)
+            self.fast = math.fsum(seed_values[-self.fast_period:]) / self.fast_period
+            self.slow = math.fsum(seed_values) / self.slow_period
+            self.seed_values = None
+        else:
+            self.fast += self.fast_alpha * (close - self.fast)
+            self.slow += self.slow_alpha * (close - self.slow)
+
+        macd_line = self.fast - self.slow
+        signal_line = self.signal.update(macd_line)
+        if self.signal.ready:
+            self.value = (macd_line, signal_line, macd_line - signal_line)
+        return self.value
+
+
+class StreamingBollinger:
+    """Upper, middle and lower Bollinger Bands (population standard deviation)"""
+
+    def __init__(self, period=batch.BB_PERIOD, deviations=batch.BB_DEVIATIONS):
+        self.period = period
+        self.deviations = deviations
+        self.sums = RollingSum(period)
+        self.value = (NAN, NAN, NAN)
+
+    def update(self, close):
+        self.sums.update(close)
+        if self.sums.ready:
+            middle = self.sums.total / self.period
+            variance = max(self.sums.total_squares / self.period - middle * middle, 0.0)
+            band = self.deviations * math.sqrt(variance)
+            self.value = (middle + band, middle, middle - band)
+        return self.value
+
+
+class StreamingStochastic:
+    """Fast stochastic %K and its SMA %D (both start once %D is defined)"""
+
+    def __init__(self, k_period=batch.STOCH_PERIOD, d_period=batch.STOCH_D_PERIOD):
+        self.highest = RollingExtreme(k_period, find_max=True)
+        self.lowest = RollingExtreme(k_period, find_max=False)
+        self.stoch_d = StreamingSMA(d_period)
+        self.value = (NAN, NAN)
+
+    def update(self, high, low, close):
+        highest = self.highest.update(high)
+        lowest = self.lowest.update(low)
+        if self.highest.ready:
+            price_range = highest - lowest
+            stoch_k = 100 * (close - lowest) / price_range if price_range != 0 else 0.0
+            stoch_d = self.stoch_d.update(stoch_k)
+            if not math.isnan(stoch_d):
+                self.value = (stoch_k, stoch_d)
+        return self.value
+
+
+class StreamingWilliamsR:
+    """Williams %R"""
+
+    def __init__(self, period=batch.WILLIAMS_PERIOD):
+        self.highest = RollingExtreme(period, find_max=True)
+        self.lowest = RollingExtreme(period, find_max=False)
+        self.value = NAN
+
+    def update(self, high, low, close):
+        highest = self.highest.update(high)
+        lowest = self.lowest.update(low)
+        if self.highest.ready:
+            price_range = highest - lowest
+            self.value = -100 * (highest - close) / price_range if price_range != 0 else 0.0
+        return self.value
+
+
+class StreamingCCI:
+    """Commodity Channel Index
+
+    The mean absolute deviation depends on the current window mean, so each
+    update costs O(period) rather than O(1).
+    """
+
+    def __init__(self, period=batch.CCI_PERIOD):
+        self.period = period
+        self.typical_prices = deque(maxlen=period)
+        self.sums = RollingSum(period)
+        self.value = NAN
+
+    def update(self, high, low, close):
+        typical_price = (high + low + close) / 3
+        self.typical_prices.append(typical_price)
+        self.sums.update(typical_price)
+        if self.sums.ready:
+            mean = self.sums.total / self.period
+            mad = math.fsum(abs(tp - mean) for tp in self.typical_prices) / self.period
+            deviation = typical_price - mean
+            self.value = deviation / (0.015 * mad) if mad != 0 and deviation != 0 else 0.0
+        return self.value
+
+
+class StreamingADX:
+    """Average Directional Index with Wilder smoothing"""
+
+    def __init__(self, period=batch.ADX_PERIOD):
+        self.period = period
+        self.decay = 1.0 - 1.0 / period
+        self.previous = None
+        self.steps = 0
+        self.plus_dm = 0.0
+        self.minus_dm = 0.0
+        self.true_range = 0.0
+        self.adx = StreamingEMA(period, alpha=1.0 / period)
+        self.value = NAN
+
+    def update(self, high, low, close):
+        if self.previous is None:
+            self.previous = (high, low, close)
+            return self.value
+
+        prev_high, prev_low, prev_close = self.previous
+        self.previous = (high, low, close)
+
+        diff_plus = high - prev_high
+        diff_minus = prev_low - low
+        minus_dm = plus_dm = 0.0
+        if diff_minus > 0 and diff_plus < diff_minus:
+            minus_dm = diff_minus
+        elif diff_plus > 0 and diff_plus > diff_minus:
+            plus_dm = diff_plus
+        true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+        self.steps += 1
+        if self.steps < self.period:
+            # Seed: jumlah period-1 nilai pertama
+            self.plus_dm += plus_dm
+            self.minus_dm += minus_dm
+            self.true_range += true_range
+            return self.value
+
+        self.plus_dm = self.plus_dm * self.decay + plus_dm
+        self.minus_dm = self.minus_dm * self.decay + minus_dm
+        self.true_range = self.true_range * self.decay + true_range
+
+        dx = 0.0
+        if self.true_range != 0:
+            plus_di = 100 * self.plus_dm / self.true_range
+            minus_di = 100 * self.minus_dm / self.true_range
+            if plus_di + minus_di != 0:
+                dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
+
+        adx = self.adx.update(dx)
+        if self.adx.ready:
+            self.value = adx
+        return self.value
+
+
+class StreamingOBV:
+    """On Balance Volume, starting from the first bar's volume"""
+
+    def __init__(self):
+        self.previous = None
+        self.value = NAN
+
+    def update(self, close, volume):
+        if self.previous is None:
+            self.value = volume
+        elif close > self.previous:
+            self.value += volume
+        elif close < self.previous:
+            self.value -= volume
+        self.previous = close
+        return self.value
+
+
+class StreamingAD:
+    """Chaikin Accumulation/Distribution line"""
+
+    def __init__(self):
+        self.value = 0.0
+
+    def update(self, high, low, close, volume):
+        price_range = high - low
+        if price_range > 0:
+            self.value += ((close - low) - (high - close)) / price_range * volume
+        return self.value
+
+
+class StreamingIndicatorSet:
+    """All live indicators for one symbol/timeframe, updated once per candle
+
+    ``snapshot()`` returns the same dict as
+    AdvancedCryptoAnalyzer.calculate_advanced_indicators, so a live symbol can
+    be re-scored with generate_master_signal on every tick.
+    """
+
+    def __init__(self):
+        self.sma_20 = StreamingSMA(batch.SMA_FAST_PERIOD)
+        self.sma_50 = StreamingSMA(batch.SMA_SLOW_PERIOD)
+        self.ema_12 = StreamingEMA(batch.EMA_FAST_PERIOD)
+        self.ema_26 = StreamingEMA(batch.EMA_SLOW_PERIOD)
+        self.macd = StreamingMACD()
+        self.rsi = StreamingRSI()
+        self.bollinger = StreamingBollinger()
+        self.stochastic = StreamingStochastic()
+        self.williams_r = StreamingWilliamsR()
+        self.cci = StreamingCCI()
+        self.adx = StreamingADX()
+        self.obv = StreamingOBV()
+        self.ad = StreamingAD()
+
+        self.bars = 0
+        self.last_candle = None
+        self.previous_body = NAN
+        self.previous_bullish = None
+        self.patterns = None
+        self.latest = None
+
+    @classmethod
+    def from_history(cls, open_, high, low, close, volume):
+        """Warm up a new set by replaying historical candles once"""
+        state = cls()
+        for candle in zip(batch.as_float_array(open_), batch.as_float_array(high),
+                          batch.as_float_array(low), batch.as_float_array(close),
+                          batch.as_float_array(volume)):
+            state.update(*candle)
+        return state
+
+    def update(self, open_, high, low, close, volume):
+        """Feed one closed candle and return the refreshed indicator snapshot"""
+        open_, high, low, close, volume = (float(open_), float(high), float(low),
+                                           float(close), float(volume))
+
+        macd_line, macd_signal, macd_histogram = self.macd.update(close)
+        bb_upper, bb_middle, bb_lower = self.bollinger.update(close)
+        stoch_k, stoch_d = self.stochastic.update(high, low, close)
+
+        self.latest = {
+            'sma_20': self.sma_20.update(close),
+            'sma_50': self.sma_50.update(close),
+            'ema_12': self.ema_12.update(close),
+            'ema_26': self.ema_26.update(close),
+            'macd': macd_line,
+            'macd_signal': macd_signal,
+            'macd_histogram': macd_histogram,
+            'rsi': self.rsi.update(close),
+            'bb_upper': bb_upper,
+            'bb_middle': bb_middle,
+            'bb_lower': bb_lower,
+            'stoch_k': stoch_k,
+            'stoch_d': stoch_d,
+            'williams_r': self.williams_r.update(high, low, close),
+            'cci': self.cci.update(high, low, close),
+            'adx': self.adx.update(high, low, close),
+            'obv': self.obv.update(close, volume),
+            'ad': self.ad.update(high, low, close, volume)
+        }
+        self.patterns = self._update_patterns(open_, high, low, close)
+
+        self.bars += 1
+        self.last_candle = (open_, high, low, close, volume)
+        return self.snapshot()
+
+    def _update_patterns(self, open_, high, low, close):
+        """Candle pattern flags for the newest bar (same rules as candle_patterns)"""
+        body = abs(close - open_)
+        upper_shadow = high - max(open_, close)
+        lower_shadow = min(open_, close) - low
+        is_bullish = close > open_
+        direction_changed = self.previous_bullish is None or is_bullish != self.previous_bullish
+        is_engulfing = (not math.isnan(self.previous_body) and
+                        body > self.previous_body * 1.5 and direction_changed)
+
+        self.previous_body = body
+        self.previous_bullish = is_bullish
+
+        return {
+            'is_bullish': int(is_bullish),
+            'is_bearish': int(close < open_),
+            'is_doji': int(body < (high - low) * 0.1),
+            'is_hammer': int(lower_shadow > body * 2 and upper_shadow < body * 0.5),
+            'is_shooting_star': int(upper_shadow > body * 2 and lower_shadow < body * 0.5),
+            'is_engulfing': int(is_engulfing)
+        }
+
+    def snapshot(self):
+        """Current indicator dict in calculate_advanced_indicators format"""
+        if self.latest is None:
+            raise ValueError("No candles have been fed to the indicator set yet")
+        return indicator_snapshot(self.latest, self.patterns,
+                                  self.last_candle[3], self.last_candle[4])
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+VECTORIZED SYNTHETIC CRYPTO DATA GENERATOR
+Generate realistic OHLCV data dalam satu pass NumPy (cumulative-product pricing),
+di-seed lewat np.random.Generator dan bisa paralel untuk banyak symbol sekaligus.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+def generate_ohlcv(num_samples, seed=None, base_price=50000, volatility=0.02):
+    """Generate one OHLCV series with the same distributions as the original loop
+
+    ``seed`` may be an int, a ``np.random.SeedSequence`` or a ``np.random.Generator``.
+    """
+    rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+
+    # Random walk dengan trend: semua return diambil sekaligus
+    trend_factor = rng.normal(0, 0.001, num_samples)
+    price_change = rng.normal(trend_factor, volatility)
+
+    # Cumulative-product pricing: close[i] = base * prod(1 + change[:i+1])
+    close_price = base_price * np.cumprod(1 + price_change)
+    open_price = np.empty_like(close_price)
+    open_price[:1] = base_price
+    open_price[1:] = close_price[:-1]
+
+    # High and Low dengan realistic spread
+    body_top = np.maximum(open_price, close_price)
+    body_bottom = np.minimum(open_price, close_price)
+    high_low_range = np.abs(close_price - open_price) * rng.uniform(1.2, 3.0, num_samples)
+    high_price = body_top + rng.uniform(0, 1, num_samples) * (high_low_range * 0.6)
+    low_price = body_bottom - rng.uniform(0, 1, num_samples) * (high_low_range * 0.6)
+
+    volume = rng.lognormal(10, 1, num_samples)  # Realistic volume distribution
+
+    return pd.DataFrame({
+        'timestamp': np.arange(num_samples),
+        'open': open_price,
+        'high': high_price,
+        'low': low_price,
+        'close': close_price,
+        'volume': volume
+    })
+
+
+def _generate_symbol(args):
+    """Worker entry point for generate_multi_symbol_ohlcv"""
+    seed_sequence, num_samples, base_price, volatility = args
+    return generate_ohlcv(num_samples, seed_sequence, base_price, volatility)
+
+
+def generate_multi_symbol_ohlcv(symbols, num_samples, seed=None, processes=None,
+                                base_price=50000, volatility=0.02):
+    """Generate independent OHLCV series for several symbols in parallel
+
+    Each symbol gets its own child of ``np.random.SeedSequence(seed)``, so the
+    output for a given seed is identical no matter how many processes run.
+    Returns a dict of symbol -> DataFrame.
+    """
+    symbols = list(symbols)
+    child_seeds = np.random.SeedSequence(seed).spawn(len(symbols))
+    tasks = [(child, num_samples, base_price, volatility) for child in child_seeds]
+
+    if processes is None:
+        processes = min(len(symbols), os.cpu_count() or 1)
+
+    if processes <= 1 or len(symbols) <= 1:
+        frames = [_generate_symbol(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            frames = list(executor.map(_generate_symbol, tasks))
+
+    return dict(zip(symbols, frames))
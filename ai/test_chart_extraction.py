@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Test chart_extraction: candle dari chart sintetis (chart_rendering) cocok dengan
+OHLC aslinya, dan chart padat (candle 1-2 pixel setelah decode) ditolak dengan
+ChartExtractionError alih-alih menghasilkan candle yang salah. Di-skip bila
+OpenCV tidak terinstall.
+
+Run: cd ai && python -m pytest -q test_chart_extraction.py
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+
+from chart_extraction import ChartExtractionError, extract_candles
+from chart_rendering import THEMES, render_chart, render_chart_png
+from image_upload import decode_image
+from synthetic_data import generate_ohlcv
+
+
+def test_extracted_candles_match_rendered_ohlc():
+    for seed, theme in enumerate(THEMES):
+        df = generate_ohlcv(150, seed=seed)
+        image, price_top, price_bottom = render_chart(df, 1280, 720, theme=theme)
+        extracted = extract_candles(image, price_top, price_bottom)
+
+        assert len(extracted['close']) == len(df)
+        pixel = (price_top - price_bottom) / (image.shape[0] - 1)
+        for name in ('open', 'high', 'low', 'close'):
+            assert np.max(np.abs(extracted[name] - df[name].to_numpy())) <= 0.5 * pixel + 1e-9
+
+
+def test_dense_chart_is_rejected():
+    for resolution, count in (("720p", 500), ("1080p", 900), ("1440p", 1000), ("mobile", 480)):
+        df = generate_ohlcv(count, seed=count)
+        png, price_top, price_bottom = render_chart_png(df, resolution)
+        with pytest.raises(ChartExtractionError):
+            extract_candles(decode_image(png, 2048), price_top, price_bottom)
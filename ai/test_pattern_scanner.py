@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Parity test pattern_scanner vs scipy find_peaks dan
+AdvancedCryptoAnalyzer.detect_chart_patterns per prefix history.
+
+Run: cd ai && python -m pytest -q test_pattern_scanner.py
+"""
+
+import numpy as np
+from scipy.signal import find_peaks
+
+from advanced_crypto_analyzer import AdvancedCryptoAnalyzer
+from pattern_scanner import decode_patterns, local_maxima, rolling_peaks, scan_patterns
+from synthetic_data import generate_ohlcv
+
+
+def test_local_maxima_match_find_peaks_with_plateaus():
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        values = np.round(rng.normal(size=200).cumsum())
+        np.testing.assert_array_equal(local_maxima(values)[0], find_peaks(values)[0])
+
+
+def test_rolling_peaks_match_find_peaks():
+    # Data kontinu: tidak ada dua puncak sama tinggi persis (tie find_peaks tidak stabil)
+    rng = np.random.default_rng(1)
+    for _ in range(20):
+        values = rng.normal(size=200).cumsum()
+        for distance in (1, 3, 5):
+            peaks, counts = rolling_peaks(values, 20, distance)
+            for start in range(len(values) - 19):
+                expected = find_peaks(values[start:start + 20], distance=distance)[0]
+                np.testing.assert_array_equal(peaks[start][:counts[start]] - start, expected)
+
+
+def test_scan_matches_detect_chart_patterns_on_every_prefix():
+    analyzer = AdvancedCryptoAnalyzer(rules_only=True)
+    for seed, base_price in ((0, 50000), (1, 300), (2, 2)):
+        df = generate_ohlcv(200, seed=seed, base_price=base_price)
+        flags = scan_patterns(df)
+        assert not flags[:19].any()
+        for bar in range(19, len(df)):
+            expected = analyzer.detect_chart_patterns(df.iloc[:bar + 1])
+            assert sorted(decode_patterns(flags[bar])) == sorted(expected), (seed, bar)
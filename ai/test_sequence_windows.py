@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test sequence_windows: window strided view dan batch vs loop asli, dan
+pipeline tf.data (sequence_dataset) vs window yang sama. Test tf.data
+di-skip bila TensorFlow tidak terinstall.
+
+Run: cd ai && python -m pytest -q test_sequence_windows.py
+"""
+
+import numpy as np
+import pytest
+
+from sequence_windows import (align_sequence_targets, build_sequence_windows,
+                              iter_sequence_batches)
+
+
+def _features(rows=300, columns=7, fortran=False):
+    matrix = np.random.default_rng(0).normal(size=(rows, columns)).astype(np.float32)
+    return np.asfortranarray(matrix) if fortran else matrix
+
+
+def test_windows_match_original_loop():
+    for fortran in (False, True):
+        features = _features(fortran=fortran)
+        windows = build_sequence_windows(features, 60)
+        expected = np.array([features[i:i + 60] for i in range(len(features) - 60)])
+        np.testing.assert_array_equal(windows, expected)
+
+
+def test_batches_cover_selected_windows():
+    features, targets = _features(), np.arange(300)
+    indices = np.random.default_rng(1).permutation(240)[:100]
+    batches = list(iter_sequence_batches(features, targets, 60, 32, indices=indices))
+    np.testing.assert_array_equal(np.concatenate([X for X, _ in batches]),
+                                  build_sequence_windows(features, 60)[indices])
+    np.testing.assert_array_equal(np.concatenate([y for _, y in batches]),
+                                  align_sequence_targets(targets, 60)[indices])
+
+
+def test_sequence_dataset_matches_windows():
+    pytest.importorskip("tensorflow")
+    from sequence_windows import feature_tensor, sequence_dataset
+
+    features = _features(fortran=True)
+    targets = np.random.default_rng(2).integers(0, 5, len(features))
+    indices = np.random.default_rng(3).permutation(240)[:100]
+    data = feature_tensor(features)
+
+    batches = list(sequence_dataset(data, targets, 60, 32, indices=indices, num_classes=5,
+                                    cache='').as_numpy_iterator())
+    np.testing.assert_array_equal(np.concatenate([X for X, _ in batches]),
+                                  build_sequence_windows(features, 60)[indices])
+    np.testing.assert_array_equal(np.concatenate([y for _, y in batches]),
+                                  np.eye(5)[align_sequence_targets(targets, 60)[indices]])
+
+
+def test_shuffled_sequence_dataset_keeps_pairs():
+    pytest.importorskip("tensorflow")
+    from sequence_windows import sequence_dataset
+
+    features = _features()
+    # Target = index baris pertama window, jadi pasangan X/y bisa dicek setelah shuffle
+    targets = np.arange(len(features)) - 60
+    dataset = sequence_dataset(features, targets, 60, 16, shuffle=True, seed=4)
+    for X_batch, y_batch in dataset.as_numpy_iterator():
+        np.testing.assert_array_equal(X_batch, build_sequence_windows(features, 60)[y_batch])
+
+    with pytest.raises(ValueError):
+        sequence_dataset(features, targets, 60, 16, shuffle=True, cache='')
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Parity test signal_scoring: label training kolumnar vs loop per baris asli
+(AdvancedCryptoTrainer.generate_trading_signals sebelum vectorize), dan skor
+live satu bar vs skor batch dari tabel yang sama.
+
+Run: cd ai && python -m pytest -q test_signal_scoring.py
+"""
+
+import numpy as np
+import pandas as pd
+
+from indicators import candle_patterns, compute_indicators
+from signal_scoring import (MASTER_SCORER, MASTER_SCORING_COLUMNS, SCORING_COLUMNS, TRAINING_SCORER,
+                            generate_signal_labels)
+from synthetic_data import generate_ohlcv
+
+
+def _indicator_frame(rows, seed):
+    """Random indicator columns around every threshold, with NaN warm-up gaps"""
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(size=rows).cumsum()
+    df = pd.DataFrame({
+        'rsi': rng.uniform(0, 100, rows),
+        'macd': rng.normal(size=rows),
+        'macd_signal': rng.normal(size=rows),
+        'bb_position': rng.uniform(-0.2, 1.2, rows),
+        'stoch_k': rng.uniform(0, 100, rows),
+        'is_hammer': rng.integers(0, 2, rows).astype(float),
+        'is_shooting_star': rng.integers(0, 2, rows).astype(float),
+        'is_engulfing': rng.integers(0, 2, rows).astype(float),
+        'is_bullish': rng.integers(0, 2, rows).astype(float),
+        'close': close,
+        'sma_20': close + rng.normal(size=rows),
+        'sma_50': close + rng.normal(size=rows),
+        'volume_ratio': rng.uniform(0, 3, rows)
+    })
+    for name in SCORING_COLUMNS:
+        df.loc[rng.random(rows) < 0.05, name] = np.nan
+    return df
+
+
+def _featurized(num_samples, seed, **kwargs):
+    df = generate_ohlcv(num_samples, seed=seed, **kwargs)
+    columns = {**compute_indicators(df['open'], df['high'], df['low'], df['close'], df['volume']),
+               **candle_patterns(df['open'], df['high'], df['low'], df['close'])}
+    return pd.concat([df, pd.DataFrame(columns, index=df.index)], axis=1)
+
+
+def _legacy_labels(df):
+    """The original per-row loop of generate_trading_signals"""
+    signals = []
+    for i in range(len(df)):
+        row = df.iloc[i]
+        signal_score = 0
+
+        if row['rsi'] < 30:
+            signal_score += 2
+        elif row['rsi'] > 70:
+            signal_score -= 2
+
+        if row['macd'] > row['macd_signal'] and row['macd'] > 0:
+            signal_score += 1.5
+        elif row['macd'] < row['macd_signal'] and row['macd'] < 0:
+            signal_score -= 1.5
+
+        if row['bb_position'] < 0.2:
+            signal_score += 1
+        elif row['bb_position'] > 0.8:
+            signal_score -= 1
+
+        if row['stoch_k'] < 20:
+            signal_score += 0.5
+        elif row['stoch_k'] > 80:
+            signal_score -= 0.5
+
+        if row['is_hammer']:
+            signal_score += 1.5
+        if row['is_shooting_star']:
+            signal_score -= 1.5
+        if row['is_engulfing']:
+            if row['is_bullish']:
+                signal_score += 1
+            else:
+                signal_score -= 1
+
+        if row['close'] > row['sma_20'] and row['sma_20'] > row['sma_50']:
+            signal_score += 1
+        elif row['close'] < row['sma_20'] and row['sma_20'] < row['sma_50']:
+            signal_score -= 1
+
+        if row['volume_ratio'] > 1.5:
+            if signal_score > 0:
+                signal_score += 0.5
+            elif signal_score < 0:
+                signal_score -= 0.5
+
+        if signal_score >= 2:
+            signals.append(2)
+        elif signal_score >= 1:
+            signals.append(1)
+        elif signal_score <= -2:
+            signals.append(-2)
+        elif signal_score <= -1:
+            signals.append(-1)
+        else:
+            signals.append(0)
+    return np.array(signals)
+
+
+def test_training_labels_match_legacy_loop():
+    for seed in range(3):
+        df = _indicator_frame(2000, seed)
+        np.testing.assert_array_equal(generate_signal_labels(df), _legacy_labels(df))
+
+
+def test_training_labels_match_legacy_loop_on_generated_ohlcv():
+    for seed, volatility in ((1, 0.02), (2, 0.005)):
+        df = _featurized(3000, seed, volatility=volatility)
+        np.testing.assert_array_equal(generate_signal_labels(df), _legacy_labels(df))
+
+
+def test_training_scorer_columns_cover_legacy_inputs():
+    assert set(TRAINING_SCORER.columns) == {
+        'rsi', 'macd', 'macd_signal', 'bb_position', 'stoch_k', 'is_hammer', 'is_shooting_star',
+        'is_engulfing', 'is_bullish', 'close', 'sma_20', 'sma_50', 'volume_ratio'
+    }
+
+
+def test_master_score_bar_matches_batch():
+    rng = np.random.default_rng(0)
+    rows = 500
+    columns = {name: rng.choice([-1.0, 0.0, 1.0], rows) for name in MASTER_SCORING_COLUMNS}
+    columns.update(rsi=rng.uniform(0, 100, rows), bb_position=rng.uniform(-0.2, 1.2, rows),
+                   adx=rng.uniform(0, 50, rows), macd=rng.normal(size=rows),
+                   macd_signal=rng.normal(size=rows), ema_12=rng.normal(size=rows),
+                   ema_26=rng.normal(size=rows))
+    buy_score, sell_score = MASTER_SCORER.score(columns)
+
+    for row in range(rows):
+        bar_buy, bar_sell, reasons = MASTER_SCORER.score_bar(
+            {name: values[row] for name, values in columns.items()})
+        assert (bar_buy, bar_sell) == (buy_score[row], sell_score[row])
+        weights = {rule.reason: rule for rule in MASTER_SCORER.rules}
+        assert sum(weights[reason].weight for reason in reasons) == bar_buy + bar_sell
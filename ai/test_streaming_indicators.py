@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Parity test streaming_indicators: StreamingIndicatorSet yang diisi candle per
+candle vs compute_indicators / candle_patterns pada prefix yang sama, termasuk
+NaN selama warm-up dan snapshot() vs indicator_snapshot dari hasil batch.
+
+Run: cd ai && python -m pytest -q test_streaming_indicators.py
+"""
+
+import numpy as np
+
+from indicators import candle_patterns, compute_indicators, indicator_snapshot
+from streaming_indicators import StreamingIndicatorSet
+from synthetic_data import generate_ohlcv
+
+# Running sums vs hasil batch berbeda ~1e-12 karena urutan penjumlahan
+RTOL = 1e-9
+ATOL = 1e-9
+
+
+def _prefix_batch(columns, bars):
+    prefix = [values[:bars] for values in columns]
+    latest = {name: values[-1] for name, values in compute_indicators(*prefix).items()}
+    patterns = {name: values[-1] for name, values in candle_patterns(*prefix[:4]).items()}
+    return latest, patterns
+
+
+def _check_prefixes(df, prefixes):
+    columns = [df[name].to_numpy() for name in ('open', 'high', 'low', 'close', 'volume')]
+    state = StreamingIndicatorSet()
+    prefixes = set(prefixes)
+
+    for bars, candle in enumerate(zip(*columns), start=1):
+        snapshot = state.update(*candle)
+        if bars not in prefixes:
+            continue
+        latest, patterns = _prefix_batch(columns, bars)
+
+        for name, value in state.latest.items():
+            # Indikator yang masih warm-up harus NaN di kedua sisi
+            np.testing.assert_allclose(value, latest[name], rtol=RTOL, atol=ATOL,
+                                       err_msg=f"{name} after {bars} bars")
+        for name, flag in state.patterns.items():
+            assert flag == patterns[name], f"{name} after {bars} bars"
+
+        expected = indicator_snapshot(latest, patterns, candle[3], candle[4])
+        assert snapshot.keys() == expected.keys()
+        for name, value in expected.items():
+            np.testing.assert_allclose(snapshot[name], value, rtol=RTOL, atol=ATOL,
+                                       err_msg=f"snapshot {name} after {bars} bars")
+
+
+def test_every_prefix_through_warm_up_matches_batch():
+    # Semua indikator selesai warm-up sebelum bar 100 (sma_50, adx)
+    df = generate_ohlcv(150, seed=3)
+    _check_prefixes(df, range(1, 151))
+
+
+def test_long_stream_matches_batch_after_resync():
+    # Lewat _RESYNC_INTERVAL dua kali, dengan harga dan volume besar
+    df = generate_ohlcv(2200, seed=4, base_price=60000.0)
+    _check_prefixes(df, list(range(1000, 1100)) + list(range(1100, 2201, 37)) + [2200])
+
+
+def test_flat_series_keeps_warm_up_nan_and_neutral_snapshot():
+    state = StreamingIndicatorSet()
+    for _ in range(60):
+        snapshot = state.update(100.0, 100.0, 100.0, 100.0, 10.0)
+    latest, patterns = _prefix_batch([np.full(60, 100.0)] * 4 + [np.full(60, 10.0)], 60)
+    for name, value in state.latest.items():
+        np.testing.assert_allclose(value, latest[name], rtol=RTOL, atol=ATOL, err_msg=name)
+    assert snapshot['bb_position'] == 0.5
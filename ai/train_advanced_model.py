@@ -5,17 +5,41 @@ Train AI models with simulated trading data yang mirip dengan real market data
 untuk mencapai akurasi setingkat TradingView Professional.
 """
 
+import os
+import tempfile
 import numpy as np
-import pandas as pd
 import tensorflow as tf
 from tensorflow import keras
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import MinMaxScaler
 from sklearn.metrics import accuracy_score, classification_report
 import matplotlib.pyplot as plt
+from signal_scoring import generate_signal_labels
+from feature_store import open_feature_store, read_feature_metadata, write_feature_store
+from indicators import compute_indicators, candle_patterns
+from synthetic_data import generate_ohlcv, generate_multi_symbol_ohlcv
+from sequence_windows import (
+    as_feature_matrix, build_sequence_windows, align_sequence_targets, iter_sequence_batches,
+    feature_tensor, sequence_dataset
+)
 import warnings
 warnings.filterwarnings('ignore')
 
+# Feature columns used as model input, in model order
+FEATURE_COLUMNS = [
+    'open', 'high', 'low', 'close', 'volume',
+    'sma_20', 'sma_50', 'ema_12', 'ema_26',
+    'macd', 'macd_signal', 'rsi', 'bb_position',
+    'stoch_k', 'stoch_d', 'williams_r', 'cci', 'adx',
+    'volume_ratio', 'momentum', 'roc',
+    'body', 'upper_shadow', 'lower_shadow',
+    'is_bullish', 'is_bearish', 'is_doji',
+    'is_hammer', 'is_shooting_star', 'is_engulfing'
+]
+
+# Direktori feature store (lihat feature_store.py) yang dipakai main()
+FEATURE_STORE_PATH = 'crypto_features'
+
 class AdvancedCryptoTrainer:
     def __init__(self):
         """Initialize the advanced crypto trainer"""
@@ -23,114 +47,34 @@ class AdvancedCryptoTrainer:
         self.scalers = {}
         self.accuracy_threshold = 0.95  # Target 95% accuracy like TradingView
         
-    def generate_realistic_crypto_data(self, num_samples=50000):
+    def generate_realistic_crypto_data(self, num_samples=50000, seed=None):
         """Generate realistic cryptocurrency trading data"""
         print("🎯 Generating realistic crypto trading data...")
         
-        # Base price untuk cryptocurrency (Bitcoin-like)
-        base_price = 50000
-        volatility = 0.02  # 2% volatility per candle
-        
-        data = []
-        current_price = base_price
+        # Base price untuk cryptocurrency (Bitcoin-like), 2% volatility per candle.
+        # Semua return, range dan volume diambil sekaligus (lihat synthetic_data.py)
+        return generate_ohlcv(num_samples, seed=seed, base_price=50000, volatility=0.02)
+    
+    def generate_multi_symbol_data(self, symbols, num_samples=50000, seed=None, processes=None):
+        """Generate independent crypto data for several symbols in parallel"""
+        print(f"🎯 Generating realistic crypto trading data for {len(symbols)} symbols...")
         
-        # Generate realistic OHLCV data
-        for i in range(num_samples):
-            # Random walk dengan trend
-            trend_factor = np.random.normal(0, 0.001)  # Small trend bias
-            price_change = np.random.normal(trend_factor, volatility)
-            
-            # Calculate OHLCV
-            open_price = current_price
-            close_price = open_price * (1 + price_change)
-            
-            # High and Low dengan realistic spread
-            high_low_range = abs(close_price - open_price) * np.random.uniform(1.2, 3.0)
-            high_price = max(open_price, close_price) + np.random.uniform(0, high_low_range * 0.6)
-            low_price = min(open_price, close_price) - np.random.uniform(0, high_low_range * 0.6)
-            
-            volume = np.random.lognormal(10, 1)  # Realistic volume distribution
-            
-            data.append({
-                'timestamp': i,
-                'open': open_price,
-                'high': high_price,
-                'low': low_price,
-                'close': close_price,
-                'volume': volume
-            })
-            
-            current_price = close_price
-            
-        return pd.DataFrame(data)
+        return generate_multi_symbol_ohlcv(
+            symbols, num_samples, seed=seed, processes=processes,
+            base_price=50000, volatility=0.02
+        )
     
     def calculate_technical_indicators(self, df):
         """Calculate comprehensive technical indicators like TradingView"""
         print("📊 Calculating TradingView-level technical indicators...")
         
-        # Price-based indicators
-        df['sma_20'] = df['close'].rolling(window=20).mean()
-        df['sma_50'] = df['close'].rolling(window=50).mean()
-        df['ema_12'] = df['close'].ewm(span=12).mean()
-        df['ema_26'] = df['close'].ewm(span=26).mean()
-        
-        # MACD
-        df['macd'] = df['ema_12'] - df['ema_26']
-        df['macd_signal'] = df['macd'].ewm(span=9).mean()
-        df['macd_histogram'] = df['macd'] - df['macd_signal']
-        
-        # RSI
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['rsi'] = 100 - (100 / (1 + rs))
-        
-        # Bollinger Bands
-        df['bb_middle'] = df['close'].rolling(window=20).mean()
-        bb_std = df['close'].rolling(window=20).std()
-        df['bb_upper'] = df['bb_middle'] + (bb_std * 2)
-        df['bb_lower'] = df['bb_middle'] - (bb_std * 2)
-        df['bb_position'] = (df['close'] - df['bb_lower']) / (df['bb_upper'] - df['bb_lower'])
-        
-        # Stochastic
-        low_14 = df['low'].rolling(window=14).min()
-        high_14 = df['high'].rolling(window=14).max()
-        df['stoch_k'] = 100 * ((df['close'] - low_14) / (high_14 - low_14))
-        df['stoch_d'] = df['stoch_k'].rolling(window=3).mean()
-        
-        # Williams %R
-        df['williams_r'] = -100 * ((high_14 - df['close']) / (high_14 - low_14))
-        
-        # CCI (Commodity Channel Index)
-        tp = (df['high'] + df['low'] + df['close']) / 3
-        sma_tp = tp.rolling(window=20).mean()
-        mad = tp.rolling(window=20).apply(lambda x: np.mean(np.abs(x - x.mean())))
-        df['cci'] = (tp - sma_tp) / (0.015 * mad)
-        
-        # ADX (Average Directional Index) - simplified
-        high_diff = df['high'].diff()
-        low_diff = df['low'].diff()
-        plus_dm = high_diff.where((high_diff > low_diff) & (high_diff > 0), 0)
-        minus_dm = low_diff.where((low_diff > high_diff) & (low_diff > 0), 0)
-        
-        tr = np.maximum(df['high'] - df['low'], 
-             np.maximum(abs(df['high'] - df['close'].shift(1)),
-                       abs(df['low'] - df['close'].shift(1))))
-        
-        plus_di = 100 * (plus_dm.rolling(window=14).mean() / tr.rolling(window=14).mean())
-        minus_di = 100 * (minus_dm.rolling(window=14).mean() / tr.rolling(window=14).mean())
-        
-        dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
-        df['adx'] = dx.rolling(window=14).mean()
-        
-        # Volume indicators
-        df['volume_sma'] = df['volume'].rolling(window=20).mean()
-        df['volume_ratio'] = df['volume'] / df['volume_sma']
-        
-        # Price momentum
-        df['momentum'] = df['close'].pct_change(periods=10)
-        df['roc'] = ((df['close'] - df['close'].shift(12)) / df['close'].shift(12)) * 100
+        # Indicator engine yang sama dengan AdvancedCryptoAnalyzer (indicators.py),
+        # jadi fitur training identik dengan fitur saat inference
+        indicators = compute_indicators(
+            df['open'], df['high'], df['low'], df['close'], df['volume']
+        )
+        for name, values in indicators.items():
+            df[name] = values
         
         return df
     
@@ -138,27 +82,9 @@ class AdvancedCryptoTrainer:
         """Create candlestick pattern features"""
         print("🕯️ Creating candlestick pattern features...")
         
-        # Basic candle properties
-        df['body'] = abs(df['close'] - df['open'])
-        df['upper_shadow'] = df['high'] - np.maximum(df['open'], df['close'])
-        df['lower_shadow'] = np.minimum(df['open'], df['close']) - df['low']
-        df['total_range'] = df['high'] - df['low']
-        
-        # Pattern indicators
-        df['is_bullish'] = (df['close'] > df['open']).astype(int)
-        df['is_bearish'] = (df['close'] < df['open']).astype(int)
-        df['is_doji'] = (df['body'] < df['total_range'] * 0.1).astype(int)
-        
-        # Hammer and Shooting Star patterns
-        df['is_hammer'] = ((df['lower_shadow'] > df['body'] * 2) & 
-                          (df['upper_shadow'] < df['body'] * 0.5)).astype(int)
-        df['is_shooting_star'] = ((df['upper_shadow'] > df['body'] * 2) & 
-                                 (df['lower_shadow'] < df['body'] * 0.5)).astype(int)
-        
-        # Engulfing patterns (simplified)
-        df['prev_body'] = df['body'].shift(1)
-        df['is_engulfing'] = ((df['body'] > df['prev_body'] * 1.5) & 
-                             (df['is_bullish'] != df['is_bullish'].shift(1))).astype(int)
+        patterns = candle_patterns(df['open'], df['high'], df['low'], df['close'])
+        for name, values in patterns.items():
+            df[name] = values
         
         return df
     
@@ -166,106 +92,30 @@ class AdvancedCryptoTrainer:
         """Generate realistic trading signals based on technical analysis"""
         print("🎯 Generating professional trading signals...")
         
-        signals = []
-        
-        for i in range(len(df)):
-            signal_score = 0
-            
-            # RSI signals
-            if df.iloc[i]['rsi'] < 30:
-                signal_score += 2  # Oversold - buy signal
-            elif df.iloc[i]['rsi'] > 70:
-                signal_score -= 2  # Overbought - sell signal
-            
-            # MACD signals
-            if df.iloc[i]['macd'] > df.iloc[i]['macd_signal'] and df.iloc[i]['macd'] > 0:
-                signal_score += 1.5  # Bullish MACD
-            elif df.iloc[i]['macd'] < df.iloc[i]['macd_signal'] and df.iloc[i]['macd'] < 0:
-                signal_score -= 1.5  # Bearish MACD
-            
-            # Bollinger Bands
-            if df.iloc[i]['bb_position'] < 0.2:
-                signal_score += 1  # Near lower band - buy
-            elif df.iloc[i]['bb_position'] > 0.8:
-                signal_score -= 1  # Near upper band - sell
-            
-            # Stochastic
-            if df.iloc[i]['stoch_k'] < 20:
-                signal_score += 0.5  # Oversold
-            elif df.iloc[i]['stoch_k'] > 80:
-                signal_score -= 0.5  # Overbought
-            
-            # Pattern signals
-            if df.iloc[i]['is_hammer']:
-                signal_score += 1.5  # Hammer - bullish reversal
-            if df.iloc[i]['is_shooting_star']:
-                signal_score -= 1.5  # Shooting star - bearish reversal
-            if df.iloc[i]['is_engulfing']:
-                if df.iloc[i]['is_bullish']:
-                    signal_score += 1  # Bullish engulfing
-                else:
-                    signal_score -= 1  # Bearish engulfing
-            
-            # Moving average signals
-            if df.iloc[i]['close'] > df.iloc[i]['sma_20'] and df.iloc[i]['sma_20'] > df.iloc[i]['sma_50']:
-                signal_score += 1  # Price above MAs in uptrend
-            elif df.iloc[i]['close'] < df.iloc[i]['sma_20'] and df.iloc[i]['sma_20'] < df.iloc[i]['sma_50']:
-                signal_score -= 1  # Price below MAs in downtrend
-            
-            # Volume confirmation
-            if df.iloc[i]['volume_ratio'] > 1.5:  # High volume
-                if signal_score > 0:
-                    signal_score += 0.5  # Volume confirms bullish signal
-                elif signal_score < 0:
-                    signal_score -= 0.5  # Volume confirms bearish signal
-            
-            # Convert to classification
-            if signal_score >= 2:
-                signals.append(2)  # Strong BUY
-            elif signal_score >= 1:
-                signals.append(1)  # BUY
-            elif signal_score <= -2:
-                signals.append(-2)  # Strong SELL
-            elif signal_score <= -1:
-                signals.append(-1)  # SELL
-            else:
-                signals.append(0)  # HOLD
-        
-        df['signal'] = signals
+        # Skor RSI/MACD/BB/Stochastic/Pattern/MA/Volume dihitung kolom per kolom
+        # untuk semua candle sekaligus (lihat signal_scoring.py)
+        df['signal'] = generate_signal_labels(df)
         return df
     
     def prepare_training_data(self, df, lookback_window=60):
         """Prepare data for training with proper sequence format"""
         print("🔧 Preparing training data with sequence format...")
         
-        # Select feature columns
-        feature_columns = [
-            'open', 'high', 'low', 'close', 'volume',
-            'sma_20', 'sma_50', 'ema_12', 'ema_26',
-            'macd', 'macd_signal', 'rsi', 'bb_position',
-            'stoch_k', 'stoch_d', 'williams_r', 'cci', 'adx',
-            'volume_ratio', 'momentum', 'roc',
-            'body', 'upper_shadow', 'lower_shadow',
-            'is_bullish', 'is_bearish', 'is_doji',
-            'is_hammer', 'is_shooting_star', 'is_engulfing'
-        ]
-        
-        # Remove NaN values
-        df_clean = df[feature_columns + ['signal']].dropna()
-        
-        # Prepare sequences
-        X, y = [], []
-        
-        for i in range(lookback_window, len(df_clean)):
-            # Use last 60 candles as input sequence
-            sequence = df_clean[feature_columns].iloc[i-lookback_window:i].values
-            target = df_clean['signal'].iloc[i]
-            
-            X.append(sequence)
-            y.append(target)
+        feature_columns, features, signals = self.extract_feature_matrix(df)
+        return self.build_training_sequences(feature_columns, features, signals, lookback_window)
+    
+    def prepare_stored_training_data(self, path, lookback_window=60):
+        """Prepare sequence training data from a memory-mapped feature store"""
+        print(f"🔧 Preparing training data from feature store {path}...")
         
-        X = np.array(X)
-        y = np.array(y)
+        feature_columns, features, signals = self.load_feature_store(path)
+        return self.build_training_sequences(feature_columns, features, signals, lookback_window)
+    
+    def build_training_sequences(self, feature_columns, features, signals, lookback_window=60):
+        """(X, one-hot y, feature_columns) over a feature matrix and its signal labels"""
+        # X adalah read-only strided view: tidak ada salinan per sequence
+        X = build_sequence_windows(features, lookback_window)
+        y = align_sequence_targets(signals, lookback_window)
         
         # Convert signals to classification labels
         # -2: Strong SELL, -1: SELL, 0: HOLD, 1: BUY, 2: Strong BUY
@@ -276,6 +126,63 @@ class AdvancedCryptoTrainer:
         
         return X, y_categorical, feature_columns
     
+    def prepare_training_batches(self, df, lookback_window=60, batch_size=64,
+                                 shuffle=True, seed=None):
+        """Yield (X, y) training batches without holding the full 3-D tensor"""
+        print("🔧 Preparing batched training data with sequence format...")
+        
+        feature_columns, features, signals = self.extract_feature_matrix(df)
+        
+        for X_batch, y_batch in iter_sequence_batches(
+            features, signals, lookback_window, batch_size,
+            shuffle=shuffle, seed=seed
+        ):
+            yield X_batch, keras.utils.to_categorical(y_batch + 2, num_classes=5)
+    
+    def extract_feature_matrix(self, df):
+        """Return (feature_columns, float32 feature matrix, signals) without NaN rows"""
+        feature_columns = list(FEATURE_COLUMNS)
+        
+        # Remove NaN values
+        df_clean = df[feature_columns + ['signal']].dropna()
+        
+        # Satu matrix float32 contiguous sebagai basis semua window
+        features = as_feature_matrix(df_clean[feature_columns].to_numpy(dtype=np.float32))
+        signals = df_clean['signal'].to_numpy(dtype=np.int64)
+        
+        return feature_columns, features, signals
+    
+    def build_feature_store(self, df, path, **source):
+        """Write the model features and signal labels of df as a float32 feature store"""
+        print(f"💾 Writing feature store {path}...")
+        
+        return write_feature_store(path, df, FEATURE_COLUMNS, 'signal', **source)
+    
+    def load_feature_store(self, path):
+        """Return (feature_columns, memory-mapped float32 features, signals) of a feature store"""
+        store = open_feature_store(path, FEATURE_COLUMNS)
+        return store.columns, store.features, store.signals
+    
+    def load_or_build_feature_store(self, path, num_samples=100000, seed=None):
+        """Memory-map the feature store at path, generating and featurizing data only if needed"""
+        metadata = read_feature_metadata(path)
+        source = {'num_samples': num_samples, 'seed': seed}
+        
+        # Store dipakai ulang selama kolom dan sumber datanya sama (seed None = data apa saja)
+        if (metadata is None or metadata['columns'] != FEATURE_COLUMNS
+                or metadata['source'].get('num_samples') != num_samples
+                or (seed is not None and metadata['source'].get('seed') != seed)):
+            df = self.generate_realistic_crypto_data(num_samples=num_samples, seed=seed)
+            print(f"📊 Generated {len(df)} samples of realistic crypto data")
+            df = self.calculate_technical_indicators(df)
+            df = self.create_pattern_features(df)
+            df = self.generate_trading_signals(df)
+            self.build_feature_store(df, path, **source)
+        else:
+            print(f"💾 Reusing feature store {path} ({metadata['rows']} rows)")
+        
+        return self.load_feature_store(path)
+    
     def build_advanced_model(self, input_shape, num_classes=5):
         """Build advanced LSTM+CNN hybrid model for crypto signal prediction"""
         print("🏗️ Building advanced hybrid model (LSTM + CNN)...")
@@ -323,12 +230,39 @@ class AdvancedCryptoTrainer:
         
         return model
     
-    def train_model(self, X, y, validation_split=0.2):
-        """Train the advanced model with professional techniques"""
+    def make_sequence_dataset(self, features, signals, indices=None, lookback_window=60,
+                              batch_size=64, shuffle=False, seed=None, cache=None):
+        """tf.data dataset of (X, one-hot y) batches, windows built on the fly"""
+        # Label -2..2 -> kelas 0..4, one-hot per batch di dalam pipeline
+        classes = np.asarray(signals, dtype=np.int64) + 2
+        return sequence_dataset(
+            features, classes, lookback_window, batch_size, indices=indices,
+            shuffle=shuffle, seed=seed, num_classes=5, cache=cache
+        )
+    
+    def train_model(self, features, signals, indices=None, lookback_window=60,
+                    validation_split=0.2, batch_size=64, seed=None):
+        """Train the advanced model with professional techniques
+        
+        ``features``/``signals`` are the flat feature matrix and labels (e.g.
+        from the feature store); ``indices`` selects the training windows.
+        Windows are streamed through tf.data instead of one (N, 60, 30) tensor.
+        """
         print("🚀 Training advanced crypto signal model...")
         
+        # Satu tensor fitur untuk dataset training dan validasi
+        if not tf.is_tensor(features):
+            features = feature_tensor(features)
+        if indices is None:
+            indices = np.arange(max(int(features.shape[0]) - lookback_window, 0))
+        indices = np.asarray(indices)
+        
+        # Seperti validation_split Keras: bagian akhir indices, diambil sebelum shuffle
+        split_at = int(np.floor(len(indices) * (1.0 - validation_split)))
+        train_indices, validation_indices = indices[:split_at], indices[split_at:]
+        
         # Build model
-        input_shape = (X.shape[1], X.shape[2])
+        input_shape = (lookback_window, int(features.shape[1]))
         model = self.build_advanced_model(input_shape)
         
         # Print model summary
@@ -356,20 +290,29 @@ class AdvancedCryptoTrainer:
             )
         ]
         
-        # Train model
-        history = model.fit(
-            X, y,
-            epochs=100,
-            batch_size=64,
-            validation_split=validation_split,
-            callbacks=callbacks,
-            verbose=1
-        )
+        # Train model: batch training diacak ulang tiap epoch, batch validasi
+        # (urutan tetap) di-cache ke file sementara setelah epoch pertama
+        with tempfile.TemporaryDirectory() as cache_dir:
+            train_dataset = self.make_sequence_dataset(
+                features, signals, train_indices, lookback_window, batch_size,
+                shuffle=True, seed=seed
+            )
+            validation_dataset = self.make_sequence_dataset(
+                features, signals, validation_indices, lookback_window, batch_size,
+                cache=os.path.join(cache_dir, 'validation')
+            )
+            history = model.fit(
+                train_dataset,
+                epochs=100,
+                validation_data=validation_dataset,
+                callbacks=callbacks,
+                verbose=1
+            )
         
         return model, history
     
     def evaluate_model(self, model, X_test, y_test):
-        """Evaluate model performance"""
+        """Evaluate model performance (X_test may be a sequence dataset)"""
         print("📊 Evaluating model performance...")
         
         # Get predictions
@@ -454,35 +397,32 @@ def main():
     # Initialize trainer
     trainer = AdvancedCryptoTrainer()
     
-    # Generate realistic data
-    df = trainer.generate_realistic_crypto_data(num_samples=100000)
-    print(f"📊 Generated {len(df)} samples of realistic crypto data")
-    
-    # Calculate technical indicators
-    df = trainer.calculate_technical_indicators(df)
-    
-    # Create pattern features
-    df = trainer.create_pattern_features(df)
-    
-    # Generate trading signals
-    df = trainer.generate_trading_signals(df)
+    # Generate data, indicators, pattern features and signals once; later runs
+    # memory-map the float32 feature store instead of featurizing again
+    feature_columns, features, signals = trainer.load_or_build_feature_store(
+        FEATURE_STORE_PATH, num_samples=100000
+    )
     
-    # Prepare training data
-    X, y, feature_columns = trainer.prepare_training_data(df, lookback_window=60)
+    # Prepare training data (X is a strided view; windows are copied per batch only)
+    X, y, feature_columns = trainer.build_training_sequences(
+        feature_columns, features, signals, lookback_window=60
+    )
     
-    # Split data
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=np.argmax(y, axis=1)
+    # Split window positions (same stratified split as splitting X itself)
+    train_indices, test_indices = train_test_split(
+        np.arange(len(X)), test_size=0.2, random_state=42, stratify=np.argmax(y, axis=1)
     )
     
-    print(f"📊 Training set: {X_train.shape}")
-    print(f"📊 Test set: {X_test.shape}")
+    print(f"📊 Training set: {(len(train_indices),) + X.shape[1:]}")
+    print(f"📊 Test set: {(len(test_indices),) + X.shape[1:]}")
     
-    # Train model
-    model, history = trainer.train_model(X_train, y_train)
+    # Train model (matrix fitur masuk TensorFlow sekali, dipakai train/validasi/test)
+    features = feature_tensor(features)
+    model, history = trainer.train_model(features, signals, train_indices, lookback_window=60)
     
     # Evaluate model
-    accuracy = trainer.evaluate_model(model, X_test, y_test)
+    test_dataset = trainer.make_sequence_dataset(features, signals, test_indices, lookback_window=60)
+    accuracy = trainer.evaluate_model(model, test_dataset, y[test_indices])
     
     # Save model
     trainer.save_model(model, 'advanced_crypto_model.h5')
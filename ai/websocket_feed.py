@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+WEBSOCKET STREAMING SIGNAL FEED
+Client subscribe ke symbol/timeframe, lalu mengirim candle baru lewat koneksi
+yang sama; server membalas dengan signal terbaru. Indikator di-update secara
+incremental (StreamingIndicatorSet), jadi tiap candle cukup satu round trip
+tanpa mengirim ulang dan menghitung ulang seluruh history.
+
+Protocol (JSON text frames):
+    -> {"type": "subscribe", "symbol": "BTCUSDT", "timeframe": "1h", "price_data": [...]}
+    <- {"type": "subscribed", "symbol": ..., "timeframe": ..., "candles": n, "analysis": {...}}
+    -> {"type": "candle", "symbol": ..., "timeframe": ..., "candle": {...}}   (atau "candles": [...])
+    <- {"type": "signal", "symbol": ..., "timeframe": ..., "timestamp": ..., "analysis": {...}}
+    -> {"type": "unsubscribe", "symbol": ..., "timeframe": ...}
+    -> {"type": "ping"}
+Candle yang dikirim harus candle yang sudah close; error dibalas dengan
+{"type": "error", "error": ...} tanpa menutup koneksi.
+
+Tiap pesan diproses di thread executor dan analisisnya lewat
+ai_server.run_analysis (worker pool bila aktif), jadi event loop tetap
+melayani koneksi lain selama satu client sedang dianalisis. Counter
+connections/subscriptions diubah dari event loop dan thread executor, jadi
+selalu di bawah self.lock.
+"""
+
+import asyncio
+import json
+import socket
+import threading
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import websockets
+
+from advanced_crypto_analyzer import OHLCV_COLUMNS
+from streaming_indicators import StreamingIndicatorSet
+
+
+class SymbolStream:
+    """Live state of one subscription: incremental indicators plus a recent candle window"""
+
+    def __init__(self, history_limit):
+        self.indicators = StreamingIndicatorSet()
+        # Pattern dan sentiment butuh window candle terakhir, bukan seluruh history
+        self.window = {column: deque(maxlen=history_limit) for column in OHLCV_COLUMNS}
+
+    def push_frame(self, df):
+        """Feed every candle of an OHLCV DataFrame, oldest first"""
+        columns = [df[column].to_numpy() for column in OHLCV_COLUMNS]
+        for candle in zip(*columns):
+            self.push(candle)
+
+    def push(self, candle):
+        """Feed one closed (open, high, low, close, volume) candle"""
+        self.indicators.update(*candle)
+        for column, value in zip(OHLCV_COLUMNS, candle):
+            self.window[column].append(float(value))
+
+    def frame(self):
+        """Recent candle window as a float64 DataFrame"""
+        return pd.DataFrame({
+            column: np.fromiter(values, dtype=np.float64, count=len(values))
+            for column, values in self.window.items()
+        }, copy=False)
+
+
+class SignalFeed:
+    """WebSocket endpoint pushing incremental signals for subscribed symbols"""
+
+    def __init__(self, ai_server, history_limit=500, max_subscriptions=50):
+        self.ai_server = ai_server
+        self.analyzer = ai_server.ai_analyzer
+        self.history_limit = history_limit
+        self.max_subscriptions = max_subscriptions
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.subscriptions = 0
+
+    def start(self, host, port):
+        """Bind the feed socket and serve it from a daemon thread"""
+        # Bind di thread pemanggil supaya port bentrok langsung ketahuan saat startup
+        sock = socket.create_server((host, port))
+        thread = threading.Thread(target=asyncio.run, args=(self._serve(sock),),
+                                  name="websocket-feed", daemon=True)
+        thread.start()
+        return thread
+
+    async def _serve(self, sock):
+        async with websockets.serve(self.handle_connection, sock=sock):
+            await asyncio.Future()
+
+    async def handle_connection(self, websocket, path=None):
+        """Handle one client; subscriptions live as long as the connection"""
+        streams = {}
+        with self.lock:
+            self.connections += 1
+        try:
+            loop = asyncio.get_running_loop()
+            async for message in websocket:
+                # Pesan satu koneksi tetap berurutan; koneksi lain jalan terus di event loop
+                reply = await loop.run_in_executor(None, self.handle_message, streams, message)
+                await websocket.send(json.dumps(reply))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            with self.lock:
+                self.connections -= 1
+                self.subscriptions -= len(streams)
+
+    def handle_message(self, streams, message):
+        """Apply one client message and return the reply"""
+        try:
+            data = json.loads(message)
+            if not isinstance(data, dict):
+                raise ValueError("Message must be a JSON object")
+
+            message_type = data.get("type")
+            if message_type == "ping":
+                return {"type": "pong", "timestamp": datetime.now().isoformat()}
+
+            key = (data.get("symbol", "BTCUSDT"), data.get("timeframe", "1h"))
+            if message_type == "subscribe":
+                return self.subscribe(streams, key, data.get("price_data"))
+            elif message_type == "candle":
+                return self.push_candles(streams, key, data)
+            elif message_type == "unsubscribe":
+                if streams.pop(key, None) is not None:
+                    with self.lock:
+                        self.subscriptions -= 1
+                return {"type": "unsubscribed", "symbol": key[0], "timeframe": key[1]}
+
+            raise ValueError(f"Unknown message type: {message_type}")
+
+        except json.JSONDecodeError:
+            return {"type": "error", "error": "Invalid JSON data"}
+        except Exception as e:
+            self.ai_server.error_count += 1
+            return {"type": "error", "error": str(e)}
+
+    def subscribe(self, streams, key, price_data):
+        """Create (or reset) a subscription, warmed up with optional history"""
+        if key not in streams and len(streams) >= self.max_subscriptions:
+            raise ValueError(f"Too many subscriptions (max {self.max_subscriptions})")
+
+        stream = SymbolStream(self.history_limit)
+        if price_data:
+            stream.push_frame(self.analyzer.price_data_to_frame(price_data))
+
+        if key not in streams:
+            with self.lock:
+                self.subscriptions += 1
+        streams[key] = stream
+
+        reply = {"type": "subscribed", "symbol": key[0], "timeframe": key[1],
+                 "candles": stream.indicators.bars}
+        if stream.indicators.bars:
+            reply["analysis"] = self.analyze(stream)
+        return reply
+
+    def push_candles(self, streams, key, data):
+        """Feed new closed candles and return the refreshed signal"""
+        stream = streams.get(key)
+        if stream is None:
+            raise ValueError(f"Not subscribed to {key[0]} {key[1]}")
+
+        candles = data.get("candles") or [data.get("candle")]
+        df = self.analyzer.price_data_to_frame([candle for candle in candles if candle])
+        stream.push_frame(df)
+
+        self.ai_server.request_count += 1
+        return {
+            "type": "signal",
+            "symbol": key[0],
+            "timeframe": key[1],
+            "timestamp": datetime.now().isoformat(),
+            "analysis": self.analyze(stream)
+        }
+
+    def analyze(self, stream):
+        """Score the stream with the same signal pipeline as /analyze"""
+        analysis = self.ai_server.run_analysis(
+            "analyze_indicator_window", stream.frame(), stream.indicators.snapshot())
+        analysis['candles_analyzed'] = stream.indicators.bars
+        return analysis